@@ -0,0 +1,52 @@
+"""
+Test start up benchmark: brownie compiling the project from scratch vs restoring it from the artifact
+cache.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/artifact_cache.py [--repeat N] [extra brownie test args...]
+
+Every run starts without a `build/` directory. The cold runs are `brownie test` without the cache, the
+warm runs `run_tests.sh` restoring from a throwaway cache filled by the first of them, the restore is
+part of their time. Only collects the tests, so the times are dominated by compiling.
+"""
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+from common import brownie_test, report
+
+BUILD = Path("build")
+RUN_TESTS = ("./run_tests.sh",)
+
+
+def clean(args, cache, command=("brownie", "test")):
+    shutil.rmtree(BUILD, ignore_errors=True)
+    return brownie_test(args, command, {"ARTIFACT_CACHE": cache})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args, extra = parser.parse_known_args()
+
+    cache = tempfile.mkdtemp(prefix="artifact-cache-")
+    backup = tempfile.mkdtemp(prefix="build-")
+    if BUILD.exists():
+        shutil.copytree(BUILD, backup, dirs_exist_ok=True)
+    try:
+        collect = ["--collect-only", "-q", *extra]
+        results = {"cold": [clean(collect, "off") for _ in range(args.repeat)]}
+        clean(collect, cache, RUN_TESTS)
+        results["warm"] = [clean(collect, cache, RUN_TESTS) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(BUILD, ignore_errors=True)
+        shutil.copytree(backup, BUILD, dirs_exist_ok=True)
+        shutil.rmtree(cache, ignore_errors=True)
+        shutil.rmtree(backup, ignore_errors=True)
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
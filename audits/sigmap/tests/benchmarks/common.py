@@ -0,0 +1,30 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def brownie_test(args, command=("brownie", "test"), env=None):
+    """
+    Runs `brownie test` (or `command`) with `args` and the variables of `env` in a fresh process,
+    returns the wall-clock time in seconds.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [*command, *args], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env={**os.environ, **(env or {})}
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.stdout.write(result.stdout.decode())
+        raise SystemExit(f"`{' '.join([*command, *args])}` failed")
+    return elapsed
+
+
+def report(results):
+    """Prints median and min times of each variant and the speed up of the last over the first."""
+    print(f"{'variant':<32}{'median (s)':>12}{'min (s)':>12}")
+    for name, times in results.items():
+        print(f"{name:<32}{statistics.median(times):>12.1f}{min(times):>12.1f}")
+    medians = [statistics.median(times) for times in results.values()]
+    print(f"speed up: {medians[0] / medians[-1]:.1f}x")
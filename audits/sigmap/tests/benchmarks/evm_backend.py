@@ -0,0 +1,39 @@
+"""
+Backend benchmark: the `no_fork` tests on brownie's mainnet fork node vs the in-process eth-tester
+chain (`--evm-backend eth-tester`), session start up included.
+
+Run from the brownie project directory (`audits/sigmap/tests`), with eth-tester installed:
+
+    python benchmarks/evm_backend.py [--repeat N] [--tests PATH ...] [extra brownie test args...]
+
+The same tests run on both backends, selected with `-m no_fork` on the fork.
+"""
+import argparse
+
+from common import brownie_test, report
+
+# Deployments and getters, so the times are dominated by starting the chain
+TESTS = ["tests/test_executor.py"]
+
+VARIANTS = {
+    "fork node": ["-m", "no_fork"],
+    "eth-tester": ["--evm-backend", "eth-tester"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    parser.add_argument("--tests", nargs="+", default=TESTS, help="test files or node ids to run")
+    args, extra = parser.parse_known_args()
+
+    results = {name: [] for name in VARIANTS}
+    # Interleaved so both variants see the same machine load
+    for _ in range(args.repeat):
+        for name, variant in VARIANTS.items():
+            results[name].append(brownie_test([*args.tests, *variant, *extra]))
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Single test start up benchmark: every mainnet contract bound at the session start vs bound on first use.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/lazy_contracts.py [--repeat N] [extra brownie test args...]
+
+The test deploys its own executor and only passes `AaveGovernanceV2` as an argument, so it looks no
+mainnet contract up and the difference is the fork traffic of the lookups, largest on a cold fork of
+a remote provider.
+"""
+import argparse
+
+from common import brownie_test, report
+
+TEST = "tests/test_executor.py::test_executor_constructor"
+
+VARIANTS = {
+    "before (eager contracts)": ["--eager-contracts"],
+    "after (lazy contracts)": [],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args, extra = parser.parse_known_args()
+
+    report({
+        name: [brownie_test([TEST, *variant_args, *extra]) for _ in range(args.repeat)]
+        for name, variant_args in VARIANTS.items()
+    })
+
+
+if __name__ == "__main__":
+    main()
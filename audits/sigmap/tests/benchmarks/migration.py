@@ -0,0 +1,34 @@
+"""
+Wall-clock benchmark of the migration tests (`tests/test_migration.py`) with bulk vs linear block mining.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/migration.py [--repeat N] [extra brownie test args...]
+
+Each variant runs in a fresh `brownie test` process so fork start up is included in both.
+"""
+import argparse
+
+from common import brownie_test, report
+
+TEST = "tests/test_migration.py"
+
+VARIANTS = {
+    "before (linear mining)": ["--linear-mining"],
+    "after (bulk mining)": [],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per variant")
+    args, extra = parser.parse_known_args()
+
+    report({
+        name: [brownie_test([TEST, *variant_args, *extra]) for _ in range(args.repeat)]
+        for name, variant_args in VARIANTS.items()
+    })
+
+
+if __name__ == "__main__":
+    main()
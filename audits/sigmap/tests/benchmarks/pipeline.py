@@ -0,0 +1,106 @@
+"""
+Timing of `simulate()` of the governance pipeline on synthetic Poisson arrivals, against a simulation
+putting every step of every proposal (queue, execution or expiry) on the event heap.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/pipeline.py [--proposals N] [--slots N] [--repeat N]
+
+No node is needed, the lane has the timings of the new long executor with a voting delay of 7200 blocks
+and arrivals load its slots to 90%.
+"""
+import argparse
+import heapq
+import statistics
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from helpers.pipeline import DAY, EXECUTED, EXPIRED, FAILED, Lane, poisson_arrivals, simulate  # noqa: E402
+
+LANE = Lane("new long", 7_200, 64_000, DAY, 5 * DAY, 12)
+
+
+def simulate_all_events(lane, arrivals, slots):
+    """Outcomes and finish times of `simulate()`, with every step of a proposal an event of the heap."""
+    times = arrivals.times.tolist()
+    passed = arrivals.passed.tolist()
+    queue_lags = arrivals.queue_lags.tolist()
+    execute_lags = arrivals.execute_lags.tolist()
+    outcome = [FAILED] * len(times)
+    finished = [0.0] * len(times)
+    backlog = deque()
+    free = slots
+    events = [(times[0], 1, 0)] if times else []
+
+    def create(now, i):
+        heapq.heappush(events, (now + lane.voting_window, 0, i))
+
+    while events:
+        now, event, i = heapq.heappop(events)
+        if event == 0:  # voting ended
+            if backlog:
+                create(now, backlog.popleft())
+            else:
+                free += 1
+            if passed[i]:
+                heapq.heappush(events, (now + queue_lags[i], 2, i))
+            else:
+                finished[i] = now
+        elif event == 1:  # arrived
+            if i + 1 < len(times):
+                heapq.heappush(events, (times[i + 1], 1, i + 1))
+            if free:
+                free -= 1
+                create(now, i)
+            else:
+                backlog.append(i)
+        elif event == 2:  # queued
+            if execute_lags[i] <= lane.grace_period:
+                heapq.heappush(events, (now + lane.delay + execute_lags[i], 3, i))
+            else:
+                heapq.heappush(events, (now + lane.delay + lane.grace_period, 4, i))
+        else:  # executed or expired
+            outcome[i] = EXECUTED if event == 3 else EXPIRED
+            finished[i] = now
+    return outcome, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--proposals", type=int, default=1_000_000, help="number of proposals")
+    parser.add_argument("--slots", type=int, default=4, help="proposals voted at a time")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args = parser.parse_args()
+
+    rate = 0.9 * LANE.capacity(args.slots)
+    arrivals = poisson_arrivals(args.proposals, rate, np.random.default_rng(0))
+
+    variants = {
+        "simulate()": lambda: simulate(LANE, arrivals, args.slots),
+        "every step on the heap": lambda: simulate_all_events(LANE, arrivals, args.slots),
+    }
+    results = {}
+    print(f"{args.proposals} proposals, {args.slots} slots, {rate:.1f} proposals per month")
+    print(f"{'variant':<32}{'median (ms)':>12}{'min (ms)':>12}")
+    for name, run in variants.items():
+        times_ms = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = run()
+            times_ms.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<32}{statistics.median(times_ms):>12.1f}{min(times_ms):>12.1f}")
+
+    run = results["simulate()"]
+    outcome, finished = results["every step on the heap"]
+    assert run.outcome.tolist() == outcome
+    assert np.allclose(run.finished, finished)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Timing of loading a `ProposalTable` export against decoding the `getProposalById()` return data of
+every proposal, the work left once the calls are answered.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/proposal_export.py [--proposals N] [--repeat N]
+
+No node is needed, the proposals are pseudo-random with one to three actions each.
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from eth_abi import decode_abi, encode_abi  # noqa: E402
+
+from helpers.matchers import PROPOSAL_FIELDS  # noqa: E402
+from helpers.proposal_export import ProposalTable  # noqa: E402
+
+
+def synthetic_proposals(count, seed=0):
+    rng = random.Random(seed)
+    proposals = []
+    for i in range(count):
+        actions = rng.randint(1, 3)
+        proposals.append(dict(
+            id=i,
+            creator=f"0x{rng.getrandbits(160):040x}",
+            executor="0xee56e2b3d491590b5b31738cc34d5232f378a8d5",
+            targets=[f"0x{rng.getrandbits(160):040x}" for _ in range(actions)],
+            values=[0] * actions,
+            signatures=["execute()"] * actions,
+            calldatas=[b""] * actions,
+            withDelegatecalls=[True] * actions,
+            startBlock=12_000_000 + i * 20_000,
+            endBlock=12_019_200 + i * 20_000,
+            executionTime=1_620_000_000 + i * 86_400,
+            forVotes=rng.getrandbits(90),
+            againstVotes=rng.getrandbits(70),
+            executed=True,
+            canceled=False,
+            strategy="0xb7e383ef9b1e9189fc0f71fb30af8aa14377429e",
+            ipfsHash=rng.randbytes(32),
+        ))
+    return proposals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--proposals", type=int, default=92, help="number of proposals")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per variant")
+    args = parser.parse_args()
+
+    proposals = synthetic_proposals(args.proposals)
+    types = [f"({','.join(type_ for type_, _ in PROPOSAL_FIELDS)})"]
+    encoded = [encode_abi(types, [[p[name] for _, name in PROPOSAL_FIELDS]]) for p in proposals]
+    path = Path(tempfile.mkdtemp()) / "proposals.npz"
+    ProposalTable.from_proposals([{**p, "state": 7} for p in proposals], 15_265_830).save(path)
+
+    variants = {
+        "decode getProposalById() data": lambda: [decode_abi(types, data) for data in encoded],
+        "load export (columns)": lambda: ProposalTable.load(path),
+        "load export (records)": lambda: list(ProposalTable.load(path)),
+    }
+    print(f"{path.stat().st_size} bytes for {args.proposals} proposals\n")
+    print(f"{'variant':<32}{'median (ms)':>12}{'min (ms)':>12}")
+    for name, run in variants.items():
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<32}{statistics.median(times):>12.2f}{min(times):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Timing of repeated governance and executor view calls at one block, straight to the node vs through
+a `ReadCache`.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/read_cache.py [--network NAME] [--proposals N] [--passes N] [--repeat N]
+
+Each pass reads `getProposalState()` and `getProposalById()` of the last `--proposals` proposals and
+the voting delay and timelock delays, like the checks of a test reading the same proposals several
+times. A transaction between variants gives each a new latest block, the cache starts cold.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import brownie
+
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "tests"))
+
+from helpers.read_cache import ReadCache  # noqa: E402
+
+AAVE_GOVERNANCE_V2 = "0xEC568fffba86c094cf06b22134B23074DFE2252c"
+EXECUTORS = ["0xEE56e2B3D491590B5b31738cC34d5232F378a8D5", "0x61910EcD7e8e942136CE7Fe7943f956cea1CC2f7"]
+
+
+def read_pass(governance, executors, ids):
+    results = [governance.getVotingDelay()]
+    for executor in executors:
+        results.append(executor.getDelay())
+    for proposal_id in ids:
+        results.append(governance.getProposalState(proposal_id))
+        results.append(governance.getProposalById(proposal_id))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--network", default="mainnet-fork-15265830", help="brownie network to connect to")
+    parser.add_argument("--proposals", type=int, default=20, help="proposals read per pass")
+    parser.add_argument("--passes", type=int, default=5, help="passes over the proposals per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args = parser.parse_args()
+
+    project = brownie.project.load(PROJECT_DIR)
+    brownie.network.connect(args.network)
+    governance = project.AaveGovernanceV2.at(AAVE_GOVERNANCE_V2)
+    executors = [project.OldExecutor.at(address) for address in EXECUTORS]
+    count = governance.getProposalsCount()
+    ids = list(range(max(count - args.proposals, 0), count))
+
+    cache = ReadCache()
+    variants = {
+        "one call per read": (governance, executors),
+        "ReadCache": (cache.wrap(governance), [cache.wrap(executor) for executor in executors]),
+    }
+    results = {}
+    print(f"{len(ids)} proposals x {args.passes} passes on {args.network}")
+    print(f"{'variant':<32}{'median (ms)':>12}{'min (ms)':>12}")
+    for name, (governance_, executors_) in variants.items():
+        times_ms = []
+        for _ in range(args.repeat):
+            brownie.chain.mine()
+            start = time.perf_counter()
+            results[name] = [read_pass(governance_, executors_, ids) for _ in range(args.passes)]
+            times_ms.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<32}{statistics.median(times_ms):>12.1f}{min(times_ms):>12.1f}")
+
+    print(f"hit rate {cache.hit_rate():.1%}, {cache.misses} calls sent, {cache.invalidations} results invalidated")
+    assert results["ReadCache"] == results["one call per read"]
+
+
+if __name__ == "__main__":
+    main()
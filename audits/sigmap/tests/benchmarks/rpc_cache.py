@@ -0,0 +1,39 @@
+"""
+Cold start benchmark of the live upstream provider vs the replayed RPC archive.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/rpc_cache.py [--repeat N] [extra brownie test args...]
+
+The archive is recorded first if it does not exist. For a true cold start the fork node must not
+keep its own cache between runs, add `disable_cache=true` to the network's `cmd_settings` when
+using ganache v7.
+"""
+import argparse
+
+from common import brownie_test, report
+
+TESTS = ["tests"]
+
+VARIANTS = {
+    "live provider": ["--rpc-cache=off"],
+    "replayed archive": ["--rpc-cache=replay"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per variant")
+    args, extra = parser.parse_known_args()
+
+    # Fills the archive with every upstream read (a no-op when it is complete)
+    brownie_test([*TESTS, "--rpc-cache=record", *extra])
+
+    report({
+        name: [brownie_test([*TESTS, *variant_args, *extra]) for _ in range(args.repeat)]
+        for name, variant_args in VARIANTS.items()
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Benchmark of `test_setup` state checks, one `eth_call` per getter vs one aggregated multicall.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/state_reads.py [--repeat N] [extra brownie test args...]
+
+The difference is largest on a cold fork of a remote provider, where every uncached read is an
+upstream round trip.
+"""
+import argparse
+
+from common import brownie_test, report
+
+TEST = "tests/test_migration.py::test_setup"
+
+VARIANTS = {
+    "before (one call per getter)": ["--per-call-reads"],
+    "after (multicall)": [],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args, extra = parser.parse_known_args()
+
+    report({
+        name: [brownie_test([TEST, *variant_args, *extra]) for _ in range(args.repeat)]
+        for name, variant_args in VARIANTS.items()
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Timing of `StreamBook` balances against evaluating `balanceOf()` stream by stream in Python integers.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/streams.py [--streams N] [--times N] [--repeat N]
+
+No node is needed, the streams are pseudo-random with amounts of the size of AAVE reserve streams.
+The per-stream loop is a lower bound of the cost of one `eth_call` per stream and time.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from helpers.streams import StreamBook  # noqa: E402
+
+SENDER = "0x25F2226B597E8F9514B3F68F00f494cF4f286491"
+START = 1_660_000_000
+
+
+def synthetic_streams(count, seed=0):
+    rng = random.Random(seed)
+    streams = []
+    for i in range(count):
+        start = START + rng.randrange(365 * 86_400)
+        duration = rng.randrange(86_400, 3 * 365 * 86_400)
+        rate = rng.randrange(10 ** 9, 10 ** 17)
+        deposit = rate * duration
+        withdrawn = rng.choice([0, rng.randrange(deposit // 10)])
+        streams.append((i, SENDER, f"0x{i + 1:040x}", deposit, rate, deposit - withdrawn, start, start + duration))
+    return streams
+
+
+def balance_of(stream, now):
+    """`balanceOf(id, recipient)` of one stream in Python integers, `None` if it reverts."""
+    _, _, _, deposit, rate, remaining, start, stop = stream
+    delta = 0 if now <= start else min(now, stop) - start
+    balance = delta * rate - (deposit - remaining)
+    return None if balance < 0 else balance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=5_000, help="number of streams")
+    parser.add_argument("--times", type=int, default=365, help="timestamps in the grid")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args = parser.parse_args()
+
+    streams = synthetic_streams(args.streams)
+    book = StreamBook(*zip(*streams))
+    times = [START + i * 4 * 365 * 86_400 // args.times for i in range(args.times)]
+
+    variants = {
+        "per stream (python ints)": lambda: [[balance_of(stream, now) for stream in streams] for now in times],
+        "StreamBook (exact)": lambda: book.recipient_balances(times).to_ints(),
+        "StreamBook (float)": lambda: book.recipient_balances(times).to_float(),
+        "StreamBook outflows (exact)": lambda: book.outflows(times).to_ints(),
+    }
+    results = {}
+    print(f"{args.streams} streams x {args.times} times")
+    print(f"{'variant':<32}{'median (ms)':>12}{'min (ms)':>12}")
+    for name, run in variants.items():
+        times_ms = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = run()
+            times_ms.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<32}{statistics.median(times_ms):>12.1f}{min(times_ms):>12.1f}")
+
+    assert results["StreamBook (exact)"].tolist() == results["per stream (python ints)"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Timing of the parameter sweep on synthetic votes shaped like the historical proposals.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/sweep.py [--proposals N] [--size N] [--repeat N]
+
+No node is needed, the votes are pseudo-random amounts of the size of the AAVE voting supply.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from helpers.sweep import ProposalVotes, Sweep  # noqa: E402
+
+
+def synthetic_votes(count, seed=0):
+    rng = random.Random(seed)
+    supplies = [rng.randint(10 ** 24, 2 * 10 ** 25) for _ in range(count)]
+    return ProposalVotes(
+        range(count),
+        [rng.randrange(supply // 5) for supply in supplies],
+        [rng.randrange(supply // 50) for supply in supplies],
+        supplies,
+        [(50, 50, 200)] * count,
+        [rng.randrange(supply // 50) for supply in supplies],
+        supplies,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--proposals", type=int, default=92, help="number of proposals")
+    parser.add_argument("--size", type=int, default=100, help="grid points per parameter")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per grid")
+    args = parser.parse_args()
+
+    votes = synthetic_votes(args.proposals)
+    axis = [i * 10_000 // args.size for i in range(args.size)]
+    grids = {
+        f"{args.size}x{args.size}": ([125], axis, axis),
+        f"{args.size}x{args.size}x{args.size}": (axis, axis, axis),
+    }
+
+    print(f"{'grid':<32}{'median (ms)':>12}{'min (ms)':>12}")
+    for name, grid in grids.items():
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            Sweep(votes, *grid).flip_counts()
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<32}{statistics.median(times):>12.1f}{min(times):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
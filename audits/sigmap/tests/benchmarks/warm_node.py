@@ -0,0 +1,44 @@
+"""
+Session start up benchmark: brownie's own fork node vs a warm node reset to its fork snapshot, and a
+warm node restarted from its stored db.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/warm_node.py [--repeat N] [extra brownie test args...]
+
+A throwaway node directory is used, so the first warm session forks and is not measured.
+"""
+import argparse
+import shutil
+import tempfile
+
+from common import brownie_test, report
+
+# A cheap module, so the times are dominated by starting the node
+TESTS = ["tests/test_actions.py"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant")
+    args, extra = parser.parse_known_args()
+
+    node_dir = tempfile.mkdtemp(prefix="warm-node-")
+    warm = ["--warm-node", f"--node-dir={node_dir}"]
+    try:
+        brownie_test([*TESTS, *warm, "--stop-node", *extra])
+        results = {"fresh fork": [brownie_test([*TESTS, *extra]) for _ in range(args.repeat)]}
+        results["restored from db"] = [
+            brownie_test([*TESTS, *warm, "--stop-node", *extra]) for _ in range(args.repeat)
+        ]
+        # The last restore stopped the node, start it again before measuring resets
+        brownie_test([*TESTS, *warm, *extra])
+        results["reset running node"] = [brownie_test([*TESTS, *warm, *extra]) for _ in range(args.repeat)]
+    finally:
+        brownie_test([*TESTS, *warm, "--stop-node", *extra])
+        shutil.rmtree(node_dir, ignore_errors=True)
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Scaling of the suite over 1..N xdist workers, each with its own fork node.
+
+Run from the brownie project directory (`audits/sigmap/tests`):
+
+    python benchmarks/xdist.py [--workers N] [--repeat N] [extra brownie test args...]
+
+Two workloads are timed, the default suite and the parametrized migration variants
+(`tests/test_migration_variants.py`, one unit of work per variant). Pass `--rpc-cache=replay` to
+take the upstream provider out of the measurement.
+"""
+import argparse
+import os
+import statistics
+
+from common import brownie_test
+
+WORKLOADS = {
+    "suite": ["tests"],
+    "migration variants": ["tests/test_migration_variants.py", "--runslow"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="largest number of workers")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per worker count")
+    args, extra = parser.parse_known_args()
+
+    for name, workload in WORKLOADS.items():
+        print(f"\n{name}")
+        print(f"{'workers':<10}{'median (s)':>12}{'speed up':>10}")
+        serial = statistics.median(brownie_test([*workload, *extra]) for _ in range(args.repeat))
+        print(f"{'serial':<10}{serial:>12.1f}{1:>10.1f}")
+        for workers in range(1, args.workers + 1):
+            elapsed = statistics.median(
+                brownie_test([*workload, "-n", str(workers), *extra]) for _ in range(args.repeat)
+            )
+            print(f"{workers:<10}{elapsed:>12.1f}{serial / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.8;
+
+import {IAaveGovernanceV2} from '../aave-gov-level-2-update/interfaces/IAaveGovernanceV2.sol';
+
+/**
+ * @title GovernanceMock
+ * @notice Acts as both governance and governance strategy for `Executor` view functions,
+ * returning whichever votes, supplies and execution time were last set.
+ * Used to cross-check the Python `ExecutorModel` against the contract.
+ **/
+contract GovernanceMock {
+  uint256 public forVotes;
+  uint256 public againstVotes;
+  uint256 public votingSupply;
+  uint256 public executionTime;
+  uint256 public propositionPower;
+  uint256 public propositionSupply;
+
+  function setVotes(
+    uint256 newForVotes,
+    uint256 newAgainstVotes,
+    uint256 newVotingSupply
+  ) external {
+    forVotes = newForVotes;
+    againstVotes = newAgainstVotes;
+    votingSupply = newVotingSupply;
+  }
+
+  function setExecutionTime(uint256 newExecutionTime) external {
+    executionTime = newExecutionTime;
+  }
+
+  function setPropositionPower(uint256 newPropositionPower, uint256 newPropositionSupply) external {
+    propositionPower = newPropositionPower;
+    propositionSupply = newPropositionSupply;
+  }
+
+  // IAaveGovernanceV2
+
+  function getGovernanceStrategy() external view returns (address) {
+    return address(this);
+  }
+
+  function getProposalById(uint256 proposalId)
+    external
+    view
+    returns (IAaveGovernanceV2.ProposalWithoutVotes memory proposal)
+  {
+    proposal.id = proposalId;
+    proposal.executionTime = executionTime;
+    proposal.forVotes = forVotes;
+    proposal.againstVotes = againstVotes;
+    proposal.strategy = address(this);
+  }
+
+  // IGovernanceStrategy
+
+  function getTotalVotingSupplyAt(uint256) external view returns (uint256) {
+    return votingSupply;
+  }
+
+  function getPropositionPowerAt(address, uint256) external view returns (uint256) {
+    return propositionPower;
+  }
+
+  function getTotalPropositionSupplyAt(uint256) external view returns (uint256) {
+    return propositionSupply;
+  }
+}
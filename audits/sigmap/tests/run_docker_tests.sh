@@ -10,5 +10,8 @@ then
   exit 1
 fi
 
-# Set the build context to the parent directory
-cd $HERE/../ && docker build --build-arg INFURA_URL=$1 -f tests/Dockerfile -t review-testing . && docker run -it review-testing
+# Set the build context to the parent directory. The forked chain is kept in the `review-testing-node`
+# volume, so later runs restore it from disk instead of forking again. `gas-baselines/` of the checkout
+# is mounted, so runs check against its baselines and baselines recorded in the container are kept.
+mkdir -p $HERE/gas-baselines && cd $HERE/../ && docker build --build-arg INFURA_URL=$1 -f tests/Dockerfile -t review-testing . && \
+docker run -it -v review-testing-node:/tests/.node -v $HERE/gas-baselines:/tests/gas-baselines review-testing
@@ -0,0 +1,9 @@
+#!/bin/sh
+
+HERE="$( cd "$( dirname "$0" )" >/dev/null 2>&1 && pwd )"
+# Runs `brownie test` with its arguments after restoring compiled contracts from the artifact cache
+# (`ARTIFACT_CACHE`, default `.artifact-cache/`). Brownie's pytest plugin compiles the project before
+# any conftest is imported, so the restore has to run before `brownie test` starts. The session then
+# stores the units it compiled.
+
+cd $HERE && python3 tests/helpers/artifact_cache.py restore && exec brownie test "$@"
@@ -0,0 +1,32 @@
+"""
+Builds or extends the voting power index of AAVE and stkAAVE holders up to the fork block.
+
+    brownie run build_power_index --network mainnet-fork-15265830
+
+Logs are read from the network's upstream node, an interrupted build resumes from its cursor.
+"""
+import time
+
+from brownie import network
+
+from tests.helpers.node_pool import fork_block, fork_url
+from tests.helpers.power_index import POWER_INDEX_DIR, PowerIndex
+
+
+def main():
+    active = network.show_active()
+    end_block = fork_block(active)
+    index = PowerIndex(POWER_INDEX_DIR / f"{active}.sqlite")
+    start = time.perf_counter()
+
+    def progress(token, first, last, logs):
+        print(f"{token:>8} {first:>9}-{last:<9}{logs:>7} logs  {time.perf_counter() - start:8.1f}s")
+
+    try:
+        index.update(fork_url(active), end_block, progress=progress)
+        holders = index.top_holders(end_block, 10)
+    finally:
+        index.close()
+    print(f"\n{index.path} built up to block {end_block}, top holders:")
+    for holder, power in holders:
+        print(f"  {holder} {power / 10 ** 18:>14,.0f}")
@@ -0,0 +1,39 @@
+"""
+Exports every proposal of `AaveGovernanceV2` with its state to `proposal-export/<network>.npz`, or
+brings an existing export up to date.
+
+    brownie run export_proposals --network mainnet-fork-15265830
+
+Fork networks are read at their fork block, other networks at the latest block. Updating an export
+only reads the proposals created since and those whose state could still change.
+"""
+import time
+
+from brownie import AaveGovernanceV2, chain, network, web3
+from brownie._config import CONFIG
+
+from tests.helpers.node_pool import fork_block
+from tests.helpers.proposal_export import PROPOSAL_EXPORT_DIR, ProposalTable, export_proposals
+
+AAVE_GOVERNANCE_V2 = "0xEC568fffba86c094cf06b22134B23074DFE2252c"
+
+
+def main():
+    active = network.show_active()
+    path = PROPOSAL_EXPORT_DIR / f"{active}.npz"
+    forked = "fork" in (CONFIG.networks[active].get("cmd_settings") or {})
+    block = fork_block(active) if forked else chain.height
+
+    table = ProposalTable.load(path) if path.exists() else None
+    if table is not None and table.block > block:
+        raise SystemExit(f"{path} was exported at block {table.block}, after block {block}")
+    previous = 0 if table is None else len(table)
+
+    start = time.perf_counter()
+    table = export_proposals(web3, AaveGovernanceV2.at(AAVE_GOVERNANCE_V2), table, block)
+    table.save(path)
+    print(f"{path}: {len(table)} proposals at block {block} ({len(table) - previous} new) in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    records = list(ProposalTable.load(path))
+    print(f"loaded {len(records)} records in {(time.perf_counter() - start) * 1000:.1f}ms")
@@ -0,0 +1,46 @@
+"""
+Sweeps `(PROPOSITION_THRESHOLD, VOTE_DIFFERENTIAL, MINIMUM_QUORUM)` over every historical proposal of
+`AaveGovernanceV2` and reports the proposals whose outcome would flip.
+
+    brownie run governance_sweep --network mainnet-fork-15265830
+
+Edit the grid below to change the swept ranges (percentages with two decimals, 10_000 is 100%).
+"""
+import time
+
+from brownie import AaveGovernanceV2, GovernanceStrategy, OldExecutor
+
+from tests.helpers.sweep import ProposalVotes, Sweep
+
+AAVE_GOVERNANCE_V2 = "0xEC568fffba86c094cf06b22134B23074DFE2252c"
+
+PROPOSITION_THRESHOLDS = [50, 100, 125, 150, 200]
+VOTE_DIFFERENTIALS = range(0, 10_000, 100)
+MINIMUM_QUORUMS = range(0, 10_000, 100)
+
+# Grid points reported in detail, the new long executor and both old executors
+REPORTED = [(125, 650, 650), (200, 1500, 2000), (50, 50, 200)]
+
+
+def main():
+    governance = AaveGovernanceV2.at(AAVE_GOVERNANCE_V2)
+
+    start = time.perf_counter()
+    votes = ProposalVotes.load(governance, GovernanceStrategy.at, OldExecutor.at, with_creators=True)
+    print(f"loaded {len(votes)} proposals in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    sweep = Sweep(
+        votes,
+        sorted(set(PROPOSITION_THRESHOLDS) | {t for t, _, _ in REPORTED}),
+        sorted(set(VOTE_DIFFERENTIALS) | {d for _, d, _ in REPORTED}),
+        sorted(set(MINIMUM_QUORUMS) | {q for _, _, q in REPORTED}),
+    )
+    points = sweep.flipped.shape[:3]
+    print(f"evaluated {points[0]}x{points[1]}x{points[2]} grid in {time.perf_counter() - start:.3f}s")
+
+    print(f"\nproposals flipping anywhere on the grid: {sweep.ever_flipped()}")
+    print(f"\n{'threshold':>10}{'differential':>14}{'quorum':>8}  flips")
+    for params in REPORTED:
+        now_succeeding, now_failing = sweep.flips(*params)
+        print(f"{params[0]:>10}{params[1]:>14}{params[2]:>8}  +{now_succeeding} -{now_failing}")
@@ -0,0 +1,68 @@
+"""
+Simulates proposals going through the short and long executors, before and after the migration, and
+reports per lane the proposals executed per month, slot utilization, latencies and expiries.
+
+    brownie run pipeline_sim main [<slots>] [<new long executor>] --network mainnet-fork-15265830
+
+Lane timings are read from `AaveGovernanceV2` and the executors. After the migration the voting delay
+is the 7200 blocks set by `ProposalPayloadNewLongExecutor`. The new long executor is read at the address
+given, or else taken from its constructor arguments in `tests/helpers/migration.py`. `slots` is the
+number of proposals the voters of a lane follow at a time (default 4).
+"""
+import numpy as np
+from brownie import AaveGovernanceV2, Executor, OldExecutor
+
+from tests.helpers.migration import NEW_LONG_EXECUTOR_ARGS
+from tests.helpers.pipeline import DAY, EXPIRED, Lane, poisson_arrivals, simulate
+
+AAVE_GOVERNANCE_V2 = "0xEC568fffba86c094cf06b22134B23074DFE2252c"
+SHORT_EXECUTOR = "0xEE56e2B3D491590B5b31738cC34d5232F378a8D5"
+LONG_EXECUTOR = "0x61910EcD7e8e942136CE7Fe7943f956cea1CC2f7"
+# `ProposalPayloadNewLongExecutor.VOTING_DELAY`
+VOTING_DELAY = 7200
+
+PROPOSALS = 200_000
+# Arrival rates as shares of each lane's capacity
+LOADS = [0.5, 0.8, 0.9, 0.95, 1.0]
+# Mean seconds from `executionTime` to `execute()` as shares of the grace period
+EXECUTE_LAGS = [0.05, 0.1, 0.2, 0.3, 0.5]
+
+
+def main(slots=4, new_long_executor=None):
+    slots = int(slots)
+    governance = AaveGovernanceV2.at(AAVE_GOVERNANCE_V2)
+    short = Lane.read("short", governance, OldExecutor.at(SHORT_EXECUTOR))
+    long = Lane.read("long", governance, OldExecutor.at(LONG_EXECUTOR))
+    if new_long_executor is None:
+        args = NEW_LONG_EXECUTOR_ARGS
+        new_long = Lane("new long", VOTING_DELAY, args["vote_duration"], args["delay"], args["grace_period"], short.block_time)
+    else:
+        new_long = Lane.read("new long", governance, Executor.at(new_long_executor))._replace(voting_delay=VOTING_DELAY)
+    lanes = [short, long, short._replace(name="short (migrated)", voting_delay=VOTING_DELAY), new_long]
+
+    print(f"{'lane':<18}{'voting (d)':>11}{'delay (d)':>10}{'grace (d)':>10}{'capacity/month':>16}")
+    for lane in lanes:
+        print(
+            f"{lane.name:<18}{lane.voting_window / DAY:>11.2f}{lane.delay / DAY:>10.2f}{lane.grace_period / DAY:>10.2f}"
+            f"{lane.capacity(slots):>16.1f}"
+        )
+
+    rng = np.random.default_rng(0)
+    print(f"\n{slots} slots, {PROPOSALS} proposals per run, latencies in days from arrival to execution")
+    print(f"{'lane':<18}{'load':>6}{'executed/month':>16}{'utilization':>13}{'wait p99':>10}{'p50':>8}{'p90':>8}{'p99':>8}")
+    for lane in lanes:
+        for load in LOADS:
+            run = simulate(lane, poisson_arrivals(PROPOSALS, load * lane.capacity(slots), rng), slots)
+            latencies = run.latencies()
+            print(
+                f"{lane.name:<18}{load:>6.2f}{run.per_month():>16.2f}{run.utilization():>13.3f}"
+                f"{run.waits()[99] / DAY:>10.1f}{latencies[50] / DAY:>8.1f}{latencies[90] / DAY:>8.1f}{latencies[99] / DAY:>8.1f}"
+            )
+
+    print("\nExpired proposals at 80% load by mean delay of `execute()` after `executionTime`")
+    print(f"{'lane':<18}{'lag (d)':>9}{'expired':>9}{'in timelock':>13}")
+    for lane in lanes:
+        for lag in EXECUTE_LAGS:
+            arrivals = poisson_arrivals(PROPOSALS, 0.8 * lane.capacity(slots), rng, execute_lag=lag * lane.grace_period)
+            run = simulate(lane, arrivals, slots)
+            print(f"{lane.name:<18}{lag * lane.grace_period / DAY:>9.2f}{run.share(EXPIRED):>9.2%}{run.mean_in_timelock():>13.2f}")
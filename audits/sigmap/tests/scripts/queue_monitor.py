@@ -0,0 +1,51 @@
+"""
+Indexes the actions queued on the short, long and optionally new long executors and reports those
+executable now and those expiring within `days`.
+
+    brownie run queue_monitor main <days> [<new long executor>] --network mainnet
+
+The index is kept in `queue-index/<network>.sqlite`, each run only reads the blocks added since the
+previous one.
+"""
+from pathlib import Path
+
+from brownie import OldExecutor, chain, network, web3
+from eth_utils import to_checksum_address
+
+from tests.helpers.queue_index import QueueIndex
+
+QUEUE_INDEX_DIR = Path(__file__).parent.parent / "queue-index"
+DAY = 60 * 60 * 24
+EXECUTORS = {
+    "0xEE56e2B3D491590B5b31738cC34d5232F378a8D5": "short",
+    "0x61910EcD7e8e942136CE7Fe7943f956cea1CC2f7": "long",
+}
+
+
+def main(days=2, new_long_executor=None):
+    executors = dict(EXECUTORS)
+    if new_long_executor is not None:
+        executors[to_checksum_address(new_long_executor)] = "new long"
+
+    index = QueueIndex(QUEUE_INDEX_DIR / f"{network.show_active()}.sqlite")
+    try:
+        for address in executors:
+            # `Executor` and `OldExecutor` share `GRACE_PERIOD()`
+            index.add_executor(address, OldExecutor.at(address).GRACE_PERIOD())
+        index.update(web3.provider.endpoint_uri, chain.height)
+
+        now = chain.time()
+        report("Executable", index.executable(now), executors, now)
+        report(f"Expiring within {days} days", index.expiring(now, int(float(days) * DAY)), executors, now)
+        report("Expired, still queued", index.expired(now), executors, now)
+    finally:
+        index.close()
+
+
+def report(title, actions, executors, now):
+    print(f"\n{title}: {len(actions)}")
+    for action in actions:
+        print(
+            f"  {executors[action.executor]:>8} {action.action_hash} {action.target} {action.signature or '()':<24}"
+            f" executable in {(action.execution_time - now) / DAY:6.2f}d, expires in {(action.expires_at - now) / DAY:6.2f}d"
+        )
@@ -0,0 +1,56 @@
+"""
+Replays every executed proposal of the old short and long executors through the new `Executor`
+installed at their addresses and reports actions whose outcome or events differ.
+
+    brownie run replay_proposals main <workers> --network mainnet-fork-15265830
+
+Each worker process forks its own node, their upstream reads go through one shared in-memory cache.
+Requires ganache v7, hardhat or anvil to replace contract code.
+"""
+import time
+
+from brownie import AaveGovernanceV2, network, project
+
+from tests.helpers.replay import historical_proposals, replay_parallel
+from tests.helpers.rpc_cache import RpcArchive, RpcCacheServer, route_fork
+
+AAVE_GOVERNANCE_V2 = "0xEC568fffba86c094cf06b22134B23074DFE2252c"
+EXECUTORS = {
+    "0xEE56e2B3D491590B5b31738cC34d5232F378a8D5": "short",
+    "0x61910EcD7e8e942136CE7Fe7943f956cea1CC2f7": "long",
+}
+
+
+def main(workers=4):
+    governance = AaveGovernanceV2.at(AAVE_GOVERNANCE_V2)
+    proposals = historical_proposals(governance, EXECUTORS)
+    print(f"replaying {len(proposals)} executed proposals on {workers} workers")
+
+    active = network.show_active()
+    server = RpcCacheServer(RpcArchive())
+    server.upstream = route_fork(active, server.start())
+    project_path = project.get_loaded_projects()[0]._path
+
+    start = time.perf_counter()
+    results = []
+    try:
+        print(f"{'proposal':>8}{'executor':>10}{'actions':>9}{'seconds':>9}{'gas delta':>11}  result")
+        actions = {proposal.id: len(proposal.actions) for proposal in proposals}
+        for result in replay_parallel(
+            proposals, project_path, active, server.url, governance, list(EXECUTORS), int(workers)
+        ):
+            results.append(result)
+            outcome = "same" if not result.differences else f"{len(result.differences)} differences"
+            print(
+                f"{result.id:>8}{EXECUTORS[result.executor]:>10}{actions[result.id]:>9}"
+                f"{result.seconds:>9.1f}{result.gas_delta:>11}  {outcome}"
+            )
+            for difference in result.differences:
+                print(f"{'':>10}{difference}")
+    finally:
+        server.stop()
+
+    elapsed = time.perf_counter() - start
+    busy = sum(result.seconds for result in results)
+    differing = [result.id for result in results if result.differences]
+    print(f"\n{len(results)} proposals in {elapsed:.1f}s ({busy:.1f}s of replays), differing: {differing}")
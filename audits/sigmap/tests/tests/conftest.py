@@ -1,7 +1,33 @@
+import os
 import types
+from pathlib import Path
+
 import brownie
 import pytest
 from brownie import web3
+from brownie._config import CONFIG
+
+from helpers.artifact_cache import DEFAULT_CACHE, ArtifactCache
+from helpers.chain import ChainWarp
+from helpers.checkpoints import Checkpoints
+from helpers.evm import InProcessNode
+from helpers.gas import GAS_BASELINE_DIR, GasBaselines
+from helpers.lifecycle import ProposalLifecycle
+from helpers.mainnet import MainnetContracts
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS, Migration, VariantSummary
+from helpers.multicall import StateReads, assert_state_per_call
+from helpers.node import ManagedNode
+from helpers.node_pool import NodePool, configure_worker, node_info
+from helpers.power_index import POWER_INDEX_DIR, TOKENS, PowerIndex
+from helpers.proposal_export import PROPOSAL_EXPORT_DIR, ProposalTable, export_proposals
+from helpers.read_cache import ReadCache
+from helpers.rpc_cache import RpcArchive, RpcCacheServer, route_fork
+from helpers.rpc_profile import RpcProfiler
+
+RPC_ARCHIVE_DIR = Path(__file__).parent.parent / "rpc-archive"
+NODE_DIR = Path(__file__).parent.parent / ".node"
+RPC_PROFILE_DIR = Path(__file__).parent.parent / "rpc-profile"
+PROJECT_DIR = Path(__file__).parent.parent
 
 
 @pytest.fixture(scope="session")
@@ -25,13 +51,228 @@ def pytest_addoption(parser):
     parser.addoption(
         "--runslow", action="store_true", default=False, help="run slow tests"
     )
+    parser.addoption(
+        "--linear-mining",
+        action="store_true",
+        default=False,
+        help="mine blocks one RPC call at a time instead of bulk mining",
+    )
+    parser.addoption(
+        "--per-call-reads",
+        action="store_true",
+        default=False,
+        help="check state tables with one eth_call per getter instead of a multicall",
+    )
+    parser.addoption(
+        "--rpc-cache",
+        choices=["off", "record", "replay"],
+        default="off",
+        help="serve the fork's upstream reads from an archive (replay) or build it (record)",
+    )
+    parser.addoption(
+        "--rpc-archive",
+        default=None,
+        help="upstream RPC archive (default rpc-archive/<network>.json.gz)",
+    )
+    parser.addoption(
+        "--warm-node",
+        action="store_true",
+        default=False,
+        help="keep the fork node running between sessions and reset it to the fork state",
+    )
+    parser.addoption(
+        "--node-dir",
+        default=None,
+        help="state and db of the warm node (default .node/<network>)",
+    )
+    parser.addoption(
+        "--stop-node",
+        action="store_true",
+        default=False,
+        help="stop the warm node at the end of the session, its db is kept",
+    )
+    parser.addoption(
+        "--rpc-profile",
+        nargs="?",
+        const="",
+        default=None,
+        help="record JSON-RPC calls per test and fixture as JSON, one file per worker (default rpc-profile/<network>.json)",
+    )
+    parser.addoption(
+        "--gas-baseline",
+        default=None,
+        help="gas baselines checked by the `gas` fixture (default gas-baselines/<network>.json)",
+    )
+    parser.addoption(
+        "--gas-threshold",
+        type=float,
+        default=0.01,
+        help="fraction of gas above a baseline failing a test (default 0.01)",
+    )
+    parser.addoption(
+        "--update-gas",
+        action="store_true",
+        default=False,
+        help="replace the gas baselines with the gas measured in this session",
+    )
+    parser.addoption(
+        "--power-index",
+        default=None,
+        help="voting power index built by `brownie run build_power_index` (default power-index/<network>.sqlite)",
+    )
+    parser.addoption(
+        "--proposal-export",
+        default=None,
+        help="proposals exported by `brownie run export_proposals` (default proposal-export/<network>.npz)",
+    )
+    parser.addoption(
+        "--stateful-steps",
+        type=int,
+        default=50,
+        help="steps per example of the stateful tests (default 50)",
+    )
+    parser.addoption(
+        "--stateful-examples",
+        type=int,
+        default=20,
+        help="examples of the stateful tests (default 20)",
+    )
+    parser.addoption(
+        "--eager-contracts",
+        action="store_true",
+        default=False,
+        help="bind every mainnet contract at the session start instead of on first use",
+    )
+    parser.addoption(
+        "--evm-backend",
+        choices=["fork", "eth-tester"],
+        default="fork",
+        help="chain of the tests: the mainnet fork node, or an in-process eth-tester chain running only `no_fork` tests",
+    )
+
+
+# `ARTIFACT_CACHE` is the cache directory shared with other runs and containers, `off` to disable it
+def artifact_cache():
+    directory = os.environ.get("ARTIFACT_CACHE") or DEFAULT_CACHE
+    return None if directory == "off" else ArtifactCache(PROJECT_DIR, directory)
+
+
+def active_network(config):
+    return (config.getoption("network") or [CONFIG.settings["networks"]["default"]])[0]
 
 
+# Runs after brownie's own `pytest_configure`, which sets the port of xdist workers' fork nodes
+@pytest.hookimpl(trylast=True)
 def pytest_configure(config):
     config.addinivalue_line("markers", "slow: mark test as slow to run")
+    config.addinivalue_line("markers", "no_fork: test needs no mainnet state, runs with `--evm-backend eth-tester`")
+    network = active_network(config)
+
+    if config.getoption("--rpc-profile") is not None:
+        config._rpc_profiler = RpcProfiler()
+        config.pluginmanager.register(config._rpc_profiler, "rpc-profile")
+
+    # xdist workers fork through the master's upstream cache on the port the master assigned
+    if hasattr(config, "workerinput"):
+        configure_worker(config.workerinput, network)
+        return
+
+    # Reads the outcomes of migration variants from test reports, including those of xdist workers
+    config._variant_summary = VariantSummary()
+    config.pluginmanager.register(config._variant_summary, "variant-summary")
+
+    # Brownie's plugin compiled the project before this conftest was imported, too early to restore
+    # the cache from here (`run_tests.sh` restores it before `brownie test`). Keep the units compiled.
+    cache = artifact_cache()
+    if cache is not None:
+        cache.store()
+
+    if config.getoption("--evm-backend") == "eth-tester":
+        if config.getoption("--warm-node") or config.getoption("--rpc-cache") != "off" or config.getoption("numprocesses", None):
+            raise pytest.UsageError("--evm-backend eth-tester cannot be combined with --warm-node, --rpc-cache or -n")
+        config._evm_node = InProcessNode(network)
+        return
+
+    if config.getoption("--warm-node"):
+        if config.getoption("--rpc-cache") != "off" or config.getoption("numprocesses", None):
+            raise pytest.UsageError("--warm-node cannot be combined with --rpc-cache or -n")
+        config._warm_node = ManagedNode(network, Path(config.getoption("--node-dir") or NODE_DIR / network))
+        return
+
+    # Route the fork node's upstream reads through the local RPC archive, with xdist an in-memory
+    # archive is shared by all workers' nodes even without `--rpc-cache`
+    mode = config.getoption("--rpc-cache")
+    parallel = bool(config.getoption("numprocesses", None))
+    if mode != "off" or parallel:
+        archive = RpcArchive(
+            None if mode == "off" else config.getoption("--rpc-archive") or RPC_ARCHIVE_DIR / f"{network}.json.gz"
+        )
+        server = RpcCacheServer(archive)
+        upstream = route_fork(network, server.start())
+        if mode != "replay":
+            server.upstream = upstream
+        config._rpc_cache_server = server
+        if parallel:
+            config.pluginmanager.register(NodePool(server), "node-pool")
+
+
+# Runs before brownie connects, which then attaches to the running node instead of launching one
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    node = getattr(session.config, "_warm_node", None)
+    if node is not None and session.items:
+        print(f"\nWarm node: {node.start()} ({node.directory})")
+    evm_node = getattr(session.config, "_evm_node", None)
+    if evm_node is not None and session.items:
+        print(f"\nIn-process EVM: {evm_node.start()}")
+
+
+def pytest_unconfigure(config):
+    profiler = getattr(config, "_rpc_profiler", None)
+    if profiler is not None and profiler.methods:
+        network = active_network(config)
+        worker = getattr(config, "workerinput", {}).get("workerid", "master")
+        path = Path(config.getoption("--rpc-profile") or RPC_PROFILE_DIR / f"{network}.json")
+        profiler.save(path.with_name(f"{path.stem}-{worker}{path.suffix}"))
+    node = getattr(config, "_warm_node", None)
+    if node is not None and config.getoption("--stop-node"):
+        node.stop()
+    evm_node = getattr(config, "_evm_node", None)
+    if evm_node is not None:
+        evm_node.stop()
+    server = getattr(config, "_rpc_cache_server", None)
+    if server is not None:
+        server.stop()
+        if server.upstream is not None and server.archive.path is not None:
+            server.archive.save()
+        print(f"\nRPC archive: {server.hits} hits, {server.misses} misses ({server.archive.path or 'in memory'})")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    profiler = getattr(config, "_rpc_profiler", None)
+    if profiler is not None and profiler.methods:
+        terminalreporter.section("rpc profile")
+        for line in profiler.report():
+            terminalreporter.write_line(line)
+    gas = getattr(config, "_gas", None)
+    if gas is not None and gas.measured:
+        terminalreporter.section("gas")
+        for line in gas.report() + [""] + gas.compare("OldExecutor", "Executor"):
+            terminalreporter.write_line(line)
+    summary = getattr(config, "_variant_summary", None)
+    if summary is not None and summary.rows:
+        terminalreporter.section("migration variants")
+        for line in summary.report():
+            terminalreporter.write_line(line)
 
 
 def pytest_collection_modifyitems(config, items):
+    if config.getoption("--evm-backend") != "fork":
+        skip_fork = pytest.mark.skip(reason="needs the mainnet fork, run with --evm-backend fork")
+        for item in items:
+            if "no_fork" not in item.keywords:
+                item.add_marker(skip_fork)
+
     if config.getoption("--runslow"):
         # --runslow given in cli: do not skip slow tests
         return
@@ -41,6 +282,93 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(skip_slow)
 
 
+## Chain Fixtures
+#################
+
+
+@pytest.fixture(scope="session")
+def warp(request, chain):
+    """Fast-forwards block height and time in a constant number of RPC calls."""
+    return ChainWarp(chain, bulk=not request.config.getoption("--linear-mining"))
+
+
+@pytest.fixture(scope="session")
+def lifecycle(accounts, warp, aave_governance_v2):
+    """Creates, votes, queues and executes proposals with each step's transactions in one block."""
+    return ProposalLifecycle(aave_governance_v2, warp, accounts[0])
+
+
+@pytest.fixture(scope="session")
+def read_cache():
+    """Caches view calls of the contracts it wraps per block, `read_cache.wrap(aave_governance_v2)`."""
+    return ReadCache()
+
+
+# Every module starts from the fork state, which is also required by brownie to run under xdist
+@pytest.fixture(scope="module", autouse=True)
+def isolation(module_isolation):
+    pass
+
+
+@pytest.fixture(scope="session")
+def fork_node(request):
+    """Worker id, port and fork block of this process's fork node."""
+    return node_info(request.config, active_network(request.config))
+
+
+@pytest.fixture(scope="session")
+def gas(request):
+    """Checks the gas of named operations against the stored baselines, see `--gas-baseline`."""
+    network = active_network(request.config)
+    gas = GasBaselines(
+        request.config.getoption("--gas-baseline") or GAS_BASELINE_DIR / f"{network}.json",
+        request.config.getoption("--gas-threshold"),
+        request.config.getoption("--update-gas"),
+    )
+    # Reported in the terminal summary, which xdist workers do not print
+    request.config._gas = gas
+    yield gas
+    # Saved by the process measuring, new operations are added even if a check failed
+    if gas.save():
+        print(f"\nGas baselines written to {gas.path}")
+
+
+@pytest.fixture(scope="session")
+def power_index(request, fork_node):
+    """Voting power of every AAVE and stkAAVE holder up to the fork block, skips if not built."""
+    network = active_network(request.config)
+    path = Path(request.config.getoption("--power-index") or POWER_INDEX_DIR / f"{network}.sqlite")
+    if not path.exists():
+        pytest.skip(f"no power index at {path}, run `brownie run build_power_index --network {network}`")
+    index = PowerIndex(path)
+    if any(index.cursor(token) <= fork_node.fork_block for token in TOKENS):
+        index.close()
+        pytest.skip(f"power index at {path} is not built up to block {fork_node.fork_block}")
+    yield index
+    index.close()
+
+
+@pytest.fixture(scope="session")
+def proposal_table(request, web3, fork_node, aave_governance_v2):
+    """Every proposal of `AaveGovernanceV2` at the fork block, from the export if it is at that block."""
+    network = active_network(request.config)
+    path = Path(request.config.getoption("--proposal-export") or PROPOSAL_EXPORT_DIR / f"{network}.npz")
+    if path.exists():
+        table = ProposalTable.load(path)
+        if table.block == fork_node.fork_block:
+            return table
+    # Read in a few batch requests, `brownie run export_proposals` keeps it on disk
+    return export_proposals(web3, aave_governance_v2, block=fork_node.fork_block)
+
+
+@pytest.fixture
+def assert_state(request):
+    """Asserts a table of `Read(method, args, expected)` rows, reporting every mismatch at once."""
+    if request.config.getoption("--per-call-reads"):
+        return assert_state_per_call
+    return StateReads().assert_state
+
+
 ## Account Fixtures
 ###################
 
@@ -79,65 +407,78 @@ def carol(accounts):
 ## Mainnet Contracts
 ####################
 
-# Instance of `AaveGovernanceV2` on Ethereum Mainnet
+# Handles of the mainnet contracts, each looked up on the chain when first used
+@pytest.fixture(scope='session')
+def mainnet(web3, AaveGovernanceV2, GovernanceStrategy, OldExecutor, InitializableAdminUpgradeabilityProxy):
+    return MainnetContracts(web3, {
+        'AaveGovernanceV2': AaveGovernanceV2,
+        'GovernanceStrategy': GovernanceStrategy,
+        'OldExecutor': OldExecutor,
+        'InitializableAdminUpgradeabilityProxy': InitializableAdminUpgradeabilityProxy,
+    })
+
+
+# Binds every mainnet contract at the session start, as the fixtures did before being lazy
 @pytest.fixture(scope='session', autouse=True)
-def aave_governance_v2(AaveGovernanceV2):
-    return AaveGovernanceV2.at("0xEC568fffba86c094cf06b22134B23074DFE2252c")
+def eager_contracts(request, mainnet):
+    if request.config.getoption("--eager-contracts"):
+        mainnet.preload()
+
+
+# Instance of `AaveGovernanceV2` on Ethereum Mainnet
+@pytest.fixture(scope='session')
+def aave_governance_v2(mainnet):
+    return mainnet['aave_governance_v2']
 
 
 # Instance of `GovernanceStrategy` on Ethereum Mainnet
-@pytest.fixture(scope='session', autouse=True)
-def governance_strategy(GovernanceStrategy):
-    return GovernanceStrategy.at("0xb7e383ef9b1e9189fc0f71fb30af8aa14377429e")
+@pytest.fixture(scope='session')
+def governance_strategy(mainnet):
+    return mainnet['governance_strategy']
 
 
 # Instance of `Executor` (renamed `OldExecutor`) on Ethereum Mainnet
 # This is the previous executor for level 1 (short)
-@pytest.fixture(scope='session', autouse=True)
-def short_executor(OldExecutor):
-    return OldExecutor.at("0xEE56e2B3D491590B5b31738cC34d5232F378a8D5")
+@pytest.fixture(scope='session')
+def short_executor(mainnet):
+    return mainnet['short_executor']
 
 
 # Instance of `Executor` (renamed `OldExecutor`) on Ethereum Mainnet
 # This is the previous executor for level 2 (long)
-@pytest.fixture(scope='session', autouse=True)
-def long_executor(OldExecutor):
-    return OldExecutor.at("0x61910EcD7e8e942136CE7Fe7943f956cea1CC2f7")
+@pytest.fixture(scope='session')
+def long_executor(mainnet):
+    return mainnet['long_executor']
 
 
 # Instance of Aave ERC20 Proxy on Ethereum Mainnet
-# Note `InitializableAdminUpgradeabilityProxy` is compiled with 0.7.5 in brownie but 0.6.12 on mainnet
-@pytest.fixture(scope='session', autouse=True)
-def aave_token_proxy(InitializableAdminUpgradeabilityProxy):
-    return InitializableAdminUpgradeabilityProxy.at("0x7Fc66500c84A76Ad7e9c93437bFc5Ac33E2DDaE9")
+@pytest.fixture(scope='session')
+def aave_token_proxy(mainnet):
+    return mainnet['aave_token_proxy']
 
 
 # Instance of ABPT Proxy on Ethereum Mainnet
-# Note `InitializableAdminUpgradeabilityProxy` is compiled with 0.7.5 in brownie but 0.6.12 on mainnet
-@pytest.fixture(scope='session', autouse=True)
-def abpt_proxy(InitializableAdminUpgradeabilityProxy):
-    return InitializableAdminUpgradeabilityProxy.at("0x41A08648C3766F9F9d85598fF102a08f4ef84F84")
+@pytest.fixture(scope='session')
+def abpt_proxy(mainnet):
+    return mainnet['abpt_proxy']
 
 
-# Instance of ABPT Proxy on Ethereum Mainnet
-# Note `InitializableAdminUpgradeabilityProxy` is compiled with 0.7.5 in brownie but 0.6.12 on mainnet
-@pytest.fixture(scope='session', autouse=True)
-def stk_aave_proxy(InitializableAdminUpgradeabilityProxy):
-    return InitializableAdminUpgradeabilityProxy.at("0x4da27a545c0c5B758a6BA100e3a049001de870f5")
+# Instance of stkAAVE Proxy on Ethereum Mainnet
+@pytest.fixture(scope='session')
+def stk_aave_proxy(mainnet):
+    return mainnet['stk_aave_proxy']
 
 
-# Instance of ABPT Proxy on Ethereum Mainnet
-# Note `InitializableAdminUpgradeabilityProxy` is compiled with 0.7.5 in brownie but 0.6.12 on mainnet
-@pytest.fixture(scope='session', autouse=True)
-def stk_abpt_proxy(InitializableAdminUpgradeabilityProxy):
-    return InitializableAdminUpgradeabilityProxy.at("0xa1116930326D21fB917d5A27F1E9943A9595fb47")
+# Instance of stkABPT Proxy on Ethereum Mainnet
+@pytest.fixture(scope='session')
+def stk_abpt_proxy(mainnet):
+    return mainnet['stk_abpt_proxy']
 
 
-# Instance of ABPT Proxy on Ethereum Mainnet
-# Note `InitializableAdminUpgradeabilityProxy` is compiled with 0.7.5 in brownie but 0.6.12 on mainnet
-@pytest.fixture(scope='session', autouse=True)
-def aave_ecosystem_reserve_proxy(InitializableAdminUpgradeabilityProxy):
-    return InitializableAdminUpgradeabilityProxy.at("0x25F2226B597E8F9514B3F68F00f494cF4f286491")
+# Instance of Aave Ecosystem Reserve Proxy on Ethereum Mainnet
+@pytest.fixture(scope='session')
+def aave_ecosystem_reserve_proxy(mainnet):
+    return mainnet['aave_ecosystem_reserve_proxy']
 
 
 # Returns a list of the top Aave Token holders
@@ -158,3 +499,104 @@ def top_aave_holders():
         "0x61b0e6b68184eb0316b1285c4e76a15bfc7cd857", # EOA ~1.00%
         "0x80845058350b8c3df5c3015d8a717d64b3bf9267", # EOA ~0.78%
     ]
+
+
+## Migration Stages
+###################
+
+# Constructor arguments of the new long `Executor` after `admin`, override in a module to vary them
+@pytest.fixture(scope="module")
+def new_long_executor_args():
+    return NEW_LONG_EXECUTOR_ARGS
+
+
+# The migration's stages, deploying the new long `Executor` from the last account
+@pytest.fixture(scope="module")
+def migration_plan(
+    new_long_executor_args,
+    accounts,
+    warp,
+    mainnet,
+    aave_governance_v2,
+    short_executor,
+    long_executor,
+    top_aave_holders,
+    AaveEcosystemReserveV2,
+    Executor,
+    ProposalPayloadNewLongExecutor,
+    ProposalPayloadAaveEcosystemReserveWithVoting,
+):
+    mainnet.preload('aave_governance_v2', 'short_executor', 'long_executor')
+    contracts = types.SimpleNamespace(
+        AaveEcosystemReserveV2=AaveEcosystemReserveV2,
+        Executor=Executor,
+        ProposalPayloadNewLongExecutor=ProposalPayloadNewLongExecutor,
+        ProposalPayloadAaveEcosystemReserveWithVoting=ProposalPayloadAaveEcosystemReserveWithVoting,
+    )
+    return Migration(
+        accounts[0],
+        accounts[-1],
+        aave_governance_v2,
+        short_executor,
+        long_executor,
+        top_aave_holders,
+        warp,
+        contracts,
+        new_long_executor_args,
+    )
+
+
+# Checkpoints of the governance migration, each stage is built once per module and snapshotted
+@pytest.fixture(scope="module")
+def migration(migration_plan, chain):
+    checkpoints = Checkpoints(chain, migration_plan.stages())
+    yield checkpoints
+    checkpoints.reset()
+
+
+# Mainnet state at the fork block, before any migration stage
+@pytest.fixture
+def fork_state(migration):
+    migration.reset()
+
+
+# Both proposal payloads are deployed, the new long `Executor` is not yet
+@pytest.fixture
+def payloads_deployed(migration):
+    return migration.revert_to("payloads_deployed")
+
+
+# Both proposals are created on `AaveGovernanceV2`
+@pytest.fixture
+def proposals_created(migration):
+    return migration.revert_to("proposals_created")
+
+
+# The new long `Executor` is deployed at the address set in `ProposalPayloadNewLongExecutor`
+@pytest.fixture
+def executor_deployed(migration):
+    return migration.revert_to("executor_deployed")
+
+
+# `ProposalPayloadAaveEcosystemReserveWithVoting` is executed (the reserve voted on the long proposal)
+@pytest.fixture
+def reserve_executed(migration):
+    return migration.revert_to("reserve_executed")
+
+
+# `ProposalPayloadNewLongExecutor` is voted and its voting period is over
+@pytest.fixture
+def long_voted(migration):
+    return migration.revert_to("long_voted")
+
+
+# `ProposalPayloadNewLongExecutor` is queued
+@pytest.fixture
+def long_queued(migration):
+    return migration.revert_to("long_queued")
+
+
+# `ProposalPayloadNewLongExecutor` is executed, the new long `Executor` owns governance
+@pytest.fixture
+def new_executor_live(migration):
+    return migration.revert_to("new_executor_live")
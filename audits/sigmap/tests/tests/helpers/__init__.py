@@ -0,0 +1,4 @@
+# Shared helpers for the brownie test suite.
+#
+# `tests/` is placed on `sys.path` by pytest (it holds `conftest.py` and has no `__init__.py`),
+# so test modules and fixtures import these as `from helpers.<module> import ...`.
@@ -0,0 +1,127 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from eth_utils import keccak, to_canonical_address
+
+from .rpc import rpc_batch
+
+# Queued `Executor` transaction, fields in the order of `queueTransaction()`
+Action = namedtuple('Action', ['target', 'value', 'signature', 'data', 'execution_time', 'with_delegatecall'])
+
+# `isActionQueued(bytes32)`
+IS_ACTION_QUEUED = keccak(text='isActionQueued(bytes32)')[:4]
+
+# Actions per JSON-RPC batch request when checking `isActionQueued()`
+RPC_BATCH_SIZE = 500
+
+
+def _word(value):
+    return value.to_bytes(32, 'big')
+
+
+def _dynamic(value):
+    return _word(len(value)) + value + bytes(-len(value) % 32)
+
+
+def _bytes(data):
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    return bytes(data)
+
+
+def normalize(target, value, signature, data, execution_time, with_delegatecall):
+    """The `Action` with canonical field types (20 byte target, `str` signature, `bytes` data)."""
+    return Action(
+        to_canonical_address(str(target)),
+        int(value),
+        signature if isinstance(signature, str) else bytes(signature).decode(),
+        _bytes(data),
+        int(execution_time),
+        bool(with_delegatecall),
+    )
+
+
+@lru_cache(maxsize=None)
+def selector(signature):
+    """`bytes4(keccak256(bytes(signature)))`, memoized per signature."""
+    return keccak(text=signature)[:4]
+
+
+def call_data(signature, data):
+    """The calldata `executeTransaction()` sends, `abi.encodePacked(selector, data)` unless `signature` is empty."""
+    data = _bytes(data)
+    if not signature:
+        return data
+    return selector(signature) + data
+
+
+def encode_action(target, value, signature, data, execution_time, with_delegatecall):
+    """
+    `abi.encode(target, value, signature, data, executionTime, withDelegatecall)`
+
+    Encoded by hand, `eth_abi.encode_abi()` (v2) appends a spurious zero word for empty `bytes`.
+    """
+    return _encode(normalize(target, value, signature, data, execution_time, with_delegatecall))
+
+
+def _encode(action):
+    signature_tail = _dynamic(action.signature.encode())
+    return b''.join([
+        bytes(12) + action.target,
+        _word(action.value),
+        _word(6 * 32), # offset of `signature`
+        _word(6 * 32 + len(signature_tail)), # offset of `data`
+        _word(action.execution_time),
+        _word(int(action.with_delegatecall)),
+        signature_tail,
+        _dynamic(action.data),
+    ])
+
+
+@lru_cache(maxsize=2 ** 16)
+def _hash(action):
+    return keccak(_encode(action))
+
+
+def action_hash(target, value, signature, data, execution_time, with_delegatecall):
+    """The `actionHash` of `queueTransaction()` / `executeTransaction()` / `cancelTransaction()`"""
+    return _hash(normalize(target, value, signature, data, execution_time, with_delegatecall))
+
+
+def action_hashes(actions):
+    """`action_hash()` of each of `actions` (tuples in `Action` field order)."""
+    return [_hash(normalize(*action)) for action in actions]
+
+
+def actions_from_events(events):
+    """The `Action` of each `QueuedAction` / `ExecutedAction` / `CancelledAction` event."""
+    return [
+        normalize(
+            event['target'],
+            event['value'],
+            event['signature'],
+            event['data'],
+            event['executionTime'],
+            event['withDelegatecall'],
+        )
+        for event in events
+    ]
+
+
+def queued_flags(web3, executor, hashes, block='latest'):
+    """
+    `isActionQueued()` of `executor` for each of `hashes`, sent as JSON-RPC batch requests of
+    `RPC_BATCH_SIZE` calls rather than one round trip per hash.
+    """
+    address = str(executor)
+    flags = []
+    for start in range(0, len(hashes), RPC_BATCH_SIZE):
+        requests = [
+            {'method': 'eth_call', 'params': [{'to': address, 'data': '0x' + (IS_ACTION_QUEUED + _bytes(h)).hex()}, block]}
+            for h in hashes[start:start + RPC_BATCH_SIZE]
+        ]
+        for result in rpc_batch(web3, requests):
+            if not isinstance(result, str):
+                raise RuntimeError(f"isActionQueued() failed: {result}")
+            flags.append(int(result, 16) == 1)
+    return flags
@@ -0,0 +1,149 @@
+"""
+Content-addressed cache of brownie's compiler artifacts, shared between runs and containers.
+
+    python tests/helpers/artifact_cache.py restore   # before brownie loads the project
+    python tests/helpers/artifact_cache.py store     # after it compiled
+
+Run from the brownie project directory, `run_tests.sh` restores before `brownie test`. Has no
+dependency outside the standard library, so it also runs before brownie is installed or a project is
+loaded. `ARTIFACT_CACHE` sets the cache directory, `off` disables it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+# Shared by local runs and, being copied with the project, by container builds
+DEFAULT_CACHE = Path(__file__).parent.parent.parent / '.artifact-cache'
+
+# Bumped when the key or the stored layout changes
+VERSION = 1
+
+IMPORT = re.compile(r'''^\s*import\s+(?:[^'"]*?\s+from\s+)?['"]([^'"]+)['"]''', re.MULTILINE)
+
+
+def compiler_settings(config_path):
+    """The `compiler:` section of `brownie-config.yaml` (versions, optimizer and its runs, remappings)."""
+    section, inside = [], False
+    for line in Path(config_path).read_text().splitlines():
+        if re.match(r'\S', line):
+            inside = line.startswith('compiler:')
+        if inside and line.strip() and not line.lstrip().startswith('#'):
+            section.append(line.rstrip())
+    return '\n'.join(section)
+
+
+class ArtifactCache:
+    """
+    Brownie build artifacts (`build/contracts/*.json`) stored by the hash of what produced them.
+
+    The key of a source unit hashes its content and the content of every file it imports,
+    recursively, with the compiler section of the project config, so a unit is only missed when it,
+    one of its imports or the compiler settings (versions, optimizer runs) changed. `restore()`
+    copies the artifacts of every unit found into the build directory, brownie then treats them as
+    up to date and only compiles the units missed. `store()` adds the units compiled since.
+    """
+
+    def __init__(self, project_path, directory=DEFAULT_CACHE):
+        self.project_path = Path(project_path).resolve()
+        self.directory = Path(directory)
+        self.contracts = self.project_path / 'contracts'
+        self.build = self.project_path / 'build' / 'contracts'
+        self.settings = compiler_settings(self.project_path / 'brownie-config.yaml')
+        self._hashes = {}
+
+    def units(self):
+        """Source units relative to the project, e.g. `contracts/aave-gov-level-2-update/Executor.sol`."""
+        return sorted(path.relative_to(self.project_path).as_posix() for path in self.contracts.rglob('*.sol'))
+
+    def _hash(self, path):
+        if path not in self._hashes:
+            self._hashes[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+        return self._hashes[path]
+
+    def _closure(self, unit):
+        # Every file `unit` imports, directly or not, unresolvable imports are keyed by their path
+        seen, pending = {}, [self.project_path / unit]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            if not path.is_file():
+                seen[path] = None
+                continue
+            seen[path] = self._hash(path)
+            for imported in IMPORT.findall(path.read_text()):
+                base = path.parent if imported.startswith('.') else self.project_path
+                pending.append(Path(os.path.normpath(base / imported)))
+        return sorted((os.path.relpath(path, self.project_path), digest) for path, digest in seen.items())
+
+    def key(self, unit):
+        content = json.dumps([VERSION, self.settings, unit, self._closure(unit)])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def restore(self):
+        """Copies cached artifacts into the build directory, returns `(units restored, units missed)`."""
+        restored, missed = [], []
+        self.build.mkdir(parents=True, exist_ok=True)
+        for unit in self.units():
+            entry = self.directory / self.key(unit)
+            if not entry.is_dir():
+                missed.append(unit)
+                continue
+            for artifact in entry.glob('*.json'):
+                target = self.build / artifact.name
+                if not target.exists() or target.read_bytes() != artifact.read_bytes():
+                    shutil.copyfile(artifact, target)
+            restored.append(unit)
+        return restored, missed
+
+    def store(self):
+        """Adds the artifacts of units not cached yet, read from the build directory, returns the units added."""
+        by_unit = {}
+        for artifact in self.build.glob('*.json'):
+            source = json.loads(artifact.read_text()).get('sourcePath')
+            by_unit.setdefault(source, []).append(artifact)
+
+        added = []
+        for unit in self.units():
+            entry = self.directory / self.key(unit)
+            if entry.is_dir() or unit not in by_unit:
+                continue
+            # Written aside then renamed, concurrent writers of the same key store identical content
+            self.directory.mkdir(parents=True, exist_ok=True)
+            partial = Path(tempfile.mkdtemp(dir=self.directory, prefix='.partial-'))
+            for artifact in by_unit[unit]:
+                shutil.copyfile(artifact, partial / artifact.name)
+            try:
+                partial.rename(entry)
+                added.append(unit)
+            except OSError:
+                shutil.rmtree(partial, ignore_errors=True)
+        return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('action', choices=['restore', 'store'])
+    parser.add_argument('--cache', default=os.environ.get('ARTIFACT_CACHE', DEFAULT_CACHE), help='cache directory')
+    parser.add_argument('--project', default='.', help='brownie project directory')
+    args = parser.parse_args()
+
+    if str(args.cache) == 'off':
+        print("artifact cache: off")
+        return
+    cache = ArtifactCache(args.project, args.cache)
+    if args.action == 'restore':
+        restored, missed = cache.restore()
+        print(f"artifact cache: {len(restored)} units restored, {len(missed)} to compile ({cache.directory})")
+    else:
+        added = cache.store()
+        print(f"artifact cache: {len(added)} units added ({cache.directory})")
+
+
+if __name__ == '__main__':
+    main()
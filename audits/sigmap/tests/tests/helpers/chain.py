@@ -0,0 +1,122 @@
+import math
+import warnings
+
+from brownie import web3
+
+# Average mainnet block time used to keep block height and timestamp moving together
+BLOCK_TIME = 15
+
+
+class ChainWarp:
+    """
+    Fast-forwards the chain to a target block height and timestamp.
+
+    Governance voting windows are measured in blocks while executor timelocks are measured in
+    seconds, so every jump moves both. When only one target is given the other is derived from
+    `BLOCK_TIME`.
+
+    All but the final block are mined in a single backend specific RPC call (`hardhat_mine`,
+    `anvil_mine` or `evm_mine({blocks})` of ganache v7 and the in-process EVM), the final block
+    is mined by brownie at the target timestamp so `chain.time()` and brownie's undo/snapshot
+    bookkeeping stay in sync.
+    A jump therefore costs a constant number of RPC calls regardless of the distance.
+
+    Backends without bulk mining (ganache-cli v6) fall back to mining one block per call.
+    Setting `bulk=False` forces that behaviour, it is used to benchmark against the old path.
+    """
+
+    def __init__(self, chain, bulk=True):
+        self.chain = chain
+        self.bulk = bulk
+
+    def to(self, height=None, timestamp=None):
+        """Mine up to block `height` and/or time `timestamp`, returns the new height."""
+        if height is None and timestamp is None:
+            raise ValueError("Must provide a target `height` or `timestamp`")
+
+        current_height = self.chain.height
+        now = self.chain.time()
+        if height is None:
+            height = current_height + max(math.ceil((timestamp - now) / BLOCK_TIME), 1)
+        if timestamp is None:
+            timestamp = now + (height - current_height) * BLOCK_TIME
+
+        blocks = height - current_height
+        if blocks < 1:
+            raise ValueError(f"Block {height} has already been mined (height {current_height})")
+        if timestamp < now:
+            raise ValueError(f"Timestamp {timestamp} is in the past (time {now})")
+        if timestamp - now < blocks and _increasing_timestamps():
+            # Every block needs a later timestamp than its parent, the last would be past `timestamp`
+            raise ValueError(
+                f"{blocks} blocks need at least {blocks} seconds on '{web3.clientVersion}', got {timestamp - now}"
+            )
+
+        if self.bulk:
+            self._mine_bulk(blocks - 1, timestamp - now)
+        else:
+            self._mine_linear(blocks - 1, timestamp - now)
+        return self.chain.mine(timestamp=timestamp)
+
+    def by(self, blocks=None, timedelta=None):
+        """Mine `blocks` more blocks and/or advance time by `timedelta` seconds."""
+        height = None if blocks is None else self.chain.height + blocks
+        timestamp = None if timedelta is None else self.chain.time() + timedelta
+        return self.to(height, timestamp)
+
+    def past_voting(self, governance, proposal_id):
+        """Mine the first block after voting on `proposal_id` has ended."""
+        return self.to(height=governance.getProposalById(proposal_id)['endBlock'] + 1)
+
+    def to_voting_start(self, governance, proposal_id):
+        """Mine up to `startBlock` of `proposal_id` so the next transaction may vote."""
+        return self.to(height=governance.getProposalById(proposal_id)['startBlock'])
+
+    def to_execution(self, governance, proposal_id):
+        """Mine up to the `executionTime` of the queued `proposal_id` so it may be executed."""
+        return self.to(timestamp=governance.getProposalById(proposal_id)['executionTime'])
+
+    def set_automine(self, enabled):
+        """
+        Turns mining a block per transaction on or off (`evm_setAutomine` on hardhat / anvil,
+        `miner_start` / `miner_stop` on ganache). While off, sent transactions stay pending until
+        the next mined block, e.g. by `chain.mine()`.
+        """
+        client = web3.clientVersion.lower()
+        if client.startswith("hardhat") or client.startswith("anvil"):
+            self._request("evm_setAutomine", [enabled])
+        else:
+            self._request("miner_start" if enabled else "miner_stop", [])
+
+    def _mine_bulk(self, blocks, seconds):
+        if blocks == 0:
+            return
+        client = web3.clientVersion.lower()
+        if _increasing_timestamps():
+            # Keep intermediate timestamps strictly increasing and below the final timestamp, `to()`
+            # ensures there is at least a second per block
+            interval = seconds // (blocks + 1)
+            method = "anvil_mine" if client.startswith("anvil") else "hardhat_mine"
+            self._request(method, [hex(blocks), hex(interval)])
+        elif client.startswith("ganache/v7") or client.endswith("/eth-tester"):
+            self._request("evm_mine", [{"blocks": blocks}])
+        else:
+            warnings.warn(f"Bulk mining unsupported by '{web3.clientVersion}', mining linearly")
+            self._mine_linear(blocks, seconds)
+
+    def _mine_linear(self, blocks, seconds):
+        if blocks == 0:
+            return
+        self.chain.mine(blocks, timedelta=seconds * blocks // (blocks + 1))
+
+    def _request(self, method, params):
+        response = web3.provider.make_request(method, params)
+        if "error" in response:
+            raise RuntimeError(f"{method} failed: {response['error']['message']}")
+        return response["result"]
+
+
+def _increasing_timestamps():
+    # Hardhat and anvil reject a block whose timestamp is not later than its parent's
+    client = web3.clientVersion.lower()
+    return client.startswith("hardhat") or client.startswith("anvil")
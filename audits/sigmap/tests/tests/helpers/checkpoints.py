@@ -0,0 +1,92 @@
+import copy
+import types
+
+from brownie import web3
+
+
+class Checkpoints:
+    """
+    Builds a linear sequence of stages once, keeping a node snapshot after each stage.
+
+    `stages` is a list of `(name, build)` pairs. `build(state)` runs the transactions of a stage on
+    top of the previous stage and records anything later stages or tests need as attributes of
+    `state`.
+
+    `revert_to(name)` returns the chain to the end of a stage, building any missing stages first,
+    and returns a copy of the stage's state. Reverting a node discards every snapshot taken after
+    the one reverted to, so a stage requested again after an earlier stage is rebuilt from the
+    closest remaining snapshot. Requesting stages in order builds each stage exactly once.
+    `branch(name, stages)` swaps the stages after `name` for variants sharing the stages up to it.
+
+    Note brownie's own `chain.snapshot()` / `chain.revert()` (e.g. `fn_isolation`) also discards
+    these snapshots, do not mix them in the same module.
+    """
+
+    def __init__(self, chain, stages):
+        self.chain = chain
+        self.names = [name for name, _ in stages]
+        self._builds = dict(stages)
+        self._states = {}
+        self._snapshots = {}
+        self._base = self._snapshot()
+
+    def revert_to(self, name):
+        """Revert to the end of stage `name`, returns a copy of the stage's state."""
+        index = self.names.index(name)
+        start = next((i for i in range(index, -1, -1) if self.names[i] in self._snapshots), -1)
+
+        if start == -1:
+            self.reset()
+            state = types.SimpleNamespace()
+        else:
+            self._revert(start)
+            state = self._states[self.names[start]]
+
+        for stage in self.names[start + 1 : index + 1]:
+            state = copy.copy(state)
+            self._builds[stage](state)
+            self._states[stage] = state
+            self._snapshots[stage] = self._snapshot()
+
+        return copy.copy(self._states[name])
+
+    def branch(self, name, stages):
+        """
+        Replaces the stages after `name` with those following it in `stages`, a list of `(name,
+        build)` pairs starting with the same stages. Stages up to `name` keep their snapshots, so
+        every branch starts from a revert to `name` instead of rebuilding it.
+        """
+        index = self.names.index(name)
+        names = [stage for stage, _ in stages]
+        if names[: index + 1] != self.names[: index + 1]:
+            raise ValueError(f"stages {names} do not branch from {name!r} of {self.names}")
+        for later in self.names[index + 1 :]:
+            self._states.pop(later, None)
+            self._snapshots.pop(later, None)
+        self.names = names
+        self._builds.update(stages[index + 1 :])
+
+    def reset(self):
+        """Revert to the state before any stage was built."""
+        self._snapshots.clear()
+        self._base = self._chain_revert(self._base)
+
+    def _revert(self, index):
+        name = self.names[index]
+        for later in self.names[index + 1 :]:
+            self._snapshots.pop(later, None)
+        self._snapshots[name] = self._chain_revert(self._snapshots[name])
+
+    def _chain_revert(self, snapshot_id):
+        # Mirrors `chain.revert()`: reverts, takes a replacement snapshot (the node consumes the
+        # reverted one) and re-syncs brownie's clock, transaction history and deployed contracts.
+        # brownie gets a snapshot of its own so `chain.undo()` cannot consume ours.
+        self.chain._undo_buffer.clear()
+        self.chain._redo_buffer.clear()
+        snapshot_id = self.chain._revert(snapshot_id)
+        self.chain._current_id = self._snapshot()
+        return snapshot_id
+
+    def _snapshot(self):
+        response = web3.provider.make_request("evm_snapshot", [])
+        return response["result"]
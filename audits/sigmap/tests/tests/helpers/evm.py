@@ -0,0 +1,268 @@
+import ast
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+from brownie._config import CONFIG
+from brownie.project.compiler.solidity import SOLIDITY_ERROR_CODES
+from eth_abi import decode_abi
+
+# brownie attaches to a running development node by the prefix of its client version, this node
+# answers the `evm_*` and `miner_*` methods the way ganache-cli v6 does
+CLIENT_VERSION = "EthereumJS TestRPC/v2-compatible/eth-tester"
+INSTALL_HINT = 'pip install "eth-tester[py-evm]==0.6.0b6"'
+
+ERROR_STRING = bytes.fromhex("08c379a0")
+PANIC = bytes.fromhex("4e487b71")
+
+
+class _Reverted(Exception):
+    """
+    `(reason, txid)` of a revert. Carries a `TransactionFailed` of eth-tester past web3's provider,
+    which flattens it to a string.
+    """
+
+
+class _Unsupported(Exception):
+    """A method eth-tester does not implement, e.g. `debug_traceTransaction`."""
+
+
+def revert_reason(error):
+    """
+    The reason brownie reports for `TransactionFailed` raised by eth-tester: the revert string,
+    the panic message, or `None` for a revert without data or with a custom error.
+
+    Depending on the endpoint, eth-tester gives the revert data as bytes, wrapped in py-evm's
+    `Revert`, already decoded, or as the `repr()` of the bytes.
+    """
+    data = error.args[0] if error.args else ""
+    if isinstance(data, Exception):
+        data = data.args[0] if data.args else b""
+    if isinstance(data, str) and data[:2] in ("b'", 'b"'):
+        data = ast.literal_eval(data)
+    if not isinstance(data, bytes):
+        return data or None
+    if data[:4] == ERROR_STRING:
+        return decode_abi(["string"], data[4:])[0]
+    if data[:4] == PANIC:
+        code = decode_abi(["uint256"], data[4:])[0]
+        return SOLIDITY_ERROR_CODES.get(code, f"Panic (error code: {code})")
+    return None
+
+
+def _reverting(delegator):
+    from eth_tester.exceptions import TransactionFailed
+
+    def inner(eth_tester, params):
+        try:
+            return delegator(eth_tester, params)
+        except TransactionFailed as e:
+            raise _Reverted(revert_reason(e)) from e
+
+    return inner
+
+
+class InProcessNode:
+    """
+    A development chain in this process, served over JSON-RPC on the network's host and port.
+
+    Runs py-evm through eth-tester (an optional dependency, see `INSTALL_HINT`), so brownie attaches
+    to it like to an already running ganache and no node process is launched. Of ganache-cli v6 it
+    emulates the time offset moved by `evm_increaseTime` and `evm_mine`, snapshots restoring it,
+    `miner_start` / `miner_stop` and revert reasons in the error `data`. Bulk mining takes
+    `evm_mine({blocks})` like ganache v7. Calls are served one at a time, py-evm is not thread safe.
+
+    eth-tester checks the nonce of a transaction sent while mining is stopped against the last
+    block, so each account may have one pending transaction.
+    """
+
+    def __init__(self, network):
+        try:
+            from eth.vm.forks import BerlinVM
+            from eth_tester import EthereumTester, PyEVMBackend
+            from web3 import Web3
+            from web3.providers.eth_tester import EthereumTesterProvider
+            from web3.providers.eth_tester.defaults import API_ENDPOINTS
+        except ImportError:
+            raise pytest.UsageError(f"--evm-backend eth-tester needs eth-tester, `{INSTALL_HINT}`") from None
+
+        settings = CONFIG.networks[network]
+        cmd_settings = settings.get("cmd_settings") or {}
+        url = urlparse(settings["host"])
+        self.host = url.hostname
+        self.port = url.port or cmd_settings.get("port", 8545)
+
+        state = PyEVMBackend.generate_genesis_state(
+            overrides={"balance": Web3.toWei(cmd_settings.get("default_balance", 100), "ether")},
+            num_accounts=cmd_settings.get("accounts", 10),
+        )
+        # Without a base fee, like ganache-cli v6, so the networks' zero gas prices are accepted
+        self.tester = EthereumTester(PyEVMBackend(genesis_state=state, vm_configuration=((0, BerlinVM),)))
+        endpoints = {
+            namespace: {name: _reverting(delegator) for name, delegator in delegators.items()}
+            for namespace, delegators in API_ENDPOINTS.items()
+        }
+        # Only the provider's own middlewares, which translate between JSON-RPC and eth-tester's formats
+        web3 = Web3(EthereumTesterProvider(self.tester, endpoints), middlewares=[])
+        self._request = web3.provider.request_func(web3, web3.middleware_onion)
+        self.offset = 0
+        self.snapshots = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _handler(self))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle(self, request):
+        method, params = request["method"], request.get("params", [])
+        with self._lock:
+            self.requests += 1
+            try:
+                result = self.call(method, params)
+            except _Reverted as e:
+                return {"jsonrpc": "2.0", "id": request.get("id"), "error": self._revert_error(*e.args)}
+            except _Unsupported as e:
+                # The code brownie checks to tell that traces are unavailable
+                return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": str(e)}}
+            except Exception as e:
+                message = f"{type(e).__name__}: {e}"
+                return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32000, "message": message}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def call(self, method, params):
+        """Result of JSON-RPC `method`, raising `_Reverted` for reverts and `_Unsupported` for unknown methods."""
+        self._sync_time()
+        if method == "web3_clientVersion":
+            return CLIENT_VERSION
+        if method == "evm_increaseTime":
+            self.offset += int(params[0], 16) if isinstance(params[0], str) else params[0]
+            return int(self.offset)
+        if method == "evm_mine":
+            return self._mine(params[0] if params else None)
+        if method == "evm_snapshot":
+            snapshot = self.tester.take_snapshot()
+            self.snapshots[snapshot] = self.offset
+            return hex(snapshot)
+        if method == "evm_revert":
+            snapshot = int(params[0], 16) if isinstance(params[0], str) else params[0]
+            self.tester.revert_to_snapshot(snapshot)
+            self.offset = self.snapshots[snapshot]
+            return True
+        if method == "miner_stop":
+            self.tester.disable_auto_mine_transactions()
+            return True
+        if method == "miner_start":
+            # Pending transactions are left for the next `evm_mine`, as in ganache
+            self.tester.auto_mine_transactions = True
+            return True
+
+        if method in ("eth_call", "eth_estimateGas", "eth_sendTransaction") and "gasPrice" not in params[0]:
+            # eth-tester builds fee market transactions without a gas price, which Berlin does not have
+            params = [{**params[0], "gasPrice": "0x0"}, *params[1:]]
+        result = self._eth(method, params)
+        if method == "eth_sendTransaction" and self.tester.auto_mine_transactions:
+            self._check_mined(result, params[0])
+        # eth-tester names the call data of transactions `data`, brownie reads `input`
+        if method.startswith("eth_getTransactionBy"):
+            result = _with_input(result)
+        elif method.startswith("eth_getBlockBy") and result:
+            result = {**result, "transactions": [_with_input(tx) for tx in result["transactions"]]}
+        return result
+
+    def _eth(self, method, params):
+        response = self._request(method, params)
+        if "error" in response:
+            raise _Unsupported(response["error"])
+        return response["result"]
+
+    def _check_mined(self, txid, transaction):
+        # Like ganache, a reverted transaction is an error naming it, the reason is found by
+        # calling it again on the state before its block
+        receipt = self.tester.get_transaction_receipt(txid)
+        if receipt["status"] == 0:
+            call = {key: value for key, value in transaction.items() if key != "nonce"}
+            try:
+                self._eth("eth_call", [call, hex(receipt["block_number"] - 1)])
+            except _Reverted as e:
+                raise _Reverted(e.args[0], txid) from None
+            raise _Reverted(None, txid)
+
+    def _mine(self, param):
+        if isinstance(param, dict):
+            self.tester.mine_blocks(param["blocks"])
+            return "0x0"
+        if param is not None:
+            # ganache v6 keeps the clock of the mined block
+            self.offset = param - int(time.time())
+            self._set_timestamp(param)
+        self.tester.mine_blocks(1)
+        return "0x0"
+
+    def _sync_time(self):
+        # Time of the next block, as ganache: the wall clock moved by the offset
+        parent = self.tester.backend.chain.get_canonical_head()
+        self._set_timestamp(max(parent.timestamp + 1, int(time.time()) + self.offset))
+
+    def _set_timestamp(self, timestamp):
+        # A new header rather than a copy, the difficulty depends on the timestamp and is checked
+        # again when a snapshot is reverted to
+        chain = self.tester.backend.chain
+        chain.header = chain.create_header_from_parent(chain.get_canonical_head(), timestamp=timestamp)
+
+    @staticmethod
+    def _revert_error(reason, txid=None):
+        message = "VM Exception while processing transaction: revert" + (f" {reason}" if reason else "")
+        # The form of ganache v6, `data` is keyed by the transaction hash, none for calls
+        data = {txid or "0x" + "00" * 32: {"error": "revert", "reason": reason}}
+        return {"code": -32000, "message": message, "data": data}
+
+
+def _with_input(transaction):
+    if isinstance(transaction, dict) and "data" in transaction:
+        return {**transaction, "input": transaction["data"]}
+    return transaction
+
+
+def _handler(node):
+    class InProcessNodeHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if isinstance(body, list):
+                response = [node.handle(request) for request in body]
+            else:
+                response = node.handle(body)
+
+            data = json.dumps(response, default=_to_json).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return InProcessNodeHandler
+
+
+def _to_json(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
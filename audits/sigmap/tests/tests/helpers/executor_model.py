@@ -0,0 +1,227 @@
+from eth_abi import decode_abi
+
+from .actions import action_hash
+
+ONE_HUNDRED_WITH_PRECISION = 10_000
+MAX_UINT256 = 2 ** 256 - 1
+ZERO_ADDRESS = '0x' + '00' * 20
+
+# Revert messages of solidity >= 0.8 panics, as reported by brownie
+PANIC_OVERFLOW = "Integer overflow"
+PANIC_DIVISION = "Division or modulo by zero"
+
+# Setters callable by the executor itself: `{signature: (model method, argument types)}`
+SETTERS = {
+    'setDelay(uint256)': ('set_delay', ['uint256']),
+    'setPendingAdmin(address)': ('set_pending_admin', ['address']),
+    'updateVotingDuration(uint256)': ('update_voting_duration', ['uint256']),
+    'updateVoteDifferential(uint256)': ('update_vote_differential', ['uint256']),
+    'updateMinimumQuorum(uint256)': ('update_minimum_quorum', ['uint256']),
+    'updatePropositionThreshold(uint256)': ('update_proposition_threshold', ['uint256']),
+}
+
+
+class Revert(Exception):
+    """Raised where `Executor` reverts, `reason` is the revert string or panic message."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _require(condition, reason):
+    if not condition:
+        raise Revert(reason)
+
+
+def _checked(value):
+    # solidity >= 0.8 checked arithmetic
+    _require(0 <= value <= MAX_UINT256, PANIC_OVERFLOW)
+    return value
+
+
+def _div(numerator, denominator):
+    _require(denominator != 0, PANIC_DIVISION)
+    return numerator // denominator
+
+
+class ExecutorModel:
+    """
+    Pure Python model of the integer rules of `src/contracts/Executor.sol` (built in the brownie
+    project as `SrcExecutor`), including solidity 0.8 checked arithmetic.
+    Reverts raise `Revert` with the same reason as the contract.
+
+    Functions reading governance take the values the contract would fetch (votes, supplies,
+    `executionTime`) and time dependent functions take the block timestamp as `now`.
+    Queued actions are tracked by hash like `_queuedTransactions`. Admin checks are only applied
+    when the caller is given as `sender`.
+    """
+
+    def __init__(
+        self,
+        delay,
+        grace_period,
+        minimum_delay,
+        maximum_delay,
+        proposition_threshold,
+        vote_duration,
+        vote_differential,
+        minimum_quorum,
+        admin=ZERO_ADDRESS,
+    ):
+        _require(delay >= minimum_delay, 'DELAY_SHORTER_THAN_MINIMUM')
+        _require(delay <= maximum_delay, 'DELAY_LONGER_THAN_MAXIMUM')
+        self.delay = delay
+        _require(grace_period > 0, 'GRACE_PERIOD_LESS_THAN_0')
+        self.grace_period = grace_period
+        self.minimum_delay = minimum_delay
+        self.maximum_delay = maximum_delay
+        self.admin = str(admin).lower()
+        self.pending_admin = ZERO_ADDRESS
+        self.queued = set()
+
+        self.update_voting_duration(vote_duration)
+        self.update_vote_differential(vote_differential)
+        self.update_minimum_quorum(minimum_quorum)
+        self.update_proposition_threshold(proposition_threshold)
+
+    # Setters
+
+    def set_delay(self, delay):
+        _require(delay >= self.minimum_delay, 'DELAY_SHORTER_THAN_MINIMUM')
+        _require(delay <= self.maximum_delay, 'DELAY_LONGER_THAN_MAXIMUM')
+        self.delay = delay
+
+    def set_pending_admin(self, pending_admin):
+        self.pending_admin = str(pending_admin).lower()
+
+    def accept_admin(self, sender):
+        _require(str(sender).lower() == self.pending_admin, 'ONLY_BY_PENDING_ADMIN')
+        self.admin = self.pending_admin
+        self.pending_admin = ZERO_ADDRESS
+
+    def update_voting_duration(self, voting_duration):
+        _require(voting_duration > 0, 'VOTING_DURATION_CAN_NOT_BE_0')
+        self.voting_duration = voting_duration
+
+    def update_vote_differential(self, vote_differential):
+        _require(
+            vote_differential <= ONE_HUNDRED_WITH_PRECISION, 'VOTE_DIFFERENTIAL_CAN_NOT_BE_GREATER_THAN_100%'
+        )
+        _require(vote_differential > 0, 'VOTE_DIFFERENTIAL_CAN_NOT_BE_LESS_THAN_0')
+        self.vote_differential = vote_differential
+
+    def update_minimum_quorum(self, minimum_quorum):
+        _require(minimum_quorum <= ONE_HUNDRED_WITH_PRECISION, 'MINIMUM_QUORUM_CAN_NOT_BE_GREATER_THAN_100%')
+        _require(minimum_quorum > 0, 'MINIMUM_QUORUM_CAN_NOT_BE_LESS_THAN_0')
+        self.minimum_quorum = minimum_quorum
+
+    def update_proposition_threshold(self, proposition_threshold):
+        _require(
+            proposition_threshold <= ONE_HUNDRED_WITH_PRECISION,
+            'PROPOSITION_THRESHOLD_CAN_NOT_BE_GREATER_THAN_100%',
+        )
+        _require(proposition_threshold > 0, 'PROPOSITION_THRESHOLD_CAN_NOT_BE_LESS_THAN_0')
+        self.proposition_threshold = proposition_threshold
+
+    # Proposal validation
+
+    def get_minimum_voting_power_needed(self, voting_supply):
+        return _checked(voting_supply * self.minimum_quorum) // ONE_HUNDRED_WITH_PRECISION
+
+    def get_minimum_proposition_power_needed(self, proposition_supply):
+        return _checked(proposition_supply * self.proposition_threshold) // ONE_HUNDRED_WITH_PRECISION
+
+    def is_proposition_power_enough(self, proposition_power, proposition_supply):
+        return proposition_power >= self.get_minimum_proposition_power_needed(proposition_supply)
+
+    def is_quorum_valid(self, for_votes, voting_supply):
+        return for_votes >= self.get_minimum_voting_power_needed(voting_supply)
+
+    def is_vote_differential_valid(self, for_votes, against_votes, voting_supply):
+        for_share = _div(_checked(for_votes * ONE_HUNDRED_WITH_PRECISION), voting_supply)
+        against_share = _div(_checked(against_votes * ONE_HUNDRED_WITH_PRECISION), voting_supply)
+        return for_share > _checked(against_share + self.vote_differential)
+
+    def is_proposal_passed(self, for_votes, against_votes, voting_supply):
+        return self.is_quorum_valid(for_votes, voting_supply) and self.is_vote_differential_valid(
+            for_votes, against_votes, voting_supply
+        )
+
+    def is_proposal_over_grace_period(self, execution_time, now):
+        return now > _checked(execution_time + self.grace_period)
+
+    # Timelock
+
+    def _only_admin(self, sender):
+        if sender is not None:
+            _require(str(sender).lower() == self.admin, 'ONLY_BY_ADMIN')
+
+    def queue_transaction(self, target, value, signature, data, execution_time, with_delegatecall, now, sender=None):
+        self._only_admin(sender)
+        _require(execution_time >= _checked(now + self.delay), 'EXECUTION_TIME_UNDERESTIMATED')
+        action = action_hash(target, value, signature, data, execution_time, with_delegatecall)
+        self.queued.add(action)
+        return action
+
+    def cancel_transaction(self, target, value, signature, data, execution_time, with_delegatecall, sender=None):
+        self._only_admin(sender)
+        action = action_hash(target, value, signature, data, execution_time, with_delegatecall)
+        self.queued.discard(action)
+        return action
+
+    def execute_transaction(
+        self, target, value, signature, data, execution_time, with_delegatecall, now, sender=None, executor=None
+    ):
+        """
+        Applies the timelock checks. Of the call itself, only calls to the setters of the executor
+        deployed at `executor` are modelled, other targets are assumed to succeed.
+        """
+        self._only_admin(sender)
+        action = action_hash(target, value, signature, data, execution_time, with_delegatecall)
+        _require(action in self.queued, 'ACTION_NOT_QUEUED')
+        _require(now >= execution_time, 'TIMELOCK_NOT_FINISHED')
+        _require(now <= _checked(execution_time + self.grace_period), 'GRACE_PERIOD_FINISHED')
+        if executor is not None and str(target).lower() == str(executor).lower():
+            # A delegatecall runs the setter with the admin as `msg.sender`, which is not the executor
+            caller = sender if with_delegatecall else executor
+            try:
+                self.self_call(signature, data, caller, executor)
+            except Revert:
+                raise Revert('FAILED_ACTION_EXECUTION')
+        self.queued.discard(action)
+        return action
+
+    def self_call(self, signature, data, sender, executor):
+        """Applies a call of `signature(data)` by `sender` to the executor at `executor`."""
+        if signature == 'acceptAdmin()':
+            return self.accept_admin(sender)
+        _require(sender is not None and str(sender).lower() == str(executor).lower(), 'CALLER_NOT_EXECUTOR')
+        setter, types = SETTERS[signature]
+        getattr(self, setter)(*decode_abi(types, bytes(data)))
+
+    def is_action_queued(self, action):
+        return bytes(action) in self.queued
+
+
+def boundary_values(threshold, spread=2):
+    """`threshold` and its neighbours within `spread`, clipped to uint256."""
+    return [v for v in range(threshold - spread, threshold + spread + 1) if 0 <= v <= MAX_UINT256]
+
+
+def quorum_boundary_cases(model, voting_supply, spread=2):
+    """`(for_votes, voting_supply)` pairs around the minimum voting power needed for `voting_supply`."""
+    minimum = model.get_minimum_voting_power_needed(voting_supply)
+    return [(for_votes, voting_supply) for for_votes in boundary_values(minimum, spread)]
+
+
+def differential_boundary_cases(model, voting_supply, against_votes, spread=2):
+    """
+    `(for_votes, against_votes, voting_supply)` triples around the smallest `for_votes` passing
+    the vote differential, including both sides of the integer division rounding.
+    """
+    against_share = against_votes * ONE_HUNDRED_WITH_PRECISION // voting_supply
+    # Smallest `for_votes` with `for_votes * 10_000 // voting_supply > against_share + differential`
+    required_share = against_share + model.vote_differential + 1
+    minimum = -(-required_share * voting_supply // ONE_HUNDRED_WITH_PRECISION)
+    return [(for_votes, against_votes, voting_supply) for for_votes in boundary_values(minimum, spread)]
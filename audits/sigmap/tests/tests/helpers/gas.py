@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+# Default location of the baselines of each network, recorded by the first run on it and then committed
+GAS_BASELINE_DIR = Path(__file__).parent.parent.parent / 'gas-baselines'
+
+
+class GasBaselines:
+    """
+    Gas used by named operations, checked against baselines stored as JSON (`{name: gas}`).
+
+    `check()` records the gas of an operation and fails if it exceeds its baseline by more than
+    `threshold` (a fraction, `0.01` allows 1%). Operations without a baseline only record, `save()`
+    adds them to the file, and with `update` every baseline is replaced by the measured gas instead
+    of being checked. Improvements never fail, run with `update` to lock them in.
+    """
+
+    def __init__(self, path, threshold=0.01, update=False):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.update = update
+        self.baselines = json.loads(self.path.read_text()) if self.path.exists() else {}
+        self.measured = {}
+
+    def check(self, name, tx):
+        """Records the gas of `tx` (a receipt or an amount) as `name` and asserts it against its baseline."""
+        gas = self.measured[name] = getattr(tx, 'gas_used', tx)
+        baseline = self.baselines.get(name)
+        if baseline is not None and not self.update:
+            assert gas <= baseline * (1 + self.threshold), (
+                f"{name}: {gas} gas, {gas / baseline - 1:+.2%} over the baseline of {baseline} "
+                f"(threshold {self.threshold:.2%}, update with --update-gas)"
+            )
+        return gas
+
+    def save(self):
+        """Writes the baselines with new operations added, or all replaced with `update`, returns if changed."""
+        new = {**self.baselines, **self.measured} if self.update else {**self.measured, **self.baselines}
+        if new == self.baselines:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(dict(sorted(new.items())), indent=2) + '\n')
+        self.baselines = new
+        return True
+
+    def report(self):
+        """Lines of `name, baseline, measured, change` for every measured operation."""
+        lines = [f"{'operation':<64}{'baseline':>10}{'measured':>10}{'change':>9}"]
+        for name, gas in sorted(self.measured.items()):
+            baseline = self.baselines.get(name)
+            change = '' if not baseline else f"{gas / baseline - 1:+.2%}"
+            lines.append(f"{name:<64}{baseline or '':>10}{gas:>10}{change:>9}")
+        return lines
+
+    def compare(self, old, new):
+        """Lines comparing operations measured as `<operation>[<old>]` and `<operation>[<new>]`."""
+        lines = [f"{'operation':<48}{old:>14}{new:>14}{'change':>9}"]
+        for name, gas in sorted(self.measured.items()):
+            if name.endswith(f'[{old}]'):
+                operation = name[: -len(old) - 2]
+                other = self.measured.get(f'{operation}[{new}]')
+                if other is not None:
+                    lines.append(f"{operation:<48}{gas:>14}{other:>14}{other / gas - 1:>+9.2%}")
+        return lines
@@ -0,0 +1,120 @@
+import types
+from collections import namedtuple
+
+from brownie import web3
+
+from .matchers import fetch_proposals
+
+# Arguments of `AaveGovernanceV2.create()` and the account creating the proposal
+ProposalSpec = namedtuple(
+    'ProposalSpec',
+    ['executor', 'targets', 'values', 'signatures', 'calldatas', 'with_delegatecalls', 'ipfs_hash', 'creator'],
+)
+
+
+def payload_spec(executor, payload, ipfs_hash, creator):
+    """A proposal delegatecalling `execute()` of a single `payload` contract."""
+    return ProposalSpec(executor, [payload], [0], ['execute()'], [b''], [True], ipfs_hash, creator)
+
+
+def mine_together(warp, calls, timestamp=None):
+    """
+    Sends `(method, args, tx)` brownie calls with automine off and mines them in one block (at
+    `timestamp` if given), returns the receipts in call order, reverted ones included.
+
+    Transactions are sent with decreasing gas prices so the block keeps their submission order.
+    """
+    gas_price = web3.eth.gas_price + len(calls)
+    txs = []
+    warp.set_automine(False)
+    try:
+        for i, (method, args, tx) in enumerate(calls):
+            txs.append(method(*args, {**tx, 'gas_price': gas_price - i, 'required_confs': 0}))
+    finally:
+        # Also mines the transactions already sent if a later one could not be sent
+        if txs:
+            warp.chain.mine(timestamp=timestamp)
+        warp.set_automine(True)
+
+    for tx in txs:
+        tx.wait(1)
+    return txs
+
+
+class ProposalLifecycle:
+    """
+    Drives proposals through `AaveGovernanceV2` with each step's transactions mined in one block.
+
+    Every step turns automine off, sends its transactions (several proposals' `create()`, all votes,
+    all `queue()` or `execute()` calls), then mines them together in the first block where the step
+    is allowed: after `startBlock` for votes, after `endBlock` for queuing and after `executionTime`
+    for execution. Blocks before it are bulk mined by `warp` and the proposals' timings are read in
+    one batch request, so a step costs a constant number of RPC calls and blocks whatever the number
+    of voters or proposals.
+
+    Transactions keep their submission order in the block (see `mine_together()`), e.g. proposal ids
+    follow the order of the specs. Any reverted transaction raises `RuntimeError`.
+    """
+
+    def __init__(self, governance, warp, sender):
+        self.governance = governance
+        self.warp = warp
+        self.chain = warp.chain
+        self.sender = sender
+
+    def create(self, *specs):
+        """`create()` every `ProposalSpec` in one block, returns the transactions."""
+        return self._one_block([
+            (self.governance.create, spec[:-1], {'from': spec.creator}) for spec in specs
+        ])
+
+    def vote(self, proposal_id, for_=(), against=()):
+        """Submits the votes of accounts `for_` and `against` on `proposal_id` in one block."""
+        (proposal,) = fetch_proposals(web3, self.governance, [proposal_id])
+        self._advance(proposal['startBlock'] + 1)
+        votes = [(voter, True) for voter in for_] + [(voter, False) for voter in against]
+        return self._one_block([
+            (self.governance.submitVote, (proposal_id, support), {'from': voter}) for voter, support in votes
+        ])
+
+    def queue(self, *proposal_ids):
+        """`queue()` every proposal in the first block after all their voting periods."""
+        proposals = fetch_proposals(web3, self.governance, proposal_ids)
+        self._advance(max(proposal['endBlock'] for proposal in proposals) + 1)
+        return self._one_block([(self.governance.queue, (i,), {'from': self.sender}) for i in proposal_ids])
+
+    def execute(self, *proposal_ids):
+        """`execute()` every queued proposal in one block once all their execution times have passed."""
+        proposals = fetch_proposals(web3, self.governance, proposal_ids)
+        timestamp = max(proposal['executionTime'] for proposal in proposals)
+        # Gas is estimated against the time of the latest block, it must already be executable
+        if timestamp > self.chain.time():
+            self.warp.to(timestamp=timestamp)
+        return self._one_block([(self.governance.execute, (i,), {'from': self.sender}) for i in proposal_ids])
+
+    def run(self, spec, for_=(), against=()):
+        """Creates, votes, queues and executes one proposal, returns the id and transactions of each step."""
+        (create_tx,) = self.create(spec)
+        proposal_id = create_tx.events['ProposalCreated']['id']
+        vote_txs = self.vote(proposal_id, for_, against)
+        (queue_tx,) = self.queue(proposal_id)
+        (execute_tx,) = self.execute(proposal_id)
+        return types.SimpleNamespace(
+            proposal_id=proposal_id,
+            create_tx=create_tx,
+            vote_txs=vote_txs,
+            queue_tx=queue_tx,
+            execute_tx=execute_tx,
+        )
+
+    def _advance(self, height):
+        # Mines up to the block before `height`, the step's transactions are mined at `height`
+        if height - self.chain.height > 1:
+            self.warp.to(height=height - 1)
+
+    def _one_block(self, calls):
+        txs = mine_together(self.warp, calls)
+        reverted = [f"{tx.fn_name} from {tx.sender}: {tx.revert_msg}" for tx in txs if tx.status != 1]
+        if reverted:
+            raise RuntimeError(f"{len(reverted)} of {len(txs)} transactions reverted:\n" + "\n".join(reverted))
+        return txs
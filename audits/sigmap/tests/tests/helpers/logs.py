@@ -0,0 +1,27 @@
+from .rpc import rpc_call
+
+# Blocks per `eth_getLogs` request to start with, adapted to the provider's result limits
+DEFAULT_CHUNK = 10_000
+
+
+def get_logs(url, address, topics, start, end, chunk=DEFAULT_CHUNK):
+    """
+    Yields `(first, last, logs)` for consecutive block ranges covering `start..end` (inclusive).
+
+    Ranges rejected by the provider (too many results, timeouts) are split in half and retried, the
+    range size grows back after each success. Logs are raw JSON-RPC dicts, in block and log order.
+    """
+    first = start
+    while first <= end:
+        last = min(first + chunk - 1, end)
+        params = {'address': address, 'topics': topics, 'fromBlock': hex(first), 'toBlock': hex(last)}
+        try:
+            logs = rpc_call(url, 'eth_getLogs', [params])
+        except (RuntimeError, OSError):
+            if chunk == 1:
+                raise
+            chunk = max(chunk // 2, 1)
+            continue
+        yield first, last, logs
+        first = last + 1
+        chunk = min(chunk * 2, DEFAULT_CHUNK * 10)
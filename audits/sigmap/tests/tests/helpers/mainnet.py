@@ -0,0 +1,100 @@
+from eth_utils import to_checksum_address
+
+from .rpc import rpc_batch
+
+# Contracts on Ethereum Mainnet used by the tests: `{fixture name: (brownie contract, address)}`.
+# `InitializableAdminUpgradeabilityProxy` is compiled with 0.7.5 in brownie but 0.6.12 on mainnet
+MAINNET = {
+    'aave_governance_v2': ('AaveGovernanceV2', '0xEC568fffba86c094cf06b22134B23074DFE2252c'),
+    'governance_strategy': ('GovernanceStrategy', '0xb7e383ef9b1e9189fc0f71fb30af8aa14377429e'),
+    # `Executor` (renamed `OldExecutor`) for level 1 (short) and level 2 (long)
+    'short_executor': ('OldExecutor', '0xEE56e2B3D491590B5b31738cC34d5232F378a8D5'),
+    'long_executor': ('OldExecutor', '0x61910EcD7e8e942136CE7Fe7943f956cea1CC2f7'),
+    'aave_token_proxy': ('InitializableAdminUpgradeabilityProxy', '0x7Fc66500c84A76Ad7e9c93437bFc5Ac33E2DDaE9'),
+    'abpt_proxy': ('InitializableAdminUpgradeabilityProxy', '0x41A08648C3766F9F9d85598fF102a08f4ef84F84'),
+    'stk_aave_proxy': ('InitializableAdminUpgradeabilityProxy', '0x4da27a545c0c5B758a6BA100e3a049001de870f5'),
+    'stk_abpt_proxy': ('InitializableAdminUpgradeabilityProxy', '0xa1116930326D21fB917d5A27F1E9943A9595fb47'),
+    'aave_ecosystem_reserve_proxy': (
+        'InitializableAdminUpgradeabilityProxy', '0x25F2226B597E8F9514B3F68F00f494cF4f286491'
+    ),
+}
+
+
+class LazyContract:
+    """
+    A brownie contract at a known address, only looked up on the chain when first used.
+
+    `address`, `str()`, comparisons and hashing need no RPC call, so a handle can be passed as a
+    contract argument or compared to returned addresses without binding it. Any other attribute binds
+    the handle with `container.at(address)`, whose code checks make the fork node fetch the
+    contract upstream.
+    """
+
+    def __init__(self, container, address):
+        self._container = container
+        self._address = to_checksum_address(address)
+        self._contract = None
+
+    @property
+    def address(self):
+        return self._address
+
+    @property
+    def bound(self):
+        return self._contract is not None
+
+    def bind(self):
+        """The brownie contract, looked up on the first call."""
+        if self._contract is None:
+            self._contract = self._container.at(self._address)
+        return self._contract
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('_container', '_address', '_contract'):
+            raise AttributeError(name)
+        return getattr(self.bind(), name)
+
+    def __str__(self):
+        return self._address
+
+    def __repr__(self):
+        return repr(self._contract) if self.bound else f"<{self._container._name} Object {self._address} (lazy)>"
+
+    def __eq__(self, other):
+        if isinstance(other, (str, LazyContract)) or hasattr(other, 'address'):
+            return str(getattr(other, 'address', other)).lower() == self._address.lower()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._address.lower())
+
+
+class MainnetContracts:
+    """
+    `LazyContract` handles of the `MAINNET` contracts, one per name.
+
+    `preload()` fetches the code of several contracts with one batch of `eth_getCode` requests, so a
+    fork node fetches them from upstream together instead of one `.at()` at a time, then binds them.
+    """
+
+    def __init__(self, web3, containers):
+        self.web3 = web3
+        self.handles = {
+            name: LazyContract(containers[container], address) for name, (container, address) in MAINNET.items()
+        }
+
+    def __getitem__(self, name):
+        return self.handles[name]
+
+    def preload(self, *names):
+        """Binds the contracts `names` (all if none), fetching the code of the unbound ones in one batch."""
+        handles = [self.handles[name] for name in names or self.handles]
+        unbound = [handle for handle in handles if not handle.bound]
+        if len(unbound) > 1:
+            codes = rpc_batch(self.web3, [{'method': 'eth_getCode', 'params': [h.address, 'latest']} for h in unbound])
+            for handle, code in zip(unbound, codes):
+                if not isinstance(code, str):
+                    raise RuntimeError(f"eth_getCode of {handle.address} failed: {code}")
+        for handle in unbound:
+            handle.bind()
+        return handles
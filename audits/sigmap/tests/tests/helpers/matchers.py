@@ -0,0 +1,219 @@
+import re
+from collections import defaultdict, namedtuple
+
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.registry import registry
+from eth_utils import is_hex_address, keccak, to_checksum_address
+
+from .rpc import rpc_batch
+
+# Decoded log: event name, emitting contract and fields by name
+Event = namedtuple('Event', ['name', 'address', 'fields'])
+
+# Expected record: event name (or `Proposal`) and the fields to compare
+Expected = namedtuple('Expected', ['name', 'fields'])
+
+EVENTS = [
+    'ProposalCreated(uint256 id, address indexed creator, address indexed executor, address[] targets, '
+    'uint256[] values, string[] signatures, bytes[] calldatas, bool[] withDelegatecalls, uint256 startBlock, '
+    'uint256 endBlock, address strategy, bytes32 ipfsHash)',
+    'ProposalExecuted(uint256 id, address indexed initiatorExecution)',
+    'VoteEmitted(uint256 id, address indexed voter, bool support, uint256 votingPower)',
+    'QueuedAction(bytes32 actionHash, address indexed target, uint256 value, string signature, bytes data, '
+    'uint256 executionTime, bool withDelegatecall)',
+    'CancelledAction(bytes32 actionHash, address indexed target, uint256 value, string signature, bytes data, '
+    'uint256 executionTime, bool withDelegatecall)',
+    'ExecutedAction(bytes32 actionHash, address indexed target, uint256 value, string signature, bytes data, '
+    'uint256 executionTime, bool withDelegatecall, bytes resultData)',
+]
+
+# `AaveGovernanceV2.ProposalWithoutVotes`, returned by `getProposalById(uint256)`
+PROPOSAL_FIELDS = [
+    ('uint256', 'id'),
+    ('address', 'creator'),
+    ('address', 'executor'),
+    ('address[]', 'targets'),
+    ('uint256[]', 'values'),
+    ('string[]', 'signatures'),
+    ('bytes[]', 'calldatas'),
+    ('bool[]', 'withDelegatecalls'),
+    ('uint256', 'startBlock'),
+    ('uint256', 'endBlock'),
+    ('uint256', 'executionTime'),
+    ('uint256', 'forVotes'),
+    ('uint256', 'againstVotes'),
+    ('bool', 'executed'),
+    ('bool', 'canceled'),
+    ('address', 'strategy'),
+    ('bytes32', 'ipfsHash'),
+]
+GET_PROPOSAL_BY_ID = keccak(text='getProposalById(uint256)')[:4]
+GET_PROPOSAL_STATE = keccak(text='getProposalState(uint256)')[:4]
+
+
+def _decoder(types):
+    return TupleDecoder(decoders=[registry.get_decoder(t) for t in types])
+
+
+def _bytes(data):
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    return bytes(data)
+
+
+class EventSpec:
+    """
+    One event signature (`Name(type [indexed] name, ...)`) with its topic and decoders built once.
+
+    Calling it with field values returns an `Expected` record for `assert_events()`, unknown field
+    names are rejected so a typo cannot silently skip a check.
+    """
+
+    def __init__(self, signature):
+        self.name, params = re.fullmatch(r'(\w+)\((.*)\)', signature).groups()
+        params = [param.split() for param in params.split(',')]
+        self.fields = [param[-1] for param in params]
+        types = [param[0] for param in params]
+        self.topic = keccak(text=f"{self.name}({','.join(types)})")
+        self._indexed = [(param[-1], param[0]) for param in params if len(param) == 3]
+        self._data_fields = [param[-1] for param in params if len(param) == 2]
+        self._data = _decoder([param[0] for param in params if len(param) == 2])
+        self._topics = [_decoder([type_]) for _, type_ in self._indexed]
+
+    def decode(self, log):
+        """The `Event` of a raw log whose first topic is `self.topic`."""
+        values = dict(zip(self._data_fields, self._data(ContextFramesBytesIO(_bytes(log['data'])))))
+        for (field, _), decoder, topic in zip(self._indexed, self._topics, log['topics'][1:]):
+            values[field] = decoder(ContextFramesBytesIO(_bytes(topic)))[0]
+        return Event(self.name, to_checksum_address(log['address']), {field: values[field] for field in self.fields})
+
+    def __call__(self, **fields):
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise TypeError(f"{self.name} has no fields {sorted(unknown)}")
+        return Expected(self.name, fields)
+
+
+SPECS = {spec.topic: spec for spec in map(EventSpec, EVENTS)}
+ProposalCreated, ProposalExecuted, VoteEmitted, QueuedAction, CancelledAction, ExecutedAction = SPECS.values()
+
+_PROPOSAL_NAMES = [name for _, name in PROPOSAL_FIELDS]
+_PROPOSAL = _decoder([f"({','.join(type_ for type_, _ in PROPOSAL_FIELDS)})"])
+
+
+def Proposal(**fields):
+    """Expected `getProposalById()` struct for `assert_proposals()`, `id` is required."""
+    unknown = set(fields) - set(_PROPOSAL_NAMES)
+    if unknown or 'id' not in fields:
+        raise TypeError(f"Proposal requires `id` and has no fields {sorted(unknown)}")
+    return Expected('Proposal', fields)
+
+
+class Satisfies:
+    """Expected value checked by `predicate`, e.g. `Satisfies(lambda votes: votes > 0, '> 0')`."""
+
+    def __init__(self, predicate, description):
+        self.predicate = predicate
+        self.description = description
+
+    def __eq__(self, other):
+        return bool(self.predicate(other))
+
+    def __repr__(self):
+        return self.description
+
+
+def decode_logs(logs):
+    """`Event`s of the known signatures in `logs`, in log order, other logs are skipped."""
+    events = []
+    for log in logs:
+        spec = SPECS.get(_bytes(log['topics'][0])) if log['topics'] else None
+        if spec is not None:
+            events.append(spec.decode(log))
+    return events
+
+
+def canonical(value):
+    """Comparable form of decoded and expected values: checksummed addresses, `0x` hex bytes, lists."""
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    if hasattr(value, 'address'):
+        value = value.address
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if isinstance(value, str) and is_hex_address(value):
+        return to_checksum_address(value)
+    if isinstance(value, str) and value.startswith('0x'):
+        return value.lower()
+    return value
+
+
+def _diff(label, expected, actual):
+    return [
+        f"{label}.{field}: expected {canonical(value)!r}, got {canonical(actual[field])!r}"
+        for field, value in expected.fields.items()
+        if not (value if isinstance(value, Satisfies) else canonical(value)) == canonical(actual[field])
+    ]
+
+
+def assert_events(tx, *expected):
+    """
+    Asserts `Expected` events against the logs of `tx`, decoded once, reporting every mismatch at once.
+
+    The n-th expected event of a name is compared with the n-th emitted event of that name, only
+    the given fields are compared.
+    """
+    emitted = defaultdict(list)
+    for event in decode_logs(tx.logs):
+        emitted[event.name].append(event)
+
+    mismatches, seen = [], defaultdict(int)
+    for record in expected:
+        index = seen[record.name]
+        seen[record.name] += 1
+        label = f"{record.name}[{index}]"
+        if index >= len(emitted[record.name]):
+            mismatches.append(f"{label}: not emitted ({len(emitted[record.name])} emitted)")
+            continue
+        mismatches += _diff(label, record, emitted[record.name][index].fields)
+    assert not mismatches, f"{len(mismatches)} event fields differ:\n" + "\n".join(mismatches)
+
+
+def _call_batch(web3, governance, selector, ids, block):
+    requests = [
+        {
+            'method': 'eth_call',
+            'params': [{'to': str(governance), 'data': '0x' + (selector + int(i).to_bytes(32, 'big')).hex()}, block],
+        }
+        for i in ids
+    ]
+    return rpc_batch(web3, requests)
+
+
+def fetch_proposals(web3, governance, ids, block='latest'):
+    """`getProposalById()` structs of `ids` as dicts, read in one JSON-RPC batch request."""
+    proposals = []
+    for i, response in zip(ids, _call_batch(web3, governance, GET_PROPOSAL_BY_ID, ids, block)):
+        if not isinstance(response, str):
+            raise ValueError(f"getProposalById({i}) failed: {response}")
+        proposals.append(dict(zip(_PROPOSAL_NAMES, _PROPOSAL(ContextFramesBytesIO(_bytes(response)))[0])))
+    return proposals
+
+
+def fetch_proposal_states(web3, governance, ids, block='latest'):
+    """`getProposalState()` of `ids` as ints, read in one JSON-RPC batch request."""
+    states = []
+    for i, response in zip(ids, _call_batch(web3, governance, GET_PROPOSAL_STATE, ids, block)):
+        if not isinstance(response, str):
+            raise ValueError(f"getProposalState({i}) failed: {response}")
+        states.append(int(response, 16))
+    return states
+
+
+def assert_proposals(web3, governance, *expected, block='latest'):
+    """Asserts `Proposal` records against `getProposalById()`, in one round trip, reporting every mismatch."""
+    proposals = fetch_proposals(web3, governance, [record.fields['id'] for record in expected], block)
+    mismatches = []
+    for record, proposal in zip(expected, proposals):
+        mismatches += _diff(f"Proposal({record.fields['id']})", record, proposal)
+    assert not mismatches, f"{len(mismatches)} proposal fields differ:\n" + "\n".join(mismatches)
@@ -0,0 +1,179 @@
+import copy
+
+import rlp
+from eth_utils import keccak, to_canonical_address, to_checksum_address
+
+from .lifecycle import ProposalLifecycle, payload_spec
+
+DAY = 60 * 60 * 24
+
+# Constructor arguments of the new long `Executor` after `admin`
+NEW_LONG_EXECUTOR_ARGS = dict(
+    delay=DAY,
+    grace_period=5 * DAY,
+    minimum_delay=DAY,
+    maximum_delay=10 * DAY,
+    proposition_threshold=125, # 1.25%
+    vote_duration=64_000, # blocks
+    vote_differential=650, # 6.5%
+    minimum_quorum=650, # 6.5%
+)
+
+IPFS_HASH_LONG = b'\x12' * 32
+IPFS_HASH_RESERVE = b'\xab' * 32
+
+# `user_properties` entry of a migration variant's outcome, see `VariantSummary`
+VARIANT_PROPERTY = "migration_variant"
+
+
+def contract_address(sender, nonce):
+    """Address of the contract deployed by `sender` with its transaction of `nonce`."""
+    return to_checksum_address(keccak(rlp.encode([to_canonical_address(str(sender)), nonce]))[12:])
+
+
+class Migration:
+    """
+    The governance migration split into stages which can be checkpointed by `Checkpoints`.
+
+    a) `deploy_payloads`: deploy `ProposalPayloadNewLongExecutor` for the address the new long
+       `Executor` will have, `AaveEcosystemReserveV2` and `ProposalPayloadAaveEcosystemReserveWithVoting`
+    b) `create_proposals`: `create()` both payloads on `AaveGovernanceV2`
+    c) `deploy_executor`: deploy the new long `Executor` with `executor_args`
+    d) `execute_reserve_proposal`: vote, queue and execute `ProposalPayloadAaveEcosystemReserveWithVoting`
+    e) `vote_long_proposal`: vote `ProposalPayloadNewLongExecutor` until its voting period is over
+    f) `queue_long_proposal`: queue `ProposalPayloadNewLongExecutor`
+    g) `execute_long_proposal`: execute `ProposalPayloadNewLongExecutor`, the new executor is live
+
+    The executor is deployed by `executor_deployer`, an account sending no other transaction, so its
+    address is known before it is deployed and stages a) and b) do not depend on `executor_args`.
+    `variant()` changes the executor arguments and the voters of the long proposal, whose stages
+    branch from b) (see `Checkpoints.branch()`).
+
+    `top_holders` is the `top_aave_holders` fixture, `contracts` holds the `Executor`,
+    `ProposalPayloadNewLongExecutor`, `AaveEcosystemReserveV2` and
+    `ProposalPayloadAaveEcosystemReserveWithVoting` containers as attributes.
+    """
+
+    def __init__(
+        self,
+        deployer,
+        executor_deployer,
+        governance,
+        short_executor,
+        long_executor,
+        top_holders,
+        warp,
+        contracts,
+        executor_args=NEW_LONG_EXECUTOR_ARGS,
+    ):
+        self.deployer = deployer
+        self.executor_deployer = executor_deployer
+        self.governance = governance
+        self.short_executor = short_executor
+        self.long_executor = long_executor
+        self.lifecycle = ProposalLifecycle(governance, warp, deployer)
+        self.contracts = contracts
+        self.executor_args = executor_args
+
+        self.creator_long = top_holders[3]
+        self.creator_reserve = top_holders[0] # Using Binance 8 as creator to reach 2% requirement
+        self.voters_reserve = top_holders[-5:]
+        self.voters_long = [top_holders[i] for i in (0, 1, 5, 6, 7, 8, 9)]
+
+    def variant(self, executor_args=None, voters_long=None):
+        """A copy deploying the executor with `executor_args` and voting the long proposal with `voters_long`."""
+        variant = copy.copy(self)
+        variant.executor_args = self.executor_args if executor_args is None else executor_args
+        variant.voters_long = self.voters_long if voters_long is None else list(voters_long)
+        return variant
+
+    def stages(self):
+        return [
+            ("payloads_deployed", self.deploy_payloads),
+            ("proposals_created", self.create_proposals),
+            ("executor_deployed", self.deploy_executor),
+            ("reserve_executed", self.execute_reserve_proposal),
+            ("long_voted", self.vote_long_proposal),
+            ("long_queued", self.queue_long_proposal),
+            ("new_executor_live", self.execute_long_proposal),
+        ]
+
+    def deploy_payloads(self, state):
+        state.new_long_executor_address = contract_address(self.executor_deployer, self.executor_deployer.nonce)
+        state.proposal_id_long = self.governance.getProposalsCount()
+        state.proposal_id_reserve = state.proposal_id_long + 1
+
+        state.proposal_long_executor = self.deployer.deploy(
+            self.contracts.ProposalPayloadNewLongExecutor, state.new_long_executor_address
+        )
+        state.aave_ecosystem_reserve_v2 = self.deployer.deploy(self.contracts.AaveEcosystemReserveV2)
+        state.proposal_reserve_with_voting = self.deployer.deploy(
+            self.contracts.ProposalPayloadAaveEcosystemReserveWithVoting,
+            state.aave_ecosystem_reserve_v2,
+            state.proposal_id_long,
+        )
+
+    def create_proposals(self, state):
+        # Both in one block, the long proposal first as its id is set in the reserve payload
+        state.create_long_tx, state.create_reserve_tx = self.lifecycle.create(
+            payload_spec(self.long_executor, state.proposal_long_executor, IPFS_HASH_LONG, self.creator_long),
+            payload_spec(
+                self.short_executor, state.proposal_reserve_with_voting, IPFS_HASH_RESERVE, self.creator_reserve
+            ),
+        )
+
+    def deploy_executor(self, state):
+        state.new_long_executor = self.executor_deployer.deploy(
+            self.contracts.Executor, self.governance, *self.executor_args.values()
+        )
+        if state.new_long_executor != state.new_long_executor_address:
+            raise RuntimeError(
+                f"new long Executor deployed at {state.new_long_executor}, the payload expects "
+                f"{state.new_long_executor_address}: {self.executor_deployer} sent other transactions"
+            )
+
+    def execute_reserve_proposal(self, state):
+        self.lifecycle.vote(state.proposal_id_reserve, for_=self.voters_reserve)
+        (state.queue_reserve_tx,) = self.lifecycle.queue(state.proposal_id_reserve)
+        (state.execute_reserve_tx,) = self.lifecycle.execute(state.proposal_id_reserve)
+
+    def vote_long_proposal(self, state):
+        self.lifecycle.vote(state.proposal_id_long, for_=self.voters_long)
+        self.lifecycle.warp.past_voting(self.governance, state.proposal_id_long)
+
+    def queue_long_proposal(self, state):
+        (state.queue_long_tx,) = self.lifecycle.queue(state.proposal_id_long)
+
+    def execute_long_proposal(self, state):
+        (state.execute_long_tx,) = self.lifecycle.execute(state.proposal_id_long)
+
+
+class VariantSummary:
+    """
+    Outcomes and timings of migration variants, one row per test recording a dict as the
+    `VARIANT_PROPERTY` user property. Collected from test reports, which xdist sends to the master,
+    so variants run on every worker end up in one table.
+    """
+
+    def __init__(self):
+        self.rows = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            for name, value in report.user_properties:
+                if name == VARIANT_PROPERTY:
+                    self.rows[value["variant"]] = value
+
+    def report(self):
+        """Lines of `variant, migration, proposal` outcomes and the seconds spent on each part."""
+        lines = [
+            f"{'variant':<48}{'migration':<24}{'proposal':<28}{'shared (s)':>11}{'migration (s)':>14}{'proposal (s)':>13}"
+        ]
+        for name, row in sorted(self.rows.items()):
+            seconds = [
+                '' if row.get(key) is None else f"{row[key]:.1f}" for key in ('shared_s', 'migration_s', 'proposal_s')
+            ]
+            lines.append(
+                f"{name:<48}{row['migration']:<24}{row['proposal']:<28}{seconds[0]:>11}{seconds[1]:>14}{seconds[2]:>13}"
+            )
+        return lines
@@ -0,0 +1,120 @@
+from collections import namedtuple
+
+from brownie import accounts, web3
+from brownie.exceptions import VirtualMachineError
+from brownie.network.multicall import Multicall
+from eth_abi import decode_abi, encode_abi
+from eth_utils import keccak
+
+from .rpc import rpc_batch
+
+# `Multicall2` on Ethereum Mainnet, deployed long before the fork block
+MULTICALL2 = "0x5BA1e12693Dc8F9c48aAD8770482f4739bEeD696"
+
+# `tryAggregate(bool,(address,bytes)[])`
+TRY_AGGREGATE = keccak(text="tryAggregate(bool,(address,bytes)[])")[:4]
+
+# Row of a state table: a brownie contract method, its arguments (optionally ending with a
+# `{'from': ...}` dict as in brownie calls) and the expected return value
+Read = namedtuple("Read", ["method", "args", "expected"])
+
+
+def multicall_address():
+    """`Multicall2` on the connected chain, deployed from `accounts[0]` if it has no code there."""
+    if web3.eth.get_code(MULTICALL2):
+        return MULTICALL2
+    return Multicall.deploy({"from": accounts[0]}).address
+
+
+def _split_sender(args):
+    if args and isinstance(args[-1], dict):
+        return args[:-1], args[-1].get("from")
+    return args, None
+
+
+class StateReads:
+    """
+    Reads a table of contract getters in as few round trips as possible.
+
+    Calls without a sender are aggregated into a single `Multicall2.tryAggregate()` call. Calls
+    that depend on `msg.sender` (e.g. `admin()` of transparent proxies) cannot go through the
+    aggregator and are sent together as one JSON-RPC batch. `round_trips` counts node requests.
+    """
+
+    def __init__(self, block="latest"):
+        self.block = block
+        self.round_trips = 0
+        self._address = None
+
+    def read(self, rows):
+        """Returns the decoded result of each `Read` row, or a `ValueError` for calls that reverted."""
+        results = [None] * len(rows)
+        aggregated, direct = [], []
+        for i, row in enumerate(rows):
+            args, sender = _split_sender(tuple(row.args))
+            calldata = row.method.encode_input(*args)
+            if sender is None:
+                aggregated.append((i, row.method, calldata))
+            else:
+                direct.append((i, row.method, calldata, str(sender)))
+
+        if aggregated:
+            if self._address is None:
+                self._address = multicall_address()
+            calls = [(str(method._address), bytes.fromhex(calldata[2:])) for _, method, calldata in aggregated]
+            data = TRY_AGGREGATE + encode_abi(["bool", "(address,bytes)[]"], [False, calls])
+            returned = web3.eth.call({"to": self._address, "data": "0x" + data.hex()}, self.block)
+            self.round_trips += 1
+            for (i, method, _), (success, output) in zip(aggregated, decode_abi(["(bool,bytes)[]"], returned)[0]):
+                results[i] = _decode(method, output.hex(), success)
+
+        if direct:
+            requests = [
+                {"method": "eth_call", "params": [{"from": sender, "to": str(method._address), "data": calldata}, self.block]}
+                for _, method, calldata, sender in direct
+            ]
+            responses = rpc_batch(web3, requests)
+            self.round_trips += 1
+            for (i, method, _, _), response in zip(direct, responses):
+                results[i] = _decode(method, response, isinstance(response, str))
+        return results
+
+    def assert_state(self, rows):
+        """Asserts every row of the table, reporting all mismatches together."""
+        _assert_results(rows, self.read(rows))
+
+
+def _decode(method, output, success):
+    if not success:
+        return ValueError(f"call reverted: {output}")
+    output = output if output.startswith("0x") else "0x" + output
+    try:
+        return method.decode_output(output)
+    except Exception as e:
+        return ValueError(f"undecodable output {output}: {e}")
+
+
+def _describe(row):
+    args, sender = _split_sender(tuple(row.args))
+    call = f"{row.method._name}({', '.join(map(repr, args))})"
+    return call if sender is None else f"{call} from {sender}"
+
+
+def assert_state_per_call(rows):
+    """`StateReads().assert_state()` making one call per row, for comparison."""
+    results = []
+    for row in rows:
+        try:
+            results.append(row.method.call(*row.args))
+        except (ValueError, VirtualMachineError) as e:
+            results.append(ValueError(str(e)))
+    _assert_results(rows, results)
+
+
+def _assert_results(rows, results):
+    mismatches = [
+        f"{_describe(row)}: expected {row.expected!r}, got {result!r}"
+        for row, result in zip(rows, results)
+        if isinstance(result, ValueError) or not result == row.expected
+    ]
+    assert not mismatches, f"{len(mismatches)} of {len(rows)} reads differ:\n" + "\n".join(mismatches)
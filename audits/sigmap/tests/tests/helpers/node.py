@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import time
+import urllib.error
+
+import psutil
+from brownie._config import CONFIG, EVM_EQUIVALENTS
+from brownie.network.rpc import ganache
+
+from .rpc import rpc_call
+
+# Seconds to wait for a launched node to answer requests
+STARTUP_TIMEOUT = 120
+
+
+def ganache_command(cmd, cmd_settings, db_path):
+    """
+    The command line brownie would launch for `cmd` / `cmd_settings`, storing the chain in `db_path`.
+    """
+    cmd_list = cmd.split(" ")
+    version = ganache.get_ganache_version(cmd_list[0])
+    if version <= 6:
+        flags, db_flag = ganache.CLI_FLAGS["<=6"], "--db"
+    else:
+        flags, db_flag = ganache.CLI_FLAGS["7"], "--database.dbPath"
+        cmd_list.extend(["--chain.vmErrorsOnRPCResponse", "true"])
+
+    settings = {"evm_version": ganache.EVM_DEFAULT, **cmd_settings}
+    settings["evm_version"] = EVM_EQUIVALENTS.get(settings["evm_version"], settings["evm_version"])
+    if "fork" in settings:
+        settings["fork"] = os.path.expandvars(settings["fork"])
+    for key, value in ganache._validate_cmd_settings(settings).items():
+        if key not in flags or value is False or value is None:
+            continue
+        cmd_list.extend([flags[key]] if value is True else [flags[key], str(value)])
+    return cmd_list + [db_flag, str(db_path)]
+
+
+class ManagedNode:
+    """
+    A fork node for brownie `network` that is kept running between test sessions.
+
+    The first session forks and stores the chain in `directory/db`, keeping a copy of the untouched
+    db in `directory/pristine` and a snapshot of the post-fork state in the running node. Later
+    sessions revert the running node to that snapshot, or when it is no longer running (e.g. after a
+    reboot), launch it again on a fresh copy of the pristine db. Changing the network's `cmd` or
+    `cmd_settings` forks again. Brownie then attaches to the node instead of launching its own.
+
+    `directory/node.json` records the node's pid and creation time, settings and pristine snapshot
+    id. A recorded pid is only trusted while the process with it was created at that time, after a
+    reboot or in a new container it may belong to another process.
+    """
+
+    def __init__(self, network, directory):
+        self.directory = directory
+        self.cmd = CONFIG.networks[network]["cmd"]
+        self.cmd_settings = dict(CONFIG.networks[network]["cmd_settings"])
+        self.url = f"{CONFIG.networks[network]['host']}:{self.cmd_settings['port']}"
+        self.settings_hash = hashlib.sha256(
+            json.dumps([self.cmd, self.cmd_settings], sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    @property
+    def state_path(self):
+        return self.directory / "node.json"
+
+    @property
+    def db_path(self):
+        return self.directory / "db"
+
+    @property
+    def pristine_path(self):
+        return self.directory / "pristine"
+
+    def start(self):
+        """Makes the node ready at its pristine state, returns `"reset"`, `"restored"` or `"forked"`."""
+        state = self._read_state()
+        same_settings = state is not None and state["settings"] == self.settings_hash
+        node = _recorded_process(state)
+
+        if same_settings and node is not None and self._revert(state["snapshot"]):
+            self._write_state(node)
+            return "reset"
+        if node is not None:
+            _terminate(node)
+
+        if same_settings and self.pristine_path.exists():
+            shutil.rmtree(self.db_path, ignore_errors=True)
+            shutil.copytree(self.pristine_path, self.db_path)
+            self._write_state(self._launch())
+            return "restored"
+
+        # Fork, then stop the node so the db on disk is complete before copying it
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True)
+        _terminate(self._launch())
+        shutil.copytree(self.db_path, self.pristine_path)
+        self._write_state(self._launch())
+        return "forked"
+
+    def stop(self):
+        """Terminates the node, the dbs are kept so the next session restores instead of forking."""
+        state = self._read_state()
+        if state is None:
+            return
+        node = _recorded_process(state)
+        if node is not None:
+            _terminate(node)
+        state.update(pid=None, created=None)
+        self.state_path.write_text(json.dumps(state, indent=2))
+
+    def _launch(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        command = ganache_command(self.cmd, self.cmd_settings, self.db_path)
+        # Started in the background of a shell that exits right away, so the node is not a child of
+        # this process and brownie leaves it running when the session ends
+        launcher = subprocess.run(
+            ["sh", "-c", '"$@" >>"$0" 2>&1 </dev/null & echo $!', str(self.directory / "node.log"), *command],
+            stdout=subprocess.PIPE, check=True, text=True, start_new_session=True,
+        )
+        try:
+            process = psutil.Process(int(launcher.stdout))
+        except psutil.NoSuchProcess:
+            process = None
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process is None or not _is_running(process):
+                raise RuntimeError(f"Node exited, see {self.directory / 'node.log'}")
+            try:
+                rpc_call(self.url, "web3_clientVersion")
+                return process
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.2)
+        _terminate(process)
+        raise RuntimeError(f"Node did not answer at {self.url} within {STARTUP_TIMEOUT}s")
+
+    def _revert(self, snapshot):
+        try:
+            return rpc_call(self.url, "evm_revert", [snapshot]) is True
+        except (urllib.error.URLError, ConnectionError, RuntimeError):
+            return False
+
+    def _read_state(self):
+        if not self.state_path.exists():
+            return None
+        return json.loads(self.state_path.read_text())
+
+    def _write_state(self, process):
+        # A revert consumes the snapshot, so a new one is taken every session
+        snapshot = rpc_call(self.url, "evm_snapshot")
+        state = {
+            "pid": process.pid,
+            "created": process.create_time(),
+            "settings": self.settings_hash,
+            "snapshot": snapshot,
+        }
+        self.state_path.write_text(json.dumps(state, indent=2))
+
+
+def _recorded_process(state):
+    # The node of `node.json`, or None when its pid is no longer the node's or was never recorded
+    if state is None or state.get("pid") is None:
+        return None
+    try:
+        process = psutil.Process(state["pid"])
+        if process.create_time() != state.get("created"):
+            return None
+    except psutil.NoSuchProcess:
+        return None
+    return process if _is_running(process) else None
+
+
+def _is_running(process):
+    # `is_running()` also fails once the pid was reused by a process created after `process`
+    try:
+        return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def _terminate(process, timeout=30):
+    # SIGTERM lets ganache close its db cleanly
+    if not _is_running(process):
+        return
+    try:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout)
+    except psutil.TimeoutExpired:
+        process.kill()
+        process.wait()
+    except psutil.NoSuchProcess:
+        pass
@@ -0,0 +1,87 @@
+import os
+import re
+import socket
+import types
+
+import pytest
+from brownie._config import CONFIG
+from xdist.scheduler import LoadFileScheduling
+
+from .rpc_cache import route_fork
+
+# Parametrize ids starting with `variant_` split a test module into separately scheduled units
+VARIANT_ID = re.compile(r"\bvariant_\w+")
+
+
+def free_port(host="127.0.0.1"):
+    """A port nothing listens on right now."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def fork_block(network):
+    """The block `network` forks at, from its `fork` setting (`<url>@<block>`)."""
+    return int(os.path.expandvars(CONFIG.networks[network]["cmd_settings"]["fork"]).rpartition("@")[2])
+
+
+def fork_url(network):
+    """The upstream JSON-RPC url `network` forks from, from its `fork` setting (`<url>@<block>`)."""
+    return os.path.expandvars(CONFIG.networks[network]["cmd_settings"]["fork"]).rpartition("@")[0]
+
+
+def scope_of(nodeid):
+    """
+    The scheduling unit of a test: its module, as with brownie's own file scheduling, plus the
+    `variant_*` parameter if it has one, so variants of one module run on different workers.
+    """
+    module = nodeid.split("::", 1)[0]
+    variant = VARIANT_ID.search(nodeid.partition("[")[2])
+    return f"{module}::{variant.group()}" if variant else module
+
+
+class VariantScheduling(LoadFileScheduling):
+    def _split_scope(self, nodeid):
+        return scope_of(nodeid)
+
+
+class NodePool:
+    """
+    Per-worker fork nodes for `pytest-xdist`, registered as a plugin on the master process.
+
+    Each worker is given a free port for the fork node brownie launches in it, all nodes fork the
+    same block and read upstream state through the shared `cache_server` on the master, so every
+    upstream read is fetched once for the whole pool.
+    """
+
+    def __init__(self, cache_server):
+        self.cache_server = cache_server
+        self.ports = {}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        worker = node.gateway.id
+        self.ports[worker] = free_port()
+        node.workerinput["fork_port"] = self.ports[worker]
+        node.workerinput["upstream_cache"] = self.cache_server.url
+
+    @pytest.hookimpl(optionalhook=True, tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        return VariantScheduling(config, log)
+
+
+def configure_worker(workerinput, network):
+    """Points the fork node of this worker at its own port and the master's upstream cache."""
+    CONFIG.networks[network]["cmd_settings"]["port"] = workerinput["fork_port"]
+    route_fork(network, workerinput["upstream_cache"])
+
+
+def node_info(config, network):
+    """Worker id, port and fork block of the fork node used by this process."""
+    workerinput = getattr(config, "workerinput", {})
+    return types.SimpleNamespace(
+        worker=workerinput.get("workerid", "master"),
+        port=CONFIG.networks[network]["cmd_settings"]["port"],
+        fork_block=fork_block(network),
+        upstream_cache=workerinput.get("upstream_cache"),
+    )
@@ -0,0 +1,176 @@
+import heapq
+from collections import deque, namedtuple
+
+import numpy as np
+
+DAY = 60 * 60 * 24
+MONTH = 30 * DAY
+
+# Seconds per block after the merge, as assumed by the `VOTING_DELAY` of `ProposalPayloadNewLongExecutor`
+BLOCK_TIME = 12
+
+# Outcome of a simulated proposal, indexes in `OUTCOMES`
+FAILED, EXECUTED, EXPIRED = range(3)
+OUTCOMES = ['failed', 'executed', 'expired']
+
+# Events at the same time are handled in this order, so a slot freed at the end of a vote goes to the
+# head of the backlog, a proposal arriving at that time only takes it when the backlog is empty
+_VOTING_ENDED, _ARRIVED = range(2)
+
+
+class Lane(namedtuple('Lane', ['name', 'voting_delay', 'voting_duration', 'delay', 'grace_period', 'block_time'])):
+    """
+    Timings of the proposals of one executor: the governance's voting delay and the executor's voting
+    duration in blocks, the timelock delay and grace period in seconds.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def read(cls, name, governance, executor, block_time=BLOCK_TIME):
+        """The lane of `executor` (`Executor` or `OldExecutor`) on `governance`, read from the contracts."""
+        return cls(
+            name,
+            governance.getVotingDelay(),
+            executor.VOTING_DURATION(),
+            executor.getDelay(),
+            executor.GRACE_PERIOD(),
+            block_time,
+        )
+
+    @property
+    def voting_window(self):
+        """Seconds from `create()` to the first block where the proposal may be queued."""
+        return (self.voting_delay + self.voting_duration + 1) * self.block_time
+
+    def capacity(self, slots):
+        """Proposals per month going through voting with `slots` of them at a time."""
+        return slots * MONTH / self.voting_window
+
+
+# Proposals of one lane in arrival order: arrival times in seconds, whether each passes its vote and
+# the seconds from the end of voting to `queue()` and from `executionTime` to `execute()`
+Arrivals = namedtuple('Arrivals', ['times', 'passed', 'queue_lags', 'execute_lags'])
+
+
+def poisson_arrivals(count, per_month, rng, pass_rate=0.9, queue_lag=DAY / 4, execute_lag=DAY / 4):
+    """
+    `count` proposals arriving at `per_month` on average, a share `pass_rate` of them passing, with
+    exponentially distributed lags of mean `queue_lag` and `execute_lag` seconds. `rng` is a NumPy
+    `Generator`.
+    """
+    return Arrivals(
+        np.cumsum(rng.exponential(MONTH / per_month, count)),
+        rng.random(count) < pass_rate,
+        rng.exponential(queue_lag, count),
+        rng.exponential(execute_lag, count),
+    )
+
+
+def simulate(lane, arrivals, slots):
+    """
+    Discrete-event simulation of `arrivals` on `lane`: create, voting delay, vote, queue, timelock,
+    then execute or expire. Returns a `PipelineRun`.
+
+    On chain any number of proposals may be voted at once, `slots` is how many the voters of the
+    lane follow at a time. A proposal arriving with every slot taken waits in a FIFO backlog and is
+    created once a vote ends. The slots are the only shared resource, so the event heap holds the
+    arrivals and the ends of votes; queuing, the timelock and execution or expiry of each proposal
+    follow from the end of its vote and are computed for all proposals at once.
+    """
+    times = arrivals.times.tolist()
+    window = lane.voting_window
+    created = [0.0] * len(times)
+    backlog = deque()
+    free = slots
+    events = [(times[0], _ARRIVED, 0)] if times else []
+
+    while events:
+        now, event, i = heapq.heappop(events)
+        if event == _ARRIVED:
+            # Each arrival schedules the next, so the heap only holds the proposals being voted
+            if i + 1 < len(times):
+                heapq.heappush(events, (times[i + 1], _ARRIVED, i + 1))
+            if not free:
+                backlog.append(i)
+                continue
+            free -= 1
+        elif backlog:
+            i = backlog.popleft()
+        else:
+            free += 1
+            continue
+        created[i] = now
+        heapq.heappush(events, (now + window, _VOTING_ENDED, i))
+
+    created = np.array(created)
+    voting_ended = created + window
+    passed = arrivals.passed
+    queued = np.where(passed, voting_ended + arrivals.queue_lags, np.nan)
+    execution_time = queued + lane.delay
+    # `execute()` is allowed up to `executionTime + GRACE_PERIOD` included, after it the proposal is expired
+    executed = passed & (arrivals.execute_lags <= lane.grace_period)
+    finished = np.where(
+        passed,
+        execution_time + np.where(executed, arrivals.execute_lags, lane.grace_period),
+        voting_ended,
+    )
+    outcome = np.where(passed, np.where(executed, EXECUTED, EXPIRED), FAILED).astype(np.int8)
+    return PipelineRun(lane, slots, arrivals.times, created, voting_ended, queued, execution_time, finished, outcome)
+
+
+class PipelineRun:
+    """
+    Times in seconds of each proposal of a `simulate()` run and their summary. Rates and utilization
+    are taken over the arrivals, from 0 to the last arrival.
+    """
+
+    def __init__(self, lane, slots, arrived, created, voting_ended, queued, execution_time, finished, outcome):
+        self.lane = lane
+        self.slots = slots
+        self.arrived = arrived
+        self.created = created
+        self.voting_ended = voting_ended
+        self.queued = queued
+        self.execution_time = execution_time
+        self.finished = finished
+        self.outcome = outcome
+        self.end = float(arrived[-1]) if len(arrived) else 0.0
+
+    def __len__(self):
+        return len(self.arrived)
+
+    def utilization(self):
+        """Share of slot time spent voting."""
+        busy = np.minimum(self.voting_ended, self.end) - np.minimum(self.created, self.end)
+        return float(busy.sum() / (self.slots * self.end)) if self.end else 0.0
+
+    def per_month(self, outcome=EXECUTED):
+        """Proposals reaching `outcome` per month."""
+        done = (self.outcome == outcome) & (self.finished <= self.end)
+        return float(done.sum() * MONTH / self.end) if self.end else 0.0
+
+    def share(self, outcome):
+        """Share of the proposals with `outcome`."""
+        return float((self.outcome == outcome).mean()) if len(self) else 0.0
+
+    def waits(self, percentiles=(50, 90, 99)):
+        """Percentiles of the seconds spent in the backlog before `create()`."""
+        return _percentiles(self.created - self.arrived, percentiles)
+
+    def latencies(self, percentiles=(50, 90, 99)):
+        """Percentiles of the seconds from arrival to `execute()` of executed proposals."""
+        executed = self.outcome == EXECUTED
+        return _percentiles(self.finished[executed] - self.arrived[executed], percentiles)
+
+    def mean_in_timelock(self):
+        """Average number of queued proposals, executed or expired after `executionTime`."""
+        queued = ~np.isnan(self.queued)
+        timelocked = np.minimum(self.finished[queued], self.end) - np.minimum(self.queued[queued], self.end)
+        return float(timelocked.sum() / self.end) if self.end else 0.0
+
+
+def _percentiles(values, percentiles):
+    if not len(values):
+        return {p: float('nan') for p in percentiles}
+    return dict(zip(percentiles, np.percentile(values, percentiles).tolist()))
@@ -0,0 +1,215 @@
+import sqlite3
+from pathlib import Path
+
+from eth_utils import to_canonical_address, to_checksum_address
+
+from .logs import get_logs
+from .matchers import EventSpec
+
+# Default location of the index of each network, see `scripts/build_power_index.py`
+POWER_INDEX_DIR = Path(__file__).parent.parent.parent / 'power-index'
+
+# Governance tokens of `GovernanceStrategy`: name, proxy address and a block before their deployment
+TOKENS = {
+    'AAVE': ('0x7Fc66500c84A76Ad7e9c93437bFc5Ac33E2DDaE9', 10_926_000),
+    'stkAAVE': ('0x4da27a545c0c5B758a6BA100e3a049001de870f5', 10_926_000),
+}
+
+# `IGovernancePowerDelegationToken.DelegationType`
+VOTING_POWER = 0
+PROPOSITION_POWER = 1
+
+TRANSFER = EventSpec('Transfer(address indexed from, address indexed to, uint256 value)')
+DELEGATE_CHANGED = EventSpec('DelegateChanged(address indexed delegator, address indexed delegatee, uint8 delegationType)')
+DELEGATED_POWER_CHANGED = EventSpec('DelegatedPowerChanged(address indexed user, uint256 amount, uint8 delegationType)')
+_EVENTS = {spec.topic: spec for spec in (TRANSFER, DELEGATE_CHANGED, DELEGATED_POWER_CHANGED)}
+_TOPICS = [['0x' + topic.hex() for topic in _EVENTS]]
+
+_ZERO = bytes(20)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursor (token TEXT PRIMARY KEY, next_block INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS power (
+    token TEXT, power_type INTEGER, holder BLOB, block INTEGER, amount BLOB,
+    PRIMARY KEY (token, power_type, holder, block)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS balance (token TEXT, holder BLOB, amount BLOB, PRIMARY KEY (token, holder)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS delegate (
+    token TEXT, power_type INTEGER, delegator BLOB, delegatee BLOB,
+    PRIMARY KEY (token, power_type, delegator)
+) WITHOUT ROWID;
+"""
+
+
+def _amount(value):
+    # Powers are uint128 snapshots, fixed width big-endian blobs sort numerically
+    return value.to_bytes(16, 'big')
+
+
+class PowerIndex:
+    """
+    Governance power timelines of every AAVE and stkAAVE holder, built from logs into SQLite.
+
+    `DelegatedPowerChanged(user, amount, type)` is emitted with the new value of each power
+    snapshot the tokens write, so a holder's power at a block is the last amount emitted at or
+    before it, or 0 before the first one. Holders without any snapshot have their balance as power,
+    kept from `Transfer` logs. `DelegateChanged` logs keep the current delegatee of every delegator.
+
+    `update()` indexes in chunks and commits a per-token cursor with each chunk, so an interrupted
+    build resumes where it stopped. Lookups only read the database, see `voting_power()` for the
+    equivalent of `GovernanceStrategy.getVotingPowerAt()`.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def cursor(self, token):
+        """The next block to index for `token`."""
+        row = self.db.execute('SELECT next_block FROM cursor WHERE token = ?', (token,)).fetchone()
+        return TOKENS[token][1] if row is None else row[0]
+
+    def has_cursor(self, token):
+        return self.db.execute('SELECT 1 FROM cursor WHERE token = ?', (token,)).fetchone() is not None
+
+    def update(self, url, end_block, tokens=tuple(TOKENS), start_block=None, progress=None):
+        """
+        Indexes the logs of `tokens` up to `end_block` read from JSON-RPC `url`, from the cursor or
+        for a new index from `start_block` (default the token's deployment). An index not started
+        at deployment is only exact for holders with a snapshot in the indexed range.
+        """
+        for token in tokens:
+            address = TOKENS[token][0]
+            start = self.cursor(token) if start_block is None or self.has_cursor(token) else start_block
+            for first, last, logs in get_logs(url, address, _TOPICS, start, end_block):
+                with self.db:
+                    self._apply(token, logs)
+                    self.db.execute(
+                        'INSERT OR REPLACE INTO cursor (token, next_block) VALUES (?, ?)', (token, last + 1)
+                    )
+                if progress is not None:
+                    progress(token, first, last, len(logs))
+
+    def _apply(self, token, logs):
+        balances = {}
+
+        def balance(holder):
+            if holder not in balances:
+                row = self.db.execute(
+                    'SELECT amount FROM balance WHERE token = ? AND holder = ?', (token, holder)
+                ).fetchone()
+                balances[holder] = 0 if row is None else int.from_bytes(row[0], 'big')
+            return balances[holder]
+
+        for log in logs:
+            event = _EVENTS[bytes.fromhex(log['topics'][0][2:])].decode(log)
+            fields = event.fields
+            if event.name == 'Transfer':
+                sender, receiver = to_canonical_address(fields['from']), to_canonical_address(fields['to'])
+                if sender != _ZERO:
+                    balances[sender] = balance(sender) - fields['value']
+                if receiver != _ZERO:
+                    balances[receiver] = balance(receiver) + fields['value']
+            elif event.name == 'DelegatedPowerChanged':
+                self.db.execute(
+                    'INSERT OR REPLACE INTO power VALUES (?, ?, ?, ?, ?)',
+                    (
+                        token,
+                        fields['delegationType'],
+                        to_canonical_address(fields['user']),
+                        int(log['blockNumber'], 16),
+                        _amount(fields['amount']),
+                    ),
+                )
+            else:
+                self.db.execute(
+                    'INSERT OR REPLACE INTO delegate VALUES (?, ?, ?, ?)',
+                    (
+                        token,
+                        fields['delegationType'],
+                        to_canonical_address(fields['delegator']),
+                        to_canonical_address(fields['delegatee']),
+                    ),
+                )
+
+        # Balances only go negative in an index not started at deployment
+        self.db.executemany(
+            'INSERT OR REPLACE INTO balance VALUES (?, ?, ?)',
+            [(token, holder, _amount(max(amount, 0))) for holder, amount in balances.items()],
+        )
+
+    def token_power(self, token, holder, block, power_type=VOTING_POWER):
+        """
+        `getPowerAtBlock(holder, block, power_type)` of `token`, for holders without snapshots the
+        balance at the last indexed block (the tokens return the current balance).
+        """
+        holder = to_canonical_address(str(holder))
+        row = self.db.execute(
+            'SELECT amount FROM power WHERE token = ? AND power_type = ? AND holder = ? AND block <= ? '
+            'ORDER BY block DESC LIMIT 1',
+            (token, power_type, holder, block),
+        ).fetchone()
+        if row is not None:
+            return int.from_bytes(row[0], 'big')
+        has_snapshots = self.db.execute(
+            'SELECT 1 FROM power WHERE token = ? AND power_type = ? AND holder = ? LIMIT 1', (token, power_type, holder)
+        ).fetchone()
+        if has_snapshots:
+            return 0
+        row = self.db.execute('SELECT amount FROM balance WHERE token = ? AND holder = ?', (token, holder)).fetchone()
+        return 0 if row is None else int.from_bytes(row[0], 'big')
+
+    def voting_power(self, holder, block, power_type=VOTING_POWER):
+        """`GovernanceStrategy.getVotingPowerAt()` (or `getPropositionPowerAt()`), the sum over both tokens."""
+        return sum(self.token_power(token, holder, block, power_type) for token in TOKENS)
+
+    def powers_at(self, block, power_type=VOTING_POWER):
+        """Power of every holder with non-zero power at `block`, as `{checksum address: power}`."""
+        powers = {}
+        for token in TOKENS:
+            # Latest snapshot at or before `block` per holder, the `power` primary key serves the scan
+            rows = self.db.execute(
+                'SELECT holder, amount, MAX(block) FROM power WHERE token = ? AND power_type = ? AND block <= ? '
+                'GROUP BY holder',
+                (token, power_type, block),
+            )
+            snapshotted = set()
+            for holder, amount, _ in rows:
+                snapshotted.add(holder)
+                powers[holder] = powers.get(holder, 0) + int.from_bytes(amount, 'big')
+            snapshotted.update(
+                holder for (holder,) in self.db.execute(
+                    'SELECT DISTINCT holder FROM power WHERE token = ? AND power_type = ?', (token, power_type)
+                )
+            )
+            for holder, amount in self.db.execute('SELECT holder, amount FROM balance WHERE token = ?', (token,)):
+                if holder not in snapshotted:
+                    powers[holder] = powers.get(holder, 0) + int.from_bytes(amount, 'big')
+        return {to_checksum_address(holder): power for holder, power in powers.items() if power > 0}
+
+    def top_holders(self, block, n, power_type=VOTING_POWER):
+        """The `n` holders with the most power at `block`, as `(address, power)` in decreasing order."""
+        return sorted(self.powers_at(block, power_type).items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def holders_reaching(self, block, target, power_type=VOTING_POWER, exclude=()):
+        """
+        The fewest holders whose summed power at `block` reaches `target` (e.g. a quorum of the total
+        voting supply), largest first. Raises `ValueError` if all holders together fall short.
+        """
+        exclude = {str(address).lower() for address in exclude}
+        chosen, total = [], 0
+        for holder, power in self.top_holders(block, None, power_type):
+            if total >= target:
+                break
+            if holder.lower() in exclude:
+                continue
+            chosen.append(holder)
+            total += power
+        if total < target:
+            raise ValueError(f"All indexed holders together have {total}, short of {target}")
+        return chosen
@@ -0,0 +1,218 @@
+import os
+from pathlib import Path
+
+import numpy as np
+from eth_utils import to_checksum_address
+
+from .matchers import fetch_proposal_states, fetch_proposals
+
+# Default location of the export of each network, see `scripts/export_proposals.py`
+PROPOSAL_EXPORT_DIR = Path(__file__).parent.parent.parent / 'proposal-export'
+
+# `AaveGovernanceV2.ProposalState` values a proposal never leaves: Canceled, Failed, Expired, Executed
+FINAL_STATES = (1, 3, 6, 7)
+
+# Columns with one row per proposal and their kind, in the order of `getProposalById()`
+_PROPOSAL_COLUMNS = [
+    ('id', 'int'),
+    ('creator', 'address'),
+    ('executor', 'address'),
+    ('startBlock', 'int'),
+    ('endBlock', 'int'),
+    ('executionTime', 'int'),
+    ('forVotes', 'uint256'),
+    ('againstVotes', 'uint256'),
+    ('executed', 'bool'),
+    ('canceled', 'bool'),
+    ('strategy', 'address'),
+    ('ipfsHash', 'bytes32'),
+    ('state', 'int'),
+]
+# Columns with one row per action, a proposal's actions are rows `actionOffsets[i]:actionOffsets[i + 1]`
+_ACTION_COLUMNS = [
+    ('targets', 'address'),
+    ('values', 'uint256'),
+    ('signatures', 'string'),
+    ('calldatas', 'bytes'),
+    ('withDelegatecalls', 'bool'),
+]
+_WIDTHS = {'uint256': 32, 'bytes32': 32}
+
+
+class ProposalRecord:
+    """
+    One proposal: the fields of `getProposalById()` and its `state`. Fields are attributes and, like
+    the dicts of `fetch_proposals()`, items.
+    """
+
+    __slots__ = (
+        'id', 'creator', 'executor', 'targets', 'values', 'signatures', 'calldatas', 'withDelegatecalls',
+        'startBlock', 'endBlock', 'executionTime', 'forVotes', 'againstVotes', 'executed', 'canceled',
+        'strategy', 'ipfsHash', 'state',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __eq__(self, other):
+        return isinstance(other, ProposalRecord) and all(self[name] == other[name] for name in self.__slots__)
+
+    def __repr__(self):
+        return f"ProposalRecord(id={self.id}, state={self.state})"
+
+
+def _encode(kind, values):
+    if kind == 'int':
+        return np.array(values, dtype=np.int64)
+    if kind == 'bool':
+        return np.array(values, dtype=bool)
+    if kind == 'address':
+        # Checksummed ASCII, checksumming is the costliest part of decoding
+        return np.array([to_checksum_address(str(value)).encode() for value in values], dtype='S42')
+    if kind == 'uint256':
+        values = [int(value).to_bytes(32, 'big') for value in values]
+    # Fixed width big-endian bytes, numpy's `S` type would drop trailing zero bytes
+    return np.frombuffer(b''.join(values), dtype=np.uint8).reshape(len(values), _WIDTHS[kind])
+
+
+def _decode(kind, column):
+    # Python values of a whole column
+    if kind in ('int', 'bool'):
+        return column.tolist()
+    if kind == 'address':
+        return column.astype(str).tolist()
+    width = _WIDTHS[kind]
+    data = column.tobytes()
+    values = [data[i : i + width] for i in range(0, len(data), width)]
+    if kind == 'uint256':
+        return [int.from_bytes(value, 'big') for value in values]
+    return values
+
+
+def _split(values, offsets):
+    return [values[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def _offsets(lengths):
+    return np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
+
+
+class ProposalTable:
+    """
+    Proposals of `AaveGovernanceV2` read at `block`, as columns saved to a NumPy `.npz` file.
+
+    Columns are fixed width arrays sorted by proposal id: int64 for ids, blocks and times, booleans,
+    checksummed ASCII addresses and big-endian bytes for uint256 amounts and hashes, so the file
+    loads without pickling. The actions of all proposals are concatenated, with `actionOffsets` delimiting each
+    proposal's rows, and strings and calldata are byte buffers delimited the same way.
+
+    `ProposalRecord`s are decoded on access, `table[proposal_id]` or by iterating in id order.
+    `export_proposals()` builds a table or brings one up to a later block.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.block = int(columns['block'])
+        self.ids = columns['id']
+        self._records = None
+
+    @classmethod
+    def from_proposals(cls, proposals, block):
+        """A table of `proposals`, dicts or records with the fields of `ProposalRecord`, read at `block`."""
+        proposals = sorted(proposals, key=lambda proposal: proposal['id'])
+        columns = {'block': np.array(block, dtype=np.int64)}
+        for name, kind in _PROPOSAL_COLUMNS:
+            columns[name] = _encode(kind, [proposal[name] for proposal in proposals])
+        columns['actionOffsets'] = _offsets([len(proposal['targets']) for proposal in proposals])
+        for name, kind in _ACTION_COLUMNS:
+            values = [value for proposal in proposals for value in proposal[name]]
+            if kind in ('string', 'bytes'):
+                values = [value.encode() if kind == 'string' else bytes(value) for value in values]
+                columns[name] = np.frombuffer(b''.join(values), dtype=np.uint8)
+                columns[f"{name}Offsets"] = _offsets([len(value) for value in values])
+            else:
+                columns[name] = _encode(kind, values)
+        return cls(columns)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def save(self, path):
+        """Writes the table to `path`, replacing the previous file only once written."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + '.partial')
+        with open(partial, 'wb') as f:
+            np.savez(f, **self.columns)
+        os.replace(partial, path)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __getitem__(self, proposal_id):
+        row = int(np.searchsorted(self.ids, proposal_id))
+        if row == len(self) or self.ids[row] != proposal_id:
+            raise KeyError(f"proposal {proposal_id} is not in the table")
+        return self.records()[row]
+
+    def records(self):
+        """Every `ProposalRecord` in id order, decoded column by column on first use."""
+        if self._records is None:
+            columns = self.columns
+            fields = {name: _decode(kind, columns[name]) for name, kind in _PROPOSAL_COLUMNS}
+            offsets = columns['actionOffsets'].tolist()
+            for name, kind in _ACTION_COLUMNS:
+                if kind in ('string', 'bytes'):
+                    values = _split(columns[name].tobytes(), columns[f"{name}Offsets"].tolist())
+                    values = [value.decode() for value in values] if kind == 'string' else values
+                else:
+                    values = _decode(kind, columns[name])
+                fields[name] = _split(values, offsets)
+            self._records = [ProposalRecord(**dict(zip(fields, row))) for row in zip(*fields.values())]
+        return self._records
+
+    def open_ids(self):
+        """Ids of the proposals whose state may still change."""
+        return self.ids[~np.isin(self.columns['state'], FINAL_STATES)].tolist()
+
+    def merge(self, other):
+        """A table with the proposals of both, those of `other` (read at a later block) replacing ours."""
+        if other.block < self.block:
+            raise ValueError(f"proposals read at block {other.block} are older than the table's block {self.block}")
+        proposals = {record.id: record for record in self}
+        proposals.update((record.id, record) for record in other)
+        return ProposalTable.from_proposals(proposals.values(), other.block)
+
+
+def export_proposals(web3, governance, table=None, block=None, batch_size=100):
+    """
+    The proposals of `governance` at `block` (default the latest), read `batch_size` proposals per
+    JSON-RPC batch request: one for the structs and one for the states.
+
+    Given the `table` of an earlier export, only proposals created since and those whose state could
+    still change are read, and merged into it.
+    """
+    block = web3.eth.block_number if block is None else block
+    count = governance.getProposalsCount(block_identifier=block)
+    ids = list(range(count))
+    if table is not None:
+        ids = table.open_ids() + list(range(int(table.ids.max()) + 1 if len(table) else 0, count))
+
+    proposals = []
+    for i in range(0, len(ids), batch_size):
+        chunk = ids[i : i + batch_size]
+        states = fetch_proposal_states(web3, governance, chunk, hex(block))
+        for proposal, state in zip(fetch_proposals(web3, governance, chunk, hex(block)), states):
+            proposals.append({**proposal, 'state': state})
+
+    exported = ProposalTable.from_proposals(proposals, block)
+    return exported if table is None else table.merge(exported)
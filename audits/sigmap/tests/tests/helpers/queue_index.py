@@ -0,0 +1,162 @@
+import sqlite3
+from collections import namedtuple
+from pathlib import Path
+
+from eth_utils import to_canonical_address, to_checksum_address
+
+from .logs import get_logs
+from .matchers import CancelledAction, ExecutedAction, QueuedAction, SPECS
+
+# Block `AaveGovernanceV2` and the short and long executors were deployed at
+GOVERNANCE_V2_BLOCK = 11_427_398
+
+QUEUED = 'queued'
+EXECUTED = 'executed'
+CANCELLED = 'cancelled'
+
+_STATES = {QueuedAction.name: QUEUED, ExecutedAction.name: EXECUTED, CancelledAction.name: CANCELLED}
+_TOPICS = [['0x' + spec.topic.hex() for spec in (QueuedAction, ExecutedAction, CancelledAction)]]
+
+# Indexed action: executor, action hash, `(target, value, signature, data, executionTime, withDelegatecall)`,
+# state, the time after which it can no longer be executed, and the blocks it was queued and last updated at
+IndexedAction = namedtuple(
+    'IndexedAction',
+    ['executor', 'action_hash', 'target', 'value', 'signature', 'data', 'execution_time', 'with_delegatecall',
+     'state', 'expires_at', 'queued_block', 'updated_block'],
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executor (address BLOB PRIMARY KEY, grace_period INTEGER NOT NULL, next_block INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS action (
+    executor BLOB, action_hash BLOB, target BLOB, value TEXT, signature TEXT, data BLOB, execution_time INTEGER,
+    with_delegatecall INTEGER, state TEXT, expires_at INTEGER, queued_block INTEGER, updated_block INTEGER,
+    PRIMARY KEY (executor, action_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS action_hash ON action (action_hash);
+CREATE INDEX IF NOT EXISTS action_execution_time ON action (execution_time);
+CREATE INDEX IF NOT EXISTS action_expiry ON action (state, expires_at);
+"""
+
+_COLUMNS = ', '.join(IndexedAction._fields)
+
+
+def _action(row):
+    action = IndexedAction(*row)
+    return action._replace(
+        executor=to_checksum_address(action.executor),
+        action_hash='0x' + action.action_hash.hex(),
+        target=to_checksum_address(action.target),
+        value=int(action.value),
+        with_delegatecall=bool(action.with_delegatecall),
+    )
+
+
+class QueueIndex:
+    """
+    Actions queued on executors, kept in SQLite from their `QueuedAction`, `ExecutedAction` and
+    `CancelledAction` logs.
+
+    Each action is one row keyed by executor and action hash, in the state of its latest event (a
+    cancelled action queued again is queued), with `expires_at = executionTime + GRACE_PERIOD`. An
+    index on `(state, expires_at)` serves the expiry queries with one range scan over the matching
+    rows, whatever the number of past actions, and lookups by hash or execution time are indexed.
+
+    `update()` reads logs in chunks and commits a per-executor cursor with each chunk, so it only
+    reads blocks it has not seen and an interrupted update resumes where it stopped. Executors are
+    registered with `add_executor()` before their first update.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def add_executor(self, executor, grace_period, start_block=GOVERNANCE_V2_BLOCK):
+        """Registers `executor` to be indexed from `start_block`, a registered executor keeps its cursor."""
+        with self.db:
+            self.db.execute(
+                'INSERT OR IGNORE INTO executor VALUES (?, ?, ?)',
+                (to_canonical_address(str(executor)), grace_period, start_block),
+            )
+
+    def executors(self):
+        """`{checksum address: (grace period, next block to index)}` of the registered executors."""
+        return {
+            to_checksum_address(address): (grace_period, next_block)
+            for address, grace_period, next_block in self.db.execute('SELECT * FROM executor')
+        }
+
+    def update(self, url, end_block, progress=None):
+        """Indexes the logs of every registered executor up to `end_block`, read from JSON-RPC `url`."""
+        for executor, (grace_period, start) in self.executors().items():
+            for first, last, logs in get_logs(url, executor, _TOPICS, start, end_block):
+                with self.db:
+                    self._apply(grace_period, logs)
+                    self.db.execute(
+                        'UPDATE executor SET next_block = ? WHERE address = ?',
+                        (last + 1, to_canonical_address(executor)),
+                    )
+                if progress is not None:
+                    progress(executor, first, last, len(logs))
+
+    def _apply(self, grace_period, logs):
+        for log in logs:
+            event = SPECS[bytes.fromhex(log['topics'][0][2:])].decode(log)
+            fields = event.fields
+            block = int(log['blockNumber'], 16)
+            key = (to_canonical_address(event.address), fields['actionHash'])
+            if event.name == QueuedAction.name:
+                self.db.execute(
+                    f'INSERT OR REPLACE INTO action ({_COLUMNS}) VALUES ({", ".join("?" * len(IndexedAction._fields))})',
+                    (
+                        *key,
+                        to_canonical_address(fields['target']),
+                        str(fields['value']),
+                        fields['signature'],
+                        fields['data'],
+                        fields['executionTime'],
+                        fields['withDelegatecall'],
+                        QUEUED,
+                        fields['executionTime'] + grace_period,
+                        block,
+                        block,
+                    ),
+                )
+            else:
+                self.db.execute(
+                    'UPDATE action SET state = ?, updated_block = ? WHERE executor = ? AND action_hash = ?',
+                    (_STATES[event.name], block, *key),
+                )
+
+    def get(self, action_hash, executor=None):
+        """The `IndexedAction`s with `action_hash`, on any executor or only on `executor`."""
+        query, params = f'SELECT {_COLUMNS} FROM action WHERE action_hash = ?', [bytes.fromhex(action_hash[2:])]
+        if executor is not None:
+            query, params = query + ' AND executor = ?', params + [to_canonical_address(str(executor))]
+        return [_action(row) for row in self.db.execute(query, params)]
+
+    def queued(self):
+        """Every queued action, by execution time then queuing block."""
+        return self._queued('', ())
+
+    def executable(self, now):
+        """Queued actions that can be executed at timestamp `now`, soonest to expire first."""
+        return self._queued('AND expires_at >= ? AND execution_time <= ?', (now, now), order='expires_at')
+
+    def expiring(self, now, within):
+        """Queued actions that expire in `[now, now + within]`, executable or not, soonest first."""
+        return self._queued('AND expires_at BETWEEN ? AND ?', (now, now + within), order='expires_at')
+
+    def expired(self, now):
+        """Actions still queued after their grace period, they can only be cancelled."""
+        return self._queued('AND expires_at < ?', (now,), order='expires_at')
+
+    def _queued(self, condition, params, order='execution_time'):
+        rows = self.db.execute(
+            f'SELECT {_COLUMNS} FROM action WHERE state = ? {condition} ORDER BY {order}, queued_block', (QUEUED, *params)
+        )
+        return [_action(row) for row in rows]
@@ -0,0 +1,176 @@
+import weakref
+from collections import OrderedDict
+
+from brownie import web3
+from brownie.network.contract import ContractCall
+
+# JSON-RPC methods that never change the chain, any other request may mine, move the clock or write state
+READ_METHODS = frozenset({
+    'eth_accounts', 'eth_blockNumber', 'eth_call', 'eth_chainId', 'eth_coinbase', 'eth_estimateGas',
+    'eth_feeHistory', 'eth_gasPrice', 'eth_maxPriorityFeePerGas', 'eth_mining', 'eth_newBlockFilter',
+    'eth_newFilter', 'eth_protocolVersion', 'eth_syncing', 'eth_uninstallFilter', 'evm_snapshot',
+})
+READ_PREFIXES = ('eth_get', 'net_', 'web3_', 'debug_', 'trace_')
+
+# Caches notified of the requests of brownie's provider
+_CACHES = weakref.WeakSet()
+
+
+def _is_read(method):
+    return method in READ_METHODS or method.startswith(READ_PREFIXES)
+
+
+def _is_revert(method):
+    # `evm_revert` of ganache and the other nodes, `hardhat_reset` / `anvil_reset` return to the fork block
+    return method == 'evm_revert' or method.endswith('_reset')
+
+
+def _hook(provider):
+    # Wraps `make_request()` of the provider, through which web3's middlewares and brownie's own
+    # `evm_*` requests (`chain.mine()`, `chain.revert()`, `ChainWarp`) all go. Brownie creates a new
+    # provider on every connect.
+    if getattr(provider, '_read_cache_hooked', False):
+        return
+    make_request = provider.make_request
+
+    def observed(method, params):
+        response = make_request(method, params)
+        if not _is_read(method):
+            for cache in list(_CACHES):
+                cache._changed(method, make_request)
+        return response
+
+    provider.make_request = observed
+    provider._read_cache_hooked = True
+    # The provider keeps its middlewares combined with the `make_request()` they were built with
+    provider._request_func_cache = (None, None)
+
+
+class ReadCache:
+    """
+    Read-through cache of view calls of brownie contracts, keyed by contract, sender, call data and
+    block number, with at most `maxsize` results evicted least recently used first.
+
+    `wrap(contract)` returns the contract with its view methods (`ContractCall`) reading through the
+    cache, `wrap(aave_governance_v2).getProposalState(1)`. Calls at the latest block are keyed by its
+    number, read once per block with `eth_blockNumber`. Overloaded methods, transactions and other
+    attributes are passed through.
+
+    Every request of brownie's provider is observed. After any request other than a read (a sent
+    transaction, `evm_mine`, `evm_increaseTime`, `hardhat_setStorageAt`, ...) results of the latest
+    block are dropped and the latest block is read again. After `evm_revert` or a reset, results of
+    the blocks from the new latest block on are dropped: blocks past it are mined again with other
+    state. Results of older blocks are kept, they cannot change. Calls sent with `rpc_batch()`
+    bypass the provider, they must not change state.
+
+    `hits`, `misses`, `evictions` and `invalidations` (results dropped by state changes) count since
+    creation, `hit_rate()` is the share of calls answered from the cache.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._results = OrderedDict()
+        # Number of the latest block while no state changed since it was read, and the highest
+        # latest block read, below the latest block whatever was mined since
+        self._height = None
+        self._head = 0
+        self._provider = None
+        _CACHES.add(self)
+
+    def __len__(self):
+        return len(self._results)
+
+    def wrap(self, contract):
+        """`contract` with its view methods reading through the cache."""
+        return CachedContract(contract, self)
+
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def clear(self):
+        self.invalidations += len(self._results)
+        self._results.clear()
+        self._height = None
+        self._head = 0
+
+    def call(self, method, *args, block_identifier=None):
+        """The result of `method(*args)`, a brownie `ContractCall`, at `block_identifier` (default the latest block)."""
+        self._connect()
+        latest = block_identifier in (None, 'latest')
+        if latest:
+            if self._height is None:
+                self._height = self._head = web3.eth.block_number
+            block = self._height
+        elif isinstance(block_identifier, int):
+            block = block_identifier
+        else:
+            # Block hashes and other tags are not cached
+            return method.call(*args, block_identifier=block_identifier)
+
+        call_args, sender = args, None
+        if args and isinstance(args[-1], dict):
+            call_args, sender = args[:-1], args[-1].get('from')
+        # The latest block may be read at the time of the node's clock rather than of the block
+        key = (str(method._address), sender if sender is None else str(sender), method.encode_input(*call_args), block, latest)
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        self.misses += 1
+        result = method.call(*args, block_identifier=block_identifier)
+        self._results[key] = result
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def _connect(self):
+        # Results read through an earlier connection may be of another chain
+        provider = web3.provider
+        if provider is not self._provider:
+            self.clear()
+            self._provider = provider
+        _hook(provider)
+
+    def _changed(self, method, make_request):
+        # Called after a request that may have changed state, with the provider's unwrapped `make_request`
+        if _is_revert(method):
+            height = make_request('eth_blockNumber', [])['result']
+            self._head = int(height, 16) if isinstance(height, str) else height
+        # Blocks before the latest one read cannot change until a revert, later ones may be the latest block
+        stale = [key for key in self._results if key[3] >= self._head]
+        for key in stale:
+            del self._results[key]
+        self.invalidations += len(stale)
+        self._height = None
+
+
+class CachedContract:
+    """A brownie contract whose view methods read through a `ReadCache`."""
+
+    def __init__(self, contract, cache):
+        self._contract = contract
+        self._cache = cache
+
+    def __getattr__(self, name):
+        attribute = getattr(self._contract, name)
+        if not isinstance(attribute, ContractCall):
+            return attribute
+        cache = self._cache
+
+        def cached(*args, block_identifier=None):
+            return cache.call(attribute, *args, block_identifier=block_identifier)
+
+        return cached
+
+    def __str__(self):
+        return str(self._contract)
+
+    def __repr__(self):
+        return f"<Cached {self._contract!r}>"
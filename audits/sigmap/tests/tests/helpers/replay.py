@@ -0,0 +1,225 @@
+import multiprocessing
+import time
+from collections import namedtuple
+from multiprocessing.util import Finalize
+
+import brownie
+from brownie import web3
+
+from .chain import ChainWarp
+from .checkpoints import Checkpoints
+from .lifecycle import mine_together
+from .matchers import decode_logs, fetch_proposals
+from .migration import DAY
+from .node_pool import configure_worker, free_port
+
+# Historical proposal: id, executor address and its `(target, value, signature, data, withDelegatecall)` actions
+HistoricalProposal = namedtuple('HistoricalProposal', ['id', 'executor', 'actions'])
+
+# Outcome of one `executeTransaction()`: status, `resultData` of `ExecutedAction`, raw logs and gas
+ActionOutcome = namedtuple('ActionOutcome', ['status', 'result', 'logs', 'gas_used'])
+
+# Comparison of a proposal executed by an old executor and by the new `Executor` at its address
+ReplayResult = namedtuple('ReplayResult', ['id', 'executor', 'differences', 'gas_delta', 'seconds'])
+
+# Gas of each replayed `executeTransaction()`, mined alone in its block
+EXECUTE_GAS = 10_000_000
+QUEUE_GAS = 200_000
+
+# Storage slots of the new `Executor` up to `MINIMUM_QUORUM`, slots 0-2 match `ExecutorWithTimelock`
+EXECUTOR_SLOTS = range(7)
+
+_STATE_METHODS = {
+    'hardhat': ('hardhat_setCode', 'hardhat_setStorageAt', 'hardhat_setBalance'),
+    'anvil': ('anvil_setCode', 'anvil_setStorageAt', 'anvil_setBalance'),
+    'ganache': ('evm_setAccountCode', 'evm_setAccountStorageAt', 'evm_setAccountBalance'),
+}
+
+
+def historical_proposals(governance, executors, executed_only=True):
+    """Proposals of `governance` on `executors` (addresses), read in one batch request."""
+    executors = {str(executor).lower() for executor in executors}
+    proposals = fetch_proposals(web3, governance, range(governance.getProposalsCount()))
+    return [
+        HistoricalProposal(
+            p['id'],
+            p['executor'],
+            list(zip(p['targets'], p['values'], p['signatures'], p['calldatas'], p['withDelegatecalls'])),
+        )
+        for p in proposals
+        if p['executor'].lower() in executors and (p['executed'] or not executed_only)
+    ]
+
+
+def can_replace_code():
+    """Whether the connected node can replace contract code and storage (ganache v7, hardhat, anvil)."""
+    methods = _client_state_methods()
+    if methods is None:
+        return False
+    # Setting the empty code of the zero address again changes nothing, ganache before v7 lacks the method
+    response = web3.provider.make_request(methods[0], [brownie.ZERO_ADDRESS, '0x'])
+    return 'error' not in response
+
+
+def _client_state_methods():
+    client = web3.clientVersion.lower()
+    for prefix, methods in _STATE_METHODS.items():
+        if client.startswith(prefix):
+            return methods
+    return None
+
+
+def _state_methods():
+    methods = _client_state_methods()
+    if methods is None:
+        raise RuntimeError(f"'{web3.clientVersion}' cannot replace contract code, use ganache v7, hardhat or anvil")
+    return methods
+
+
+def _request(method, params):
+    response = web3.provider.make_request(method, params)
+    if 'error' in response:
+        raise RuntimeError(f"{method} failed: {response['error']['message']}")
+    return response['result']
+
+
+class ProposalReplay:
+    """
+    Replays historical proposals through an old executor and through the new `Executor`.
+
+    The new `Executor` is `SrcExecutor`, `src/contracts/Executor.sol` built in the brownie project
+    under that name (`contracts/src/SrcExecutor.sol`), so the replayed code is the code of `src`.
+
+    For every old executor a new `Executor` with the same parameters is deployed once, its runtime
+    code and storage (admin, delay and the validator parameters, which the old executor keeps in
+    immutables) are then installed at the old executor's address, so actions run with the
+    permissions they had. Both runs start from the same snapshot, queue every action from
+    governance in one block and execute each in its own block at the same timestamps, then the
+    status, return data and logs of each `executeTransaction()` are compared. Revert messages are
+    not, they would need a trace of every transaction.
+
+    Governance, the executors' admin, is given a large ETH balance to send the actions' values.
+    """
+
+    def __init__(self, governance, old_executors, Executor, deployer, warp):
+        self.governance = governance
+        self.warp = warp
+        self.chain = warp.chain
+        self.set_code, self.set_storage, self.set_balance = _state_methods()
+
+        self.templates = {}
+        for old in old_executors:
+            new = deployer.deploy(
+                Executor,
+                old.getAdmin(),
+                old.getDelay(),
+                old.GRACE_PERIOD(),
+                old.MINIMUM_DELAY(),
+                old.MAXIMUM_DELAY(),
+                old.PROPOSITION_THRESHOLD(),
+                old.VOTING_DURATION(),
+                old.VOTE_DIFFERENTIAL(),
+                old.MINIMUM_QUORUM(),
+            )
+            storage = [web3.eth.get_storage_at(new.address, slot) for slot in EXECUTOR_SLOTS]
+            self.templates[old.address] = (old, web3.eth.get_code(new.address), storage)
+
+        _request(self.set_balance, [str(governance), hex(10 ** 30)])
+        self.queue_time = self.chain.time() + DAY
+        self.checkpoints = Checkpoints(self.chain, [])
+
+    def replay(self, proposal):
+        """Returns the `ReplayResult` of a `HistoricalProposal`, the chain is back at the snapshot."""
+        start = time.perf_counter()
+        old = self.run(proposal, new_executor=False)
+        new = self.run(proposal, new_executor=True)
+        differences = [
+            f"action {i} {field}: old {getattr(a, field)!r}, new {getattr(b, field)!r}"
+            for i, (a, b) in enumerate(zip(old, new))
+            for field in ('status', 'result', 'logs')
+            if getattr(a, field) != getattr(b, field)
+        ]
+        gas_delta = sum(b.gas_used - a.gas_used for a, b in zip(old, new))
+        return ReplayResult(proposal.id, proposal.executor, differences, gas_delta, time.perf_counter() - start)
+
+    def run(self, proposal, new_executor):
+        """`ActionOutcome`s of the proposal's actions on the old or new executor code."""
+        self.checkpoints.reset()
+        # Both versions share the `queueTransaction()` / `executeTransaction()` ABI
+        executor, code, storage = self.templates[proposal.executor]
+        if new_executor:
+            _request(self.set_code, [proposal.executor, '0x' + bytes(code).hex()])
+            for slot, value in zip(EXECUTOR_SLOTS, storage):
+                position = '0x' + slot.to_bytes(32, 'big').hex() if self.set_code.startswith('evm') else hex(slot)
+                _request(self.set_storage, [proposal.executor, position, '0x' + bytes(value).hex()])
+
+        admin = {'from': str(self.governance)}
+        execution_time = self.queue_time + executor.getDelay()
+        mine_together(self.warp, [
+            (executor.queueTransaction, (*action[:4], execution_time, action[4]), {**admin, 'gas_limit': QUEUE_GAS})
+            for action in proposal.actions
+        ], timestamp=self.queue_time)
+
+        outcomes = []
+        for i, action in enumerate(proposal.actions):
+            tx = {**admin, 'gas_limit': EXECUTE_GAS, 'value': action[1]}
+            (receipt,) = mine_together(
+                self.warp,
+                [(executor.executeTransaction, (*action[:4], execution_time, action[4]), tx)],
+                timestamp=execution_time + i,
+            )
+            executed = [event for event in decode_logs(receipt.logs) if event.name == 'ExecutedAction']
+            outcomes.append(ActionOutcome(
+                receipt.status,
+                executed[0].fields['resultData'] if executed else None,
+                [(log['address'], [bytes(t).hex() for t in log['topics']], log['data']) for log in receipt.logs],
+                receipt.gas_used,
+            ))
+        self.checkpoints.reset()
+        return outcomes
+
+
+# Replay of the current pool worker, set by `_init_worker()`
+_replay = None
+
+
+def _init_worker(project_path, network, upstream_cache, governance, old_executors):
+    global _replay
+    project = brownie.project.load(project_path)
+    configure_worker({'fork_port': free_port(), 'upstream_cache': upstream_cache}, network)
+    brownie.network.connect(network)
+    # Pool workers exit without `atexit` handlers, stop the worker's fork node explicitly
+    Finalize(None, brownie.network.disconnect, exitpriority=10)
+    _replay = ProposalReplay(
+        project.AaveGovernanceV2.at(governance),
+        [project.OldExecutor.at(address) for address in old_executors],
+        project.SrcExecutor,
+        brownie.accounts[0],
+        ChainWarp(brownie.chain),
+    )
+
+
+def _replay_one(proposal):
+    return _replay.replay(proposal)
+
+
+def replay_parallel(proposals, project_path, network, upstream_cache, governance, old_executors, workers):
+    """
+    Replays `proposals` on a pool of `workers` processes, each with its own fork node of `network`
+    reading upstream state through the shared `upstream_cache` server. Yields `ReplayResult`s as
+    they complete.
+    """
+    context = multiprocessing.get_context('spawn')
+    pool = context.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(str(project_path), network, upstream_cache, str(governance), [str(e) for e in old_executors]),
+    )
+    try:
+        yield from pool.imap_unordered(_replay_one, proposals)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
@@ -0,0 +1,36 @@
+import json
+import time
+import urllib.request
+
+# Called with `(method, seconds, request bytes, response bytes)` after each `rpc_batch()` request,
+# which does not go through web3's middlewares (see `rpc_profile.py`)
+BATCH_OBSERVERS = []
+
+
+def rpc_call(url, method, params=()):
+    """Sends one JSON-RPC request to `url`, returns its result or raises `RuntimeError` on an error."""
+    body = {"jsonrpc": "2.0", "id": 0, "method": method, "params": list(params)}
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response = json.load(response)
+    if "error" in response:
+        raise RuntimeError(f"{method} failed: {response['error']}")
+    return response["result"]
+
+
+def rpc_batch(web3, requests):
+    """
+    Sends JSON-RPC `requests` (dicts with `method` and `params`) to the node of `web3` as one batch
+    request, returning the `result` of each, or its `error` dict.
+    """
+    body = [{"jsonrpc": "2.0", "id": i, "method": r["method"], "params": r["params"]} for i, r in enumerate(requests)]
+    data = json.dumps(body).encode()
+    request = urllib.request.Request(web3.provider.endpoint_uri, data=data, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        raw = response.read()
+    for observer in BATCH_OBSERVERS:
+        methods = sorted({r["method"] for r in requests})
+        observer(f"batch({','.join(methods)})", time.perf_counter() - start, len(data), len(raw))
+    responses = sorted(json.loads(raw), key=lambda response: response["id"])
+    return [response["result"] if "result" in response else response["error"] for response in responses]
@@ -0,0 +1,139 @@
+import gzip
+import json
+import os
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from brownie._config import CONFIG
+
+
+class RpcArchive:
+    """
+    Upstream JSON-RPC results keyed by method and params, stored as a gzipped JSON object.
+
+    A fork node only reads upstream state at its fork block, so responses, `null` ones included
+    (e.g. the receipt of an unknown transaction), are immutable and can be replayed indefinitely.
+    Without a `path` the archive is only kept in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = None if path is None else Path(path)
+        self.results = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            with gzip.open(self.path, "rt") as fp:
+                self.results = json.load(fp)
+
+    @staticmethod
+    def key(method, params):
+        return json.dumps([method, params], separators=(",", ":"), sort_keys=True)
+
+    def __contains__(self, request):
+        method, params = request
+        return self.key(method, params) in self.results
+
+    def get(self, method, params):
+        return self.results.get(self.key(method, params))
+
+    def put(self, method, params, result):
+        with self._lock:
+            self.results[self.key(method, params)] = result
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt", compresslevel=9) as fp:
+            json.dump(self.results, fp, separators=(",", ":"), sort_keys=True)
+
+
+class RpcCacheServer:
+    """
+    Local stand-in for the upstream provider of a fork node.
+
+    Requests are answered from `archive`. Misses are forwarded to `upstream` and recorded when it
+    is given (record mode), otherwise they return a JSON-RPC error (replay mode, fully offline).
+    """
+
+    def __init__(self, archive, upstream=None, host="127.0.0.1", port=0):
+        self.archive = archive
+        self.upstream = upstream
+        self.hits = 0
+        self.misses = 0
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, request):
+        method, params = request["method"], request.get("params", [])
+        if (method, params) in self.archive:
+            self.hits += 1
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": self.archive.get(method, params)}
+
+        self.misses += 1
+        if self.upstream is None:
+            message = f"{method} {json.dumps(params)} is not in the RPC archive, record it first"
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32000, "message": message}}
+
+        response = self._forward(request)
+        # Only successful results are archived, `null` included, errors (e.g. rate limits) may be transient
+        if "result" in response:
+            self.archive.put(method, params, response["result"])
+        return response
+
+    def _forward(self, request):
+        upstream_request = urllib.request.Request(
+            self.upstream,
+            data=json.dumps(request).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(upstream_request, timeout=60) as response:
+            return json.load(response)
+
+
+def _handler(cache_server):
+    class RpcCacheHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if isinstance(body, list):
+                response = [cache_server.handle(request) for request in body]
+            else:
+                response = cache_server.handle(body)
+
+            data = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RpcCacheHandler
+
+
+def route_fork(network, url):
+    """
+    Points the `fork` setting of brownie `network` at `url`, keeping the fork block.
+
+    Returns the previous upstream url (without the `@block` suffix).
+    """
+    cmd_settings = CONFIG.networks[network]["cmd_settings"]
+    upstream, _, block = os.path.expandvars(cmd_settings["fork"]).rpartition("@")
+    if not upstream or not block.isdigit():
+        raise ValueError(f"Network '{network}' must fork at a fixed block, got '{cmd_settings['fork']}'")
+    cmd_settings["fork"] = f"{url}@{block}"
+    return upstream
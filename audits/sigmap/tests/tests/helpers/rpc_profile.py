@@ -0,0 +1,130 @@
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+from brownie import web3
+
+from . import rpc
+
+
+class RpcProfiler:
+    """
+    Pytest plugin recording the JSON-RPC traffic of each test phase and fixture.
+
+    A web3 middleware on brownie's provider, and an observer of `rpc_batch()` which bypasses it,
+    count the calls, latency and request/response bytes per method. They are attributed to the
+    innermost active scope: `fixture <name>` while a fixture is set up, otherwise `<test id>
+    (setup|call|teardown)`, so a fixture's cost is summed over every test that set it up. The wall
+    time of each scope is kept too (a fixture's includes the fixtures it requests), the difference
+    with its RPC time is spent in Python, e.g. decoding events.
+
+    `save(path)` writes the profile as JSON, `report()` lists the scopes by RPC time.
+    """
+
+    def __init__(self):
+        self.name = f"rpc_profile_{id(self)}"
+        self.scopes = ["session"]
+        self.methods = defaultdict(lambda: defaultdict(lambda: [0, 0.0, 0, 0]))
+        self.wall = defaultdict(float)
+
+    def record(self, method, seconds, sent, received):
+        stats = self.methods[self.scopes[-1]][method]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] += sent
+        stats[3] += received
+
+    def middleware(self, make_request, w3):
+        def profiled(method, params):
+            start = time.perf_counter()
+            response = make_request(method, params)
+            seconds = time.perf_counter() - start
+            self.record(method, seconds, len(json.dumps(params, default=str)), len(json.dumps(response, default=str)))
+            return response
+
+        return profiled
+
+    def install(self):
+        """Adds the middleware to brownie's web3 if missing, brownie replaces middlewares on every connect."""
+        if self.record not in rpc.BATCH_OBSERVERS:
+            rpc.BATCH_OBSERVERS.append(self.record)
+        if web3.isConnected() and self.name not in web3.middleware_onion:
+            web3.middleware_onion.add(self.middleware, self.name)
+
+    def uninstall(self):
+        if self.record in rpc.BATCH_OBSERVERS:
+            rpc.BATCH_OBSERVERS.remove(self.record)
+        if self.name in web3.middleware_onion:
+            web3.middleware_onion.remove(self.name)
+
+    def _scope(self, name):
+        self.scopes.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.wall[name] += time.perf_counter() - start
+            self.scopes.pop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        self.install()
+        yield from self._scope(f"fixture {fixturedef.argname}")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self.install()
+        yield from self._scope(f"{item.nodeid} (setup)")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._scope(f"{item.nodeid} (call)")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._scope(f"{item.nodeid} (teardown)")
+
+    def pytest_sessionfinish(self, session):
+        self.uninstall()
+
+    def profile(self):
+        """`{scope: {'wall': seconds, 'methods': {method: {calls, seconds, sent, received}}}}`."""
+        return {
+            scope: {
+                "wall": round(self.wall.get(scope, 0.0), 6),
+                "methods": {
+                    method: dict(zip(("calls", "seconds", "sent", "received"), (calls, round(seconds, 6), sent, received)))
+                    for method, (calls, seconds, sent, received) in sorted(methods.items())
+                },
+            }
+            for scope, methods in self.methods.items()
+        }
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.profile(), indent=1) + "\n")
+
+    def report(self, top=20):
+        """Lines of the `top` scopes by RPC time, with their three slowest methods, then totals per method."""
+        totals = {
+            scope: (sum(s[0] for s in methods.values()), sum(s[1] for s in methods.values()))
+            for scope, methods in self.methods.items()
+        }
+        lines = [f"{'scope':<72}{'calls':>7}{'rpc (s)':>9}{'wall (s)':>9}  slowest methods"]
+        for scope, (calls, seconds) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:top]:
+            slowest = sorted(self.methods[scope].items(), key=lambda item: item[1][1], reverse=True)[:3]
+            methods = ", ".join(f"{method} {stats[0]}x {stats[1]:.2f}s" for method, stats in slowest)
+            wall = f"{self.wall[scope]:.2f}" if scope in self.wall else ""
+            lines.append(f"{scope[-72:]:<72}{calls:>7}{seconds:>9.2f}{wall:>9}  {methods}")
+
+        by_method = defaultdict(lambda: [0, 0.0, 0, 0])
+        for methods in self.methods.values():
+            for method, stats in methods.items():
+                by_method[method] = [a + b for a, b in zip(by_method[method], stats)]
+        lines += ["", f"{'method':<40}{'calls':>9}{'seconds':>10}{'sent (kB)':>11}{'received (kB)':>15}"]
+        for method, (calls, seconds, sent, received) in sorted(by_method.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{method:<40}{calls:>9}{seconds:>10.2f}{sent / 1000:>11.1f}{received / 1000:>15.1f}")
+        return lines
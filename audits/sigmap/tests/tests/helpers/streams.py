@@ -0,0 +1,174 @@
+import numpy as np
+from eth_abi import decode_abi
+from eth_utils import keccak, to_checksum_address
+
+from .rpc import rpc_batch
+
+# Amounts are held as little-endian base 2**32 limbs in uint64, so a limb times a stream duration
+# (below 2**32 seconds) plus a carry still fits in 64 bits. Limbs are the first axis, each limb of
+# a whole array is contiguous.
+LIMB_BITS = 32
+_LIMB = np.uint64(LIMB_BITS)
+_MASK = np.uint64(2 ** LIMB_BITS - 1)
+
+GET_STREAM = keccak(text='getStream(uint256)')[:4]
+# `getStream()` outputs: sender, recipient, deposit, token, startTime, stopTime, remainingBalance, ratePerSecond
+_STREAM = ['address', 'address', 'uint256', 'address', 'uint256', 'uint256', 'uint256', 'uint256']
+
+
+def to_limbs(values, width):
+    """`width` limbs of each non-negative integer in `values`, as a `(width, len(values))` array."""
+    limbs = np.zeros((width, len(values)), dtype=np.uint64)
+    for i, value in enumerate(values):
+        if value >> (LIMB_BITS * width):
+            raise OverflowError(f"{value} does not fit in {width} limbs")
+        for j in range(width):
+            limbs[j, i] = (value >> (LIMB_BITS * j)) & (2 ** LIMB_BITS - 1)
+    return limbs
+
+
+def _carry(limbs):
+    # Every limb below 2**64 - 2**32, e.g. a product of two limbs, leaves each limb below 2**32
+    for j in range(len(limbs) - 1):
+        limbs[j + 1] += limbs[j] >> _LIMB
+        limbs[j] &= _MASK
+    if (limbs[-1] >> _LIMB).any():
+        raise OverflowError("amount exceeds the limb width")
+    return limbs
+
+
+def _extend(limbs, width):
+    return np.concatenate([limbs, np.zeros((width - len(limbs),) + limbs.shape[1:], dtype=np.uint64)])
+
+
+class Amounts:
+    """
+    An array of exact uint256 amounts as base 2**32 limbs (first axis of `limbs`), with the entries
+    whose computation reverts in the contract (checked arithmetic underflow) flagged in `reverted`.
+    """
+
+    def __init__(self, limbs, reverted=None):
+        self.limbs = limbs
+        self.reverted = np.zeros(limbs.shape[1:], dtype=bool) if reverted is None else reverted
+
+    @property
+    def shape(self):
+        return self.limbs.shape[1:]
+
+    def __sub__(self, other):
+        """Limb-wise subtraction with borrows, entries below zero are `reverted` and set to 0."""
+        # Limbs are below 2**32, viewing them as int64 avoids copies
+        limbs = self.limbs.view(np.int64) - other.limbs.view(np.int64)
+        for j in range(len(limbs) - 1):
+            borrow = limbs[j] < 0
+            limbs[j] += borrow.astype(np.int64) << LIMB_BITS
+            limbs[j + 1] -= borrow
+        negative = limbs[-1] < 0
+        limbs[:, negative] = 0
+        return Amounts(limbs.view(np.uint64), self.reverted | other.reverted | negative)
+
+    def sum(self, axis):
+        """Exact sum along `axis` of the amounts, reverted entries count as 0."""
+        limbs = np.where(self.reverted, np.uint64(0), self.limbs)
+        # One more limb for the carries of up to 2**32 summed amounts
+        limbs = _extend(limbs, len(limbs) + 1)
+        return Amounts(_carry(limbs.sum(axis=axis % len(self.shape) + 1)))
+
+    def to_ints(self):
+        """Python integers as an object array, `None` where the contract reverts."""
+        limbs = _extend(self.limbs, len(self.limbs) + len(self.limbs) % 2)
+        # Pairs of limbs as 64 bit words halve the Python integer operations
+        words = limbs[0::2] | (limbs[1::2] << _LIMB)
+        values = np.zeros(self.shape, dtype=object)
+        for word in words[::-1]:
+            values = (values << 64) | word.astype(object)
+        values[self.reverted] = None
+        return values
+
+    def to_float(self):
+        """Approximate amounts for plotting and forecasts, NaN where the contract reverts."""
+        values = sum(limb * 2.0 ** (LIMB_BITS * j) for j, limb in enumerate(self.limbs))
+        return np.where(self.reverted, np.nan, values)
+
+
+class StreamBook:
+    """
+    Streams of `AaveEcosystemReserveV2` as columns, with `deltaOf()` and `balanceOf()` evaluated for
+    every stream over a whole grid of timestamps at once.
+
+    Amounts keep the contract's uint256 integer semantics exactly through `Amounts`, e.g.
+    `balanceOf(recipient) = deltaOf * ratePerSecond - (deposit - remainingBalance)` reverts rather
+    than going negative. Balances are those of the streams' current state (`remainingBalance` after
+    the withdrawals so far) at any timestamp, as `balanceOf()` would return them with no further
+    withdrawal. Results are indexed by `[time, stream]`.
+    """
+
+    def __init__(self, ids, senders, recipients, deposits, rates, remaining, start_times, stop_times):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.senders = np.array([to_checksum_address(str(a)) for a in senders], dtype=object)
+        self.recipients = np.array([to_checksum_address(str(a)) for a in recipients], dtype=object)
+        self.start_times = np.asarray(start_times, dtype=np.int64)
+        self.stop_times = np.asarray(stop_times, dtype=np.int64)
+        if (self.stop_times >= 2 ** LIMB_BITS).any():
+            raise OverflowError("stream times must fit in 32 bits")
+
+        deposits, rates, remaining = list(deposits), list(rates), list(remaining)
+        width = (max([0, *deposits, *rates, *remaining]).bit_length() + LIMB_BITS) // LIMB_BITS + 1
+        self.rates = to_limbs(rates, width)
+        self.remaining = to_limbs(remaining, width)
+        # `deposit - remainingBalance` if there were withdrawals, the deposit is not needed otherwise
+        self.withdrawn = to_limbs([max(d - r, 0) for d, r in zip(deposits, remaining)], width)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, web3, reserve, ids, block='latest'):
+        """
+        Reads `getStream()` of `ids` from `reserve` in one batch request, ids without a stream (never
+        created or fully withdrawn) are skipped.
+        """
+        requests = [
+            {
+                'method': 'eth_call',
+                'params': [{'to': str(reserve), 'data': '0x' + (GET_STREAM + int(i).to_bytes(32, 'big')).hex()}, block],
+            }
+            for i in ids
+        ]
+        columns = {name: [] for name in ('ids', 'senders', 'recipients', 'deposits', 'rates', 'remaining', 'start_times', 'stop_times')}
+        for i, response in zip(ids, rpc_batch(web3, requests)):
+            if not isinstance(response, str):
+                continue
+            sender, recipient, deposit, _, start, stop, remaining, rate = decode_abi(_STREAM, bytes.fromhex(response[2:]))
+            for name, value in zip(columns, (i, sender, recipient, deposit, rate, remaining, start, stop)):
+                columns[name].append(value)
+        return cls(**columns)
+
+    def deltas(self, times):
+        """`deltaOf()` indexed by `[time, stream]`."""
+        times = np.asarray(times, dtype=np.int64)[:, None]
+        return np.clip(times - self.start_times[None, :], 0, (self.stop_times - self.start_times)[None, :])
+
+    def recipient_balances(self, times):
+        """`balanceOf(id, recipient)` as `Amounts` indexed by `[time, stream]`."""
+        streamed = _carry(self.deltas(times).astype(np.uint64)[None, :, :] * self.rates[:, None, :])
+        return Amounts(streamed) - Amounts(self.withdrawn[:, None, :])
+
+    def sender_balances(self, times):
+        """`balanceOf(id, sender)` as `Amounts` indexed by `[time, stream]`."""
+        recipient = self.recipient_balances(times)
+        return Amounts(self.remaining[:, None, :]) - recipient
+
+    def balance_of(self, times, who):
+        """`balanceOf(id, who)` of every stream, 0 for streams `who` neither sends nor receives."""
+        who = to_checksum_address(str(who))
+        recipient, sender = self.recipient_balances(times), self.sender_balances(times)
+        is_recipient = (self.recipients == who)[None, :]
+        is_sender = (self.senders == who)[None, :]
+        limbs = np.where(is_recipient, recipient.limbs, np.where(is_sender, sender.limbs, np.uint64(0)))
+        reverted = recipient.reverted | (sender.reverted & is_sender)
+        return Amounts(limbs, reverted)
+
+    def outflows(self, times):
+        """Total `balanceOf()` of all recipients at each time, exact `Amounts` indexed by `[time]`."""
+        return self.recipient_balances(times).sum(axis=1)
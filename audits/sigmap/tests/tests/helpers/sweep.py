@@ -0,0 +1,199 @@
+import numpy as np
+from brownie import web3
+
+from .matchers import fetch_proposals
+
+ONE_HUNDRED_WITH_PRECISION = 10_000
+
+# Bound stored when every percentage passes (e.g. zero supply), parameters never exceed 10_000
+_ALWAYS = np.iinfo(np.int64).max
+
+
+def max_percentage(power, supply):
+    """
+    Largest percentage `p` with `power >= supply * p / ONE_HUNDRED_WITH_PRECISION` under solidity
+    integer division, i.e. `supply * p <= (power + 1) * ONE_HUNDRED_WITH_PRECISION - 1`.
+
+    `isQuorumValid()` holds iff `MINIMUM_QUORUM <= max_percentage(forVotes, votingSupply)` and
+    `isPropositionPowerEnough()` iff `PROPOSITION_THRESHOLD <= max_percentage(power, supply)`.
+    """
+    if supply == 0:
+        return _ALWAYS
+    return min(((power + 1) * ONE_HUNDRED_WITH_PRECISION - 1) // supply, _ALWAYS)
+
+
+def vote_margin(for_votes, against_votes, voting_supply):
+    """
+    `forVotes * 10_000 / votingSupply - againstVotes * 10_000 / votingSupply`, each share rounded
+    down separately as in `isVoteDifferentialValid()`, which holds iff `VOTE_DIFFERENTIAL < margin`.
+    """
+    if voting_supply == 0:
+        raise ValueError("`isVoteDifferentialValid()` divides by zero for an empty voting supply")
+    for_share = for_votes * ONE_HUNDRED_WITH_PRECISION // voting_supply
+    against_share = against_votes * ONE_HUNDRED_WITH_PRECISION // voting_supply
+    return for_share - against_share
+
+
+class ProposalVotes:
+    """
+    Votes of a set of proposals, reduced once per proposal to exact integer bounds.
+
+    Every rule of `Executor` compares votes with `supply * parameter / ONE_HUNDRED_WITH_PRECISION`.
+    The uint256 amounts are reduced with Python integers to the largest passing quorum and proposition
+    threshold and to the vote margin, so parameter grids are evaluated with int64 comparisons while
+    keeping the contract's integer division semantics exactly.
+
+    `params` holds the `(PROPOSITION_THRESHOLD, VOTE_DIFFERENTIAL, MINIMUM_QUORUM)` of the executor each
+    proposal was created on and gives the baseline outcome.
+    """
+
+    def __init__(self, ids, for_votes, against_votes, voting_supplies, params, creator_powers=None, proposition_supplies=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.params = np.asarray(params, dtype=np.int64).reshape(len(self.ids), 3)
+        self.max_quorum = np.array([max_percentage(*v) for v in zip(for_votes, voting_supplies)], dtype=np.int64)
+        self.margin = np.array(
+            [vote_margin(*v) for v in zip(for_votes, against_votes, voting_supplies)], dtype=np.int64
+        )
+        if creator_powers is None:
+            # Every proposal was created, so its creator met the threshold of the time
+            self.max_threshold = np.full(len(self.ids), _ALWAYS, dtype=np.int64)
+        else:
+            self.max_threshold = np.array(
+                [max_percentage(*v) for v in zip(creator_powers, proposition_supplies)], dtype=np.int64
+            )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def subset(self, mask):
+        """The proposals selected by boolean or index array `mask`."""
+        votes = object.__new__(ProposalVotes)
+        for name, column in vars(self).items():
+            setattr(votes, name, column[mask])
+        return votes
+
+    @classmethod
+    def load(cls, governance, strategy_at, executor_at, with_creators=False, include_canceled=False, proposals=None):
+        """
+        Reads every proposal of `AaveGovernanceV2` `governance`, or takes them from `proposals`, e.g.
+        a `ProposalTable`. Read with `fetch_proposals()` in one batch request by default.
+
+        `strategy_at(address)` and `executor_at(address)` return contract objects, e.g.
+        `GovernanceStrategy.at` and `OldExecutor.at`, each address is read once. The voting supply is
+        read at the proposal's `startBlock` like `isProposalPassed()`. With `with_creators` the
+        creator's proposition power is read one block before the `ProposalCreated` event, as checked
+        by `create()`.
+        """
+        strategies, executor_params = {}, {}
+        columns = {name: [] for name in ('ids', 'for_votes', 'against_votes', 'voting_supplies', 'params')}
+        creators = []
+
+        if proposals is None:
+            proposals = fetch_proposals(web3, governance, range(governance.getProposalsCount()))
+        for proposal in proposals:
+            proposal_id = proposal['id']
+            if proposal['canceled'] and not include_canceled:
+                continue
+            if proposal['strategy'] not in strategies:
+                strategies[proposal['strategy']] = strategy_at(proposal['strategy'])
+            if proposal['executor'] not in executor_params:
+                executor = executor_at(proposal['executor'])
+                executor_params[proposal['executor']] = (
+                    executor.PROPOSITION_THRESHOLD(), executor.VOTE_DIFFERENTIAL(), executor.MINIMUM_QUORUM()
+                )
+
+            columns['ids'].append(proposal_id)
+            columns['for_votes'].append(proposal['forVotes'])
+            columns['against_votes'].append(proposal['againstVotes'])
+            columns['voting_supplies'].append(
+                strategies[proposal['strategy']].getTotalVotingSupplyAt(proposal['startBlock'])
+            )
+            columns['params'].append(executor_params[proposal['executor']])
+            creators.append((strategies[proposal['strategy']], proposal['creator']))
+
+        if with_creators:
+            created = {
+                event['id']: event.block_number
+                for event in governance.events.get_sequence(0, event_type='ProposalCreated')
+            }
+            columns['creator_powers'], columns['proposition_supplies'] = [], []
+            for proposal_id, (strategy, creator) in zip(columns['ids'], creators):
+                block = created[proposal_id] - 1
+                columns['creator_powers'].append(strategy.getPropositionPowerAt(creator, block))
+                columns['proposition_supplies'].append(strategy.getTotalPropositionSupplyAt(block))
+        return cls(**columns)
+
+    def quorum_valid(self, minimum_quorums):
+        """`isQuorumValid()` indexed by `[quorum, proposal]`."""
+        return np.asarray(minimum_quorums, dtype=np.int64)[:, None] <= self.max_quorum[None, :]
+
+    def vote_differential_valid(self, vote_differentials):
+        """`isVoteDifferentialValid()` indexed by `[differential, proposal]`."""
+        return np.asarray(vote_differentials, dtype=np.int64)[:, None] < self.margin[None, :]
+
+    def proposition_power_enough(self, proposition_thresholds):
+        """`isPropositionPowerEnough()` of each creator indexed by `[threshold, proposal]`."""
+        return np.asarray(proposition_thresholds, dtype=np.int64)[:, None] <= self.max_threshold[None, :]
+
+    def passed(self, vote_differentials, minimum_quorums):
+        """`isProposalPassed()` indexed by `[differential, quorum, proposal]`."""
+        differential = self.vote_differential_valid(vote_differentials)
+        quorum = self.quorum_valid(minimum_quorums)
+        return differential[:, None, :] & quorum[None, :, :]
+
+    def baseline(self):
+        """The outcome of each proposal under the parameters of its own executor."""
+        threshold, differential, quorum = self.params.T
+        return (threshold <= self.max_threshold) & (differential < self.margin) & (quorum <= self.max_quorum)
+
+
+class Sweep:
+    """
+    Outcomes of every proposal over a `[threshold, differential, quorum]` parameter grid, where a
+    proposal succeeds if its creator met the proposition threshold and it passed the vote.
+    """
+
+    def __init__(self, votes, proposition_thresholds, vote_differentials, minimum_quorums):
+        self.votes = votes
+        self.axes = tuple(
+            np.unique(np.asarray(axis, dtype=np.int64))
+            for axis in (proposition_thresholds, vote_differentials, minimum_quorums)
+        )
+        thresholds, differentials, quorums = self.axes
+        created = votes.proposition_power_enough(thresholds)
+        passed = votes.passed(differentials, quorums)
+        self.outcome = created[:, None, None, :] & passed[None, :, :, :]
+        self.flipped = self.outcome != votes.baseline()[None, None, None, :]
+
+    def index(self, proposition_threshold, vote_differential, minimum_quorum):
+        index = []
+        for axis, value in zip(self.axes, (proposition_threshold, vote_differential, minimum_quorum)):
+            i = int(np.searchsorted(axis, value))
+            if i == len(axis) or axis[i] != value:
+                raise KeyError(f"{value} is not on the grid")
+            index.append(i)
+        return tuple(index)
+
+    def flips(self, proposition_threshold, vote_differential, minimum_quorum):
+        """Ids of proposals changing outcome at a grid point, as `(now_succeeding, now_failing)`."""
+        index = self.index(proposition_threshold, vote_differential, minimum_quorum)
+        flipped, outcome = self.flipped[index], self.outcome[index]
+        return self.votes.ids[flipped & outcome].tolist(), self.votes.ids[flipped & ~outcome].tolist()
+
+    def flip_counts(self):
+        """Number of proposals changing outcome, indexed by `[threshold, differential, quorum]`."""
+        return self.flipped.sum(axis=3)
+
+    def ever_flipped(self):
+        """Ids of proposals changing outcome anywhere on the grid."""
+        return self.votes.ids[self.flipped.any(axis=(0, 1, 2))].tolist()
+
+    def rows(self):
+        """`(threshold, differential, quorum, succeeded, flipped)` for every grid point."""
+        succeeded = self.outcome.sum(axis=3)
+        flipped = self.flip_counts()
+        thresholds, differentials, quorums = self.axes
+        return [
+            (int(thresholds[i]), int(differentials[j]), int(quorums[k]), int(succeeded[i, j, k]), int(count))
+            for (i, j, k), count in np.ndenumerate(flipped)
+        ]
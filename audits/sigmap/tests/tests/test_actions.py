@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from eth_abi import encode_single
+
+from helpers.actions import (
+    Action,
+    action_hash,
+    action_hashes,
+    actions_from_events,
+    call_data,
+    queued_flags,
+    selector,
+)
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS
+
+SIGNATURES = ['', 'execute()', 'setVotingDelay(uint256)', 'transfer(address,uint256)']
+
+
+# Tests `call_data()` against brownie's calldata for the same function call
+def test_call_data(aave_governance_v2):
+    assert selector('setVotingDelay(uint256)') == bytes.fromhex(
+        aave_governance_v2.setVotingDelay.signature[2:]
+    )
+    data = encode_single('uint256', 7_200)
+    assert '0x' + call_data('setVotingDelay(uint256)', data).hex() == aave_governance_v2.setVotingDelay.encode_input(7_200)
+    assert call_data('', data) == data
+
+
+# Tests batch hashing of queued actions rebuilt from `QueuedAction` events against `isActionQueued()`
+@pytest.mark.no_fork
+def test_action_hashes_batch(alice, bob, chain, web3, Executor):
+    executor = alice.deploy(Executor, alice, *NEW_LONG_EXECUTOR_ARGS.values())
+    rng = random.Random(0)
+    execution_time = chain.time() + 2 * NEW_LONG_EXECUTOR_ARGS['delay']
+
+    actions = [
+        Action(
+            bob,
+            rng.getrandbits(64),
+            rng.choice(SIGNATURES),
+            bytes(rng.getrandbits(8) for _ in range(rng.randrange(100))),
+            execution_time + i,
+            rng.random() < 0.5,
+        )
+        for i in range(50)
+    ]
+    events = []
+    for action in actions:
+        tx = executor.queueTransaction(*action, {'from': alice})
+        events.append(tx.events['QueuedAction'])
+
+    hashes = action_hashes(actions_from_events(events))
+    assert hashes == action_hashes(actions)
+    assert ['0x' + h.hex() for h in hashes] == [event['actionHash'] for event in events]
+    assert hashes[0] == action_hash(*actions[0])
+
+    cancelled = set(rng.sample(range(len(actions)), 10))
+    for i in cancelled:
+        executor.cancelTransaction(*actions[i], {'from': alice})
+
+    # Hashes of actions never queued read as not queued
+    unknown = action_hashes([action._replace(value=action.value + 1) for action in actions])
+    assert queued_flags(web3, executor, hashes) == [i not in cancelled for i in range(len(actions))]
+    assert queued_flags(web3, executor, unknown) == [False] * len(actions)
@@ -0,0 +1,45 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from helpers.artifact_cache import ArtifactCache
+
+pytestmark = pytest.mark.no_fork
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+# A copy of the project's sources with one fake artifact per unit in its build directory
+def project(tmp_path):
+    shutil.copytree(PROJECT_DIR / "contracts", tmp_path / "contracts")
+    shutil.copyfile(PROJECT_DIR / "brownie-config.yaml", tmp_path / "brownie-config.yaml")
+    build = tmp_path / "build" / "contracts"
+    build.mkdir(parents=True)
+    for i, unit in enumerate(ArtifactCache(tmp_path).units()):
+        (build / f"{i}.json").write_text(json.dumps({"sourcePath": unit}))
+    return tmp_path
+
+
+# Tests units are restored until a file they import, directly or not, or the compiler settings change
+def test_restore_after_changes(tmp_path):
+    path = project(tmp_path / "project")
+    cache = ArtifactCache(path, tmp_path / "cache")
+    units = cache.units()
+    assert cache.store() == units
+    assert cache.store() == []
+
+    shutil.rmtree(path / "build")
+    assert ArtifactCache(path, tmp_path / "cache").restore() == (units, [])
+    assert len(list((path / "build" / "contracts").glob("*.json"))) == len(units)
+
+    library = next(unit for unit in units if unit.endswith("/SafeMath.sol"))
+    (path / library).write_text((path / library).read_text() + "\n")
+    restored, missed = ArtifactCache(path, tmp_path / "cache").restore()
+    assert library in missed and len(missed) > 1
+    assert not set(restored) & set(missed)
+
+    config = path / "brownie-config.yaml"
+    config.write_text(config.read_text().replace("runs: 200", "runs: 1000"))
+    assert ArtifactCache(path, tmp_path / "cache").restore() == ([], units)
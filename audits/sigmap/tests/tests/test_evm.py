@@ -0,0 +1,79 @@
+import pytest
+from brownie import network
+
+from helpers.evm import InProcessNode
+
+pytestmark = pytest.mark.no_fork
+
+# Runtime code reverting every call with `Error("nope")`, and with the panic of an overflow (0x11)
+REVERT_STRING = bytes.fromhex(
+    "7f08c379a0" + "00" * 28 + "600052" + "6020600452" + "6004602452"
+    + "7f" + b"nope".hex() + "00" * 28 + "604452" + "60646000fd"
+)
+REVERT_PANIC = bytes.fromhex("7f4e487b71" + "00" * 28 + "600052" + "6011600452" + "60246000fd")
+
+
+# Init code returning `runtime`
+def init_code(runtime):
+    return bytes([0x60, len(runtime), 0x60, 12, 0x60, 0, 0x39, 0x60, len(runtime), 0x60, 0, 0xF3]) + runtime
+
+
+@pytest.fixture
+def node():
+    pytest.importorskip("eth_tester", reason="needs eth-tester")
+    return InProcessNode(network.show_active())
+
+
+# The response to one JSON-RPC request, served without HTTP
+def request(node, method, *params):
+    return node.handle({"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)})
+
+
+def result(node, method, *params):
+    response = request(node, method, *params)
+    assert "result" in response, response
+    return response["result"]
+
+
+# Tests time moves like in ganache-cli v6 and snapshots restore both the chain and the time offset
+def test_time_and_snapshots(node):
+    assert result(node, "web3_clientVersion").lower().startswith("ethereumjs testrpc")
+    start = result(node, "eth_getBlockByNumber", "latest", False)
+    snapshot = result(node, "evm_snapshot")
+
+    assert result(node, "evm_increaseTime", 1000) == 1000
+    result(node, "evm_mine")
+    assert result(node, "eth_getBlockByNumber", "latest", False)["timestamp"] >= start["timestamp"] + 1000
+
+    result(node, "evm_mine", start["timestamp"] + 5000)
+    block = result(node, "eth_getBlockByNumber", "latest", False)
+    assert (block["number"], block["timestamp"]) == (start["number"] + 2, start["timestamp"] + 5000)
+
+    result(node, "evm_mine", {"blocks": 10})
+    assert result(node, "eth_blockNumber") == start["number"] + 12
+
+    assert result(node, "evm_revert", snapshot) is True
+    assert result(node, "eth_blockNumber") == start["number"]
+    assert result(node, "evm_increaseTime", 0) == 0
+
+
+# Tests reverts of calls, gas estimations and transactions carry their reason in ganache's error form
+def test_revert_reasons(node):
+    sender = result(node, "eth_accounts")[0]
+    for runtime, reason in ((REVERT_STRING, "nope"), (REVERT_PANIC, "Integer overflow")):
+        txid = result(node, "eth_sendTransaction", {"from": sender, "data": "0x" + init_code(runtime).hex(), "gas": hex(200_000)})
+        contract = result(node, "eth_getTransactionReceipt", txid)["contractAddress"]
+        transaction = {"from": sender, "to": contract, "data": "0x", "gas": hex(100_000)}
+
+        for method, params in (("eth_call", [transaction, "latest"]), ("eth_estimateGas", [transaction])):
+            error = request(node, method, *params)["error"]
+            assert error["message"] == f"VM Exception while processing transaction: revert {reason}"
+            assert list(error["data"].values()) == [{"error": "revert", "reason": reason}]
+
+        error = request(node, "eth_sendTransaction", transaction)["error"]
+        (txid, data), = error["data"].items()
+        assert data["reason"] == reason
+        assert result(node, "eth_getTransactionReceipt", txid)["status"] == 0
+
+    # No traces, which brownie tells by the error code
+    assert request(node, "debug_traceTransaction", txid)["error"]["code"] == -32601
@@ -1,6 +1,10 @@
+import pytest
+
+pytestmark = pytest.mark.no_fork
+
 
 # Tests `Executor` constructor
-def test_executor_constructor(alice, bob, chain, constants, aave_governance_v2, Executor):
+def test_executor_constructor(alice, bob, chain, constants, Executor, GovernanceMock):
     admin = bob
     delay = 1234
     grace_period = 4321
@@ -38,13 +42,17 @@ def test_executor_constructor(alice, bob, chain, constants, aave_governance_v2,
     assert executor.getPendingAdmin() == constants.ZERO_ADDRESS
     assert executor.getDelay() == delay
 
+    # No proposal and no proposition power for alice, as on mainnet
+    governance = alice.deploy(GovernanceMock)
+    governance.setPropositionPower(0, 10 ** 6, {'from': alice})
+
     assert executor.isActionQueued(bytes(32)) == False
-    assert executor.isProposalOverGracePeriod(aave_governance_v2, 10_000) == True
+    assert executor.isProposalOverGracePeriod(governance, 10_000) == True
 
-    assert executor.validateCreatorOfProposal(aave_governance_v2, alice, 10_000) == False
-    assert executor.validateProposalCancellation(aave_governance_v2, alice, 10_000) == True
+    assert executor.validateCreatorOfProposal(governance, alice, 10_000) == False
+    assert executor.validateProposalCancellation(governance, alice, 10_000) == True
 
-    assert executor.isPropositionPowerEnough(aave_governance_v2, alice, chain.height) == False
+    assert executor.isPropositionPowerEnough(governance, alice, chain.height) == False
     assert executor.getMinimumVotingPowerNeeded(44_000) == 44_000 * minimum_quorum // 10_000
 
     assert executor.tx.events['NewDelay']['delay'] == delay
@@ -56,31 +64,32 @@ def test_executor_constructor(alice, bob, chain, constants, aave_governance_v2,
     assert executor.tx.events['PropositionThresholdUpdated']['newPropositionThreshold'] == proposition_threshold
 
 
-# Tests `Executor` function signatures match the old function signatures
-def test_function_signatures(alice, long_executor, Executor):
+# Tests `Executor` function signatures match the old function signatures, as compiled
+def test_function_signatures(alice, Executor, OldExecutor):
+    old_signatures = OldExecutor.signatures
     new_executor = alice.deploy(Executor, alice, 1, 1, 0, 10, 1, 1, 1, 1)
 
     # Validate each function in used by `AaveGovernanceV2` remains unchanged
-    assert new_executor.getDelay.signature == long_executor.getDelay.signature
+    assert new_executor.getDelay.signature == old_signatures['getDelay']
     
-    assert new_executor.queueTransaction.signature == long_executor.queueTransaction.signature
-    assert new_executor.executeTransaction.signature == long_executor.executeTransaction.signature
-    assert new_executor.cancelTransaction.signature == long_executor.cancelTransaction.signature
+    assert new_executor.queueTransaction.signature == old_signatures['queueTransaction']
+    assert new_executor.executeTransaction.signature == old_signatures['executeTransaction']
+    assert new_executor.cancelTransaction.signature == old_signatures['cancelTransaction']
     
-    assert new_executor.isActionQueued.signature == long_executor.isActionQueued.signature
-    assert new_executor.isProposalOverGracePeriod.signature == long_executor.isProposalOverGracePeriod.signature
-    assert new_executor.isProposalPassed.signature == long_executor.isProposalPassed.signature
-
-    assert new_executor.validateCreatorOfProposal.signature == long_executor.validateCreatorOfProposal.signature
-    assert new_executor.validateProposalCancellation.signature == long_executor.validateProposalCancellation.signature
-
-    assert new_executor.PROPOSITION_THRESHOLD.signature == long_executor.PROPOSITION_THRESHOLD.signature
-    assert new_executor.VOTING_DURATION.signature == long_executor.VOTING_DURATION.signature
-    assert new_executor.VOTE_DIFFERENTIAL.signature == long_executor.VOTE_DIFFERENTIAL.signature
-    assert new_executor.MINIMUM_QUORUM.signature == long_executor.MINIMUM_QUORUM.signature
-
-    assert new_executor.GRACE_PERIOD.signature == long_executor.GRACE_PERIOD.signature
-    assert new_executor.MINIMUM_DELAY.signature == long_executor.MINIMUM_DELAY.signature
-    assert new_executor.MAXIMUM_DELAY.signature == long_executor.MAXIMUM_DELAY.signature
-    assert new_executor.ONE_HUNDRED_WITH_PRECISION.signature == long_executor.ONE_HUNDRED_WITH_PRECISION.signature
+    assert new_executor.isActionQueued.signature == old_signatures['isActionQueued']
+    assert new_executor.isProposalOverGracePeriod.signature == old_signatures['isProposalOverGracePeriod']
+    assert new_executor.isProposalPassed.signature == old_signatures['isProposalPassed']
+
+    assert new_executor.validateCreatorOfProposal.signature == old_signatures['validateCreatorOfProposal']
+    assert new_executor.validateProposalCancellation.signature == old_signatures['validateProposalCancellation']
+
+    assert new_executor.PROPOSITION_THRESHOLD.signature == old_signatures['PROPOSITION_THRESHOLD']
+    assert new_executor.VOTING_DURATION.signature == old_signatures['VOTING_DURATION']
+    assert new_executor.VOTE_DIFFERENTIAL.signature == old_signatures['VOTE_DIFFERENTIAL']
+    assert new_executor.MINIMUM_QUORUM.signature == old_signatures['MINIMUM_QUORUM']
+
+    assert new_executor.GRACE_PERIOD.signature == old_signatures['GRACE_PERIOD']
+    assert new_executor.MINIMUM_DELAY.signature == old_signatures['MINIMUM_DELAY']
+    assert new_executor.MAXIMUM_DELAY.signature == old_signatures['MAXIMUM_DELAY']
+    assert new_executor.ONE_HUNDRED_WITH_PRECISION.signature == old_signatures['ONE_HUNDRED_WITH_PRECISION']
 
@@ -0,0 +1,278 @@
+import random
+import re
+from pathlib import Path
+
+import brownie
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from helpers.actions import action_hash
+from helpers.executor_model import (
+    MAX_UINT256,
+    ExecutorModel,
+    Revert,
+    differential_boundary_cases,
+    quorum_boundary_cases,
+)
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS
+
+pytestmark = pytest.mark.no_fork
+
+PROJECT_DIR = Path(__file__).parent.parent
+# The contract modelled, built in the brownie project as `contracts/src/SrcExecutor.sol`
+SRC_EXECUTOR = PROJECT_DIR.parents[2] / 'src' / 'contracts' / 'Executor.sol'
+
+# Drawing every integer through hypothesis caps the model at a few hundred cases per second, so
+# hypothesis draws a seed and magnitude per example and each example checks a batch of `BATCH_SIZE`
+# pseudo-random cases. Failures report the seed, which reproduces the whole batch.
+MODEL_EXAMPLES = 50
+BATCH_SIZE = 1_000
+# Cases per test replayed on chain
+SAMPLE_SIZE = 25
+
+uint256 = st.integers(min_value=0, max_value=MAX_UINT256)
+percentage = st.integers(min_value=0, max_value=10_000)
+seed = st.integers(min_value=0, max_value=2 ** 32)
+# 90 bits covers token amounts in wei up to ~100x the AAVE + stkAAVE supply, 256 bits covers overflows
+bits = st.sampled_from([64, 90, 100, 256])
+
+
+class Reservoir:
+    """Uniform sample of at most `size` items from a stream of unknown length."""
+
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.items = []
+        self.seen = 0
+        self._random = random.Random(seed)
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            index = self._random.randrange(self.seen)
+            if index < self.size:
+                self.items[index] = item
+
+
+def model_result(fn, *args):
+    try:
+        return fn(*args)
+    except Revert as e:
+        return e
+
+
+# Compares a model result (value or `Revert`) with the matching contract call
+def assert_matches_contract(expected, call, *args):
+    if isinstance(expected, Revert):
+        with brownie.reverts(expected.reason):
+            call(*args)
+    else:
+        assert call(*args) == expected
+
+
+@pytest.fixture(scope="module")
+def governance_mock(alice, GovernanceMock):
+    return alice.deploy(GovernanceMock)
+
+
+@pytest.fixture(scope="module")
+def executor(alice, SrcExecutor):
+    return alice.deploy(SrcExecutor, alice, *NEW_LONG_EXECUTOR_ARGS.values())
+
+
+@pytest.fixture(scope="module")
+def model():
+    return ExecutorModel(**NEW_LONG_EXECUTOR_ARGS)
+
+
+# Replays `(for_votes, against_votes, voting_supply)` cases on chain through `GovernanceMock`
+def assert_votes_match_contract(alice, executor, governance_mock, model, cases):
+    for for_votes, against_votes, voting_supply in cases:
+        governance_mock.setVotes(for_votes, against_votes, voting_supply, {'from': alice})
+        assert_matches_contract(
+            model_result(model.is_quorum_valid, for_votes, voting_supply),
+            executor.isQuorumValid, governance_mock, 0,
+        )
+        assert_matches_contract(
+            model_result(model.is_vote_differential_valid, for_votes, against_votes, voting_supply),
+            executor.isVoteDifferentialValid, governance_mock, 0,
+        )
+        assert_matches_contract(
+            model_result(model.get_minimum_voting_power_needed, voting_supply),
+            executor.getMinimumVotingPowerNeeded, voting_supply,
+        )
+
+
+# Tests `SrcExecutor` is `src/contracts/Executor.sol` renamed, importing the same interfaces
+def test_src_executor_copy():
+    if not SRC_EXECUTOR.exists():
+        pytest.skip(f"{SRC_EXECUTOR} is not in the build context")
+    source = SRC_EXECUTOR.read_text()
+    expected = source.replace('contract Executor is', 'contract SrcExecutor is').replace(
+        "from './interfaces/", "from '../aave-gov-level-2-update/interfaces/"
+    )
+    assert (PROJECT_DIR / 'contracts' / 'src' / 'SrcExecutor.sol').read_text() == expected
+    for interface in re.findall(r"from '\./(interfaces/\w+\.sol)'", source):
+        copy = PROJECT_DIR / 'contracts' / 'aave-gov-level-2-update' / interface
+        assert copy.read_text() == (SRC_EXECUTOR.parent / interface).read_text()
+
+
+# Tests the model's configuration rules against the `SrcExecutor` constructor
+@given(
+    delay=uint256,
+    minimum_delay=uint256,
+    maximum_delay=uint256,
+    thresholds=st.tuples(percentage, percentage, percentage).map(list) | st.lists(uint256, min_size=3, max_size=3),
+    vote_duration=st.integers(min_value=0, max_value=2),
+    grace_period=st.integers(min_value=0, max_value=2),
+)
+def test_model_constructor(alice, SrcExecutor, delay, minimum_delay, maximum_delay, thresholds, vote_duration, grace_period):
+    proposition_threshold, vote_differential, minimum_quorum = thresholds
+    args = [delay, grace_period, minimum_delay, maximum_delay, proposition_threshold, vote_duration, vote_differential, minimum_quorum]
+
+    expected = model_result(ExecutorModel, *args)
+    if isinstance(expected, Revert):
+        with brownie.reverts(expected.reason):
+            alice.deploy(SrcExecutor, alice, *args)
+    else:
+        executor = alice.deploy(SrcExecutor, alice, *args)
+        assert executor.getDelay() == expected.delay
+        assert executor.GRACE_PERIOD() == expected.grace_period
+        assert executor.MINIMUM_QUORUM() == expected.minimum_quorum
+
+
+# Tests voting rules of the model at high volume, then replays a uniform sample against `SrcExecutor`
+def test_model_voting_rules(alice, executor, governance_mock, model):
+    sample = Reservoir(SAMPLE_SIZE)
+
+    @settings(max_examples=MODEL_EXAMPLES, deadline=None)
+    @given(seed=seed, bits=bits)
+    def check(seed, bits):
+        rng = random.Random(seed)
+        for _ in range(BATCH_SIZE):
+            voting_supply = rng.getrandbits(bits)
+            against_votes = rng.getrandbits(bits)
+            if voting_supply < 2 ** 200 and rng.random() < 0.5:
+                # Around the quorum boundary
+                minimum = model.get_minimum_voting_power_needed(voting_supply)
+                for_votes = max(minimum + rng.randint(-2, 2), 0)
+            else:
+                for_votes = rng.getrandbits(bits)
+
+            quorum = model_result(model.is_quorum_valid, for_votes, voting_supply)
+            differential = model_result(model.is_vote_differential_valid, for_votes, against_votes, voting_supply)
+            passed = model_result(model.is_proposal_passed, for_votes, against_votes, voting_supply)
+
+            if not isinstance(passed, Revert):
+                assert passed == (quorum and differential)
+                # More `for` votes never makes a passing proposal fail (unless the larger vote overflows)
+                if passed and for_votes < 10 ** 70:
+                    assert model.is_proposal_passed(for_votes + 1, against_votes, voting_supply)
+            if voting_supply == 0:
+                assert isinstance(differential, Revert)
+
+            sample.add((for_votes, against_votes, voting_supply))
+
+    check()
+    assert_votes_match_contract(alice, executor, governance_mock, model, sample.items)
+
+
+# Tests every rounding residue of the voting supply around the deployment thresholds (125 / 650 / 650)
+def test_model_deployment_boundaries(alice, executor, governance_mock, model):
+    sample = Reservoir(SAMPLE_SIZE)
+    # ~16M AAVE voting supply at the fork block, stepping through all residues modulo 10_000
+    base_supply = 16_000_000 * 10 ** 18
+
+    for voting_supply in range(base_supply, base_supply + 10_000):
+        cases = quorum_boundary_cases(model, voting_supply)
+        assert [model.is_quorum_valid(*case) for case in cases] == [False, False, True, True, True]
+
+        for against_votes in (0, voting_supply // 100, voting_supply // 10):
+            cases = differential_boundary_cases(model, voting_supply, against_votes)
+            results = [model.is_vote_differential_valid(*case) for case in cases]
+            assert results == [False, False, True, True, True]
+            for case in cases:
+                sample.add(case)
+
+        proposition_power = model.get_minimum_proposition_power_needed(voting_supply)
+        assert model.is_proposition_power_enough(proposition_power, voting_supply)
+        assert not model.is_proposition_power_enough(proposition_power - 1, voting_supply)
+
+    assert_votes_match_contract(alice, executor, governance_mock, model, sample.items)
+
+    # Proposition threshold on chain
+    for _, _, proposition_supply in sample.items[:5]:
+        proposition_power = model.get_minimum_proposition_power_needed(proposition_supply)
+        for power in (proposition_power - 1, proposition_power, proposition_power + 1):
+            governance_mock.setPropositionPower(power, proposition_supply, {'from': alice})
+            expected = model.is_proposition_power_enough(power, proposition_supply)
+            assert executor.isPropositionPowerEnough(governance_mock, alice, 0) == expected
+
+
+# Tests the model's action hash against `queueTransaction()` return values
+@given(
+    value=uint256,
+    signature=st.sampled_from(['', 'execute()', 'setVotingDelay(uint256)']),
+    data=st.binary(max_size=100),
+    with_delegatecall=st.booleans(),
+)
+def test_model_action_hash(alice, bob, chain, executor, value, signature, data, with_delegatecall):
+    execution_time = chain.time() + 2 * NEW_LONG_EXECUTOR_ARGS['delay']
+    tx = executor.queueTransaction(bob, value, signature, data, execution_time, with_delegatecall, {'from': alice})
+
+    expected = action_hash(bob, value, signature, data, execution_time, with_delegatecall)
+    assert tx.return_value == '0x' + expected.hex()
+    assert tx.events['QueuedAction']['actionHash'] == '0x' + expected.hex()
+    assert executor.isActionQueued(expected) == True
+
+
+# Tests the timelock checks of the model at high volume, then replays the boundaries on chain
+def test_model_timelock(alice, bob, chain, warp, executor, model):
+    grace_period = NEW_LONG_EXECUTOR_ARGS['grace_period']
+
+    @settings(max_examples=MODEL_EXAMPLES, deadline=None)
+    @given(seed=seed)
+    def check(seed):
+        rng = random.Random(seed)
+        for _ in range(BATCH_SIZE):
+            execution_time = rng.getrandbits(rng.choice([17, 32, 64]))
+            offset = rng.randint(-2, grace_period + 2)
+            queue_time = execution_time - model.delay
+            if queue_time < 0:
+                with pytest.raises(Revert, match='EXECUTION_TIME_UNDERESTIMATED'):
+                    model.queue_transaction(bob, 0, '', b'', execution_time, False, queue_time + 1)
+                continue
+            model.queue_transaction(bob, 0, '', b'', execution_time, False, queue_time)
+            now = execution_time + offset
+            result = model_result(model.execute_transaction, bob, 0, '', b'', execution_time, False, now)
+            if offset < 0:
+                assert result.reason == 'TIMELOCK_NOT_FINISHED'
+            elif offset > grace_period:
+                assert result.reason == 'GRACE_PERIOD_FINISHED'
+            else:
+                assert not model.is_action_queued(result)
+            model.cancel_transaction(bob, 0, '', b'', execution_time, False)
+
+    check()
+
+    # On chain the execution block is mined at wall-clock time after the warped block, so the sides of
+    # each boundary are checked with a margin, the exact boundaries are covered by the model above
+    margin = 30
+    for offset in (-margin, margin, grace_period - margin, grace_period + margin):
+        chain.snapshot()
+        execution_time = chain.time() + model.delay + 100
+        executor.queueTransaction(bob, 0, '', b'', execution_time, False, {'from': alice})
+        model.queue_transaction(bob, 0, '', b'', execution_time, False, chain.time())
+
+        warp.to(timestamp=execution_time + offset)
+        expected = model_result(model.execute_transaction, bob, 0, '', b'', execution_time, False, chain.time())
+        if isinstance(expected, Revert):
+            with brownie.reverts(expected.reason):
+                executor.executeTransaction(bob, 0, '', b'', execution_time, False, {'from': alice})
+        else:
+            executor.executeTransaction(bob, 0, '', b'', execution_time, False, {'from': alice})
+            assert executor.isActionQueued(expected) == False
+        model.cancel_transaction(bob, 0, '', b'', execution_time, False)
+        chain.revert()
@@ -0,0 +1,207 @@
+import time
+from collections import Counter
+
+import brownie
+import pytest
+from brownie import web3
+from brownie.test import state_machine
+from eth_abi import encode_abi
+from hypothesis import strategies as st
+
+from helpers.executor_model import SETTERS, ExecutorModel, Revert
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS
+from helpers.multicall import Read, StateReads
+
+pytestmark = pytest.mark.no_fork
+
+DAY = 60 * 60 * 24
+ARGS = NEW_LONG_EXECUTOR_ARGS
+
+# Sent with a fixed gas limit, so transactions expected to revert are mined instead of failing estimation
+GAS_LIMIT = 500_000
+
+# Values on both sides of each setter's bounds, and any valid value. The `update*()` setters of
+# `src/contracts/Executor.sol` reject 0 as well as values above 100%, executing them fails.
+delays = st.sampled_from([ARGS['minimum_delay'] - 1, ARGS['maximum_delay'] + 1]) | st.integers(
+    ARGS['minimum_delay'], ARGS['maximum_delay']
+)
+percentages = st.sampled_from([0, 10_000, 10_001]) | st.integers(0, 10_000)
+durations = st.sampled_from([0, 1]) | st.integers(1, 10 ** 6)
+
+# `(signature, argument)` of a queued call, setters of the executor or a no-op call to an account
+# (an empty signature), addresses are drawn as account indexes
+calls = st.one_of(
+    st.tuples(st.just('setDelay(uint256)'), delays),
+    st.tuples(st.just('setPendingAdmin(address)'), st.integers(0, 2)),
+    st.tuples(st.just('updateVotingDuration(uint256)'), durations),
+    st.tuples(st.just('updateVoteDifferential(uint256)'), percentages),
+    st.tuples(st.just('updateMinimumQuorum(uint256)'), percentages),
+    st.tuples(st.just('updatePropositionThreshold(uint256)'), percentages),
+    st.tuples(st.just(''), st.none()),
+)
+# Execution time past the earliest allowed, -1 is rejected
+offsets = st.sampled_from([-1, 0, 1]) | st.integers(0, ARGS['grace_period'] + DAY)
+# Time between transactions, around the delay and the grace period
+sleeps = st.sampled_from([0, DAY - 1, DAY, ARGS['grace_period'], ARGS['grace_period'] + 1]) | st.integers(0, 10 * DAY)
+# Sender of a transaction, `None` is the current admin, otherwise an account index
+senders = st.sampled_from([None, None, None, 0, 1, 2])
+
+
+# The model's result, or the `Revert` it raised
+def apply(fn, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Revert as e:
+        return e
+
+
+@pytest.fixture(scope="module")
+def executor(alice, SrcExecutor):
+    return alice.deploy(SrcExecutor, alice, *ARGS.values())
+
+
+class ExecutorStateMachine:
+    """
+    Queues, cancels and executes actions on a deployed `SrcExecutor` with a shadow `ExecutorModel`.
+
+    Queued actions call the executor's own setters (`setDelay()`, `setPendingAdmin()` and the four
+    `update*()`) or an account, so executing them changes its configuration and admin, and time
+    jumps are free: the machine keeps its own clock and mines each transaction alone in a block at
+    an exact timestamp, the boundaries of the delay and grace period are hit to the second. Each
+    transaction's success is checked against the model, then the whole state (configuration,
+    admins and `isActionQueued()` of every action seen) in one multicall. Revert reasons are
+    covered by `test_executor_model.py`, recovering them here would need a trace per transaction.
+
+    Every example starts from the snapshot brownie takes after deployment, no contract is redeployed.
+    Transactions stay pending until mined, so automine must be off.
+    """
+
+    def __init__(cls, executor, accounts, chain, stats):
+        cls.executor = executor
+        cls.accounts = accounts
+        cls.by_address = {str(account).lower(): account for account in accounts}
+        cls.chain = chain
+        cls.stats = stats
+        cls.reads = StateReads()
+
+    def setup(self):
+        self.model = ExecutorModel(**ARGS, admin=self.accounts[0])
+        self.now = web3.eth.get_block('latest')['timestamp']
+        self.gas_price = web3.eth.gas_price
+        self.actions = []
+        self.hashes = []
+
+    def _sender(self, sender):
+        return self.by_address[self.model.admin] if sender is None else self.accounts[sender]
+
+    def _send(self, method, args, sender, now):
+        self.now = now
+        tx = method(*args, {
+            'from': sender, 'gas_limit': GAS_LIMIT, 'gas_price': self.gas_price,
+            'allow_revert': True, 'required_confs': 0,
+        })
+        self.chain.mine(timestamp=now)
+        tx.wait(1)
+        self.stats['transactions'] += 1
+        return tx
+
+    def _check(self, expected, tx):
+        assert tx.status == (0 if isinstance(expected, Revert) else 1), (
+            f"expected {expected.reason if isinstance(expected, Revert) else 'success'}, got status {tx.status}"
+        )
+
+    def rule_queue(self, call=calls, offset=offsets, delegatecall=st.booleans(), sender=senders):
+        signature, argument = call
+        if signature:
+            target = self.executor.address
+            value = str(self.accounts[argument]) if SETTERS[signature][1] == ['address'] else argument
+            data = encode_abi(SETTERS[signature][1], [value])
+        else:
+            target, data = str(self.accounts[2]), b''
+        now = self.now + 1
+        action = (target, 0, signature, data, now + self.model.delay + offset, delegatecall)
+        sender = self._sender(sender)
+
+        expected = apply(self.model.queue_transaction, *action, now, sender=sender)
+        self._check(expected, self._send(self.executor.queueTransaction, action, sender, now))
+        if not isinstance(expected, Revert):
+            self.actions.append(action)
+            if expected not in self.hashes:
+                self.hashes.append(expected)
+
+    def rule_cancel(self, index=st.integers(min_value=0), sender=senders):
+        if self.actions:
+            action = self.actions[index % len(self.actions)]
+            sender = self._sender(sender)
+            expected = apply(self.model.cancel_transaction, *action, sender=sender)
+            self._check(expected, self._send(self.executor.cancelTransaction, action, sender, self.now + 1))
+
+    def rule_execute(self, index=st.integers(min_value=0), sender=senders):
+        if self.actions:
+            action = self.actions[index % len(self.actions)]
+            sender = self._sender(sender)
+            now = self.now + 1
+            expected = apply(
+                self.model.execute_transaction, *action, now, sender=sender, executor=self.executor.address
+            )
+            self._check(expected, self._send(self.executor.executeTransaction, action, sender, now))
+
+    def rule_accept_admin(self, sender=st.integers(0, 2)):
+        sender = self.accounts[sender]
+        expected = apply(self.model.accept_admin, sender)
+        self._check(expected, self._send(self.executor.acceptAdmin, (), sender, self.now + 1))
+
+    def rule_sleep(self, seconds=sleeps):
+        self.now += seconds
+
+    def invariant(self):
+        self.reads.assert_state([
+            Read(self.executor.getDelay, (), self.model.delay),
+            Read(self.executor.getAdmin, (), self.model.admin),
+            Read(self.executor.getPendingAdmin, (), self.model.pending_admin),
+            Read(self.executor.VOTING_DURATION, (), self.model.voting_duration),
+            Read(self.executor.VOTE_DIFFERENTIAL, (), self.model.vote_differential),
+            Read(self.executor.MINIMUM_QUORUM, (), self.model.minimum_quorum),
+            Read(self.executor.PROPOSITION_THRESHOLD, (), self.model.proposition_threshold),
+            *(
+                Read(self.executor.isActionQueued, (action,), self.model.is_action_queued(action))
+                for action in self.hashes
+            ),
+        ])
+
+
+# Tests random sequences of `--stateful-examples` examples of `--stateful-steps` steps against the model
+def test_executor_state_machine(pytestconfig, warp, chain, executor, alice, bob, carol):
+    stats = Counter()
+    settings = {
+        "max_examples": pytestconfig.getoption("--stateful-examples"),
+        "stateful_step_count": pytestconfig.getoption("--stateful-steps"),
+    }
+    start = time.perf_counter()
+    warp.set_automine(False)
+    try:
+        state_machine(ExecutorStateMachine, executor, [alice, bob, carol], chain, stats, settings=settings)
+    finally:
+        warp.set_automine(True)
+    elapsed = time.perf_counter() - start
+    print(f"\n{stats['transactions']} transactions in {elapsed:.1f}s ({stats['transactions'] / elapsed * 60:.0f} per minute)")
+
+
+# Tests executing a zero threshold update fails on chain and in the model, with the reason the machine cannot recover
+@pytest.mark.parametrize("setter", ['updateVoteDifferential', 'updateMinimumQuorum', 'updatePropositionThreshold'])
+def test_zero_threshold_update_fails(warp, chain, executor, alice, setter):
+    signature = f"{setter}(uint256)"
+    model = ExecutorModel(**ARGS, admin=alice)
+    chain.snapshot()
+    execution_time = chain.time() + model.delay + 100
+    action = (executor.address, 0, signature, encode_abi(['uint256'], [0]), execution_time, False)
+    executor.queueTransaction(*action, {'from': alice})
+    queued = model.queue_transaction(*action, chain.time(), sender=alice)
+
+    warp.to(timestamp=execution_time)
+    with pytest.raises(Revert, match='FAILED_ACTION_EXECUTION'):
+        model.execute_transaction(*action, execution_time, sender=alice, executor=executor.address)
+    with brownie.reverts('FAILED_ACTION_EXECUTION'):
+        executor.executeTransaction(*action, {'from': alice, 'gas_limit': GAS_LIMIT})
+    assert executor.isActionQueued(queued) == True
+    chain.revert()
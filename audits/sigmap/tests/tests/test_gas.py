@@ -0,0 +1,80 @@
+import pytest
+from eth_abi import encode_abi
+
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS
+
+DAY = 60 * 60 * 24
+DELAY = NEW_LONG_EXECUTOR_ARGS['delay']
+
+
+# Both executor versions deployed with the parameters of the new long executor and alice as admin
+@pytest.fixture(params=["OldExecutor", "Executor"])
+def executor(request, alice, OldExecutor, Executor):
+    container = {"OldExecutor": OldExecutor, "Executor": Executor}[request.param]
+    return alice.deploy(container, alice, *NEW_LONG_EXECUTOR_ARGS.values())
+
+
+def name(operation, executor):
+    return f"{operation}[{executor._name}]"
+
+
+# Actions on the executor itself: a state change by call, and a view by call and by delegatecall
+def actions(executor, execution_time):
+    return {
+        "setDelay": (executor, 0, 'setDelay(uint256)', encode_abi(['uint256'], [DELAY + 1]), execution_time, False),
+        "call": (executor, 0, 'getDelay()', b'', execution_time, False),
+        "delegatecall": (executor, 0, 'getDelay()', b'', execution_time, True),
+    }
+
+
+# Tests the gas of `queueTransaction()` and `cancelTransaction()` of both executors at identical inputs
+def test_queue_and_cancel(gas, executor, alice, chain):
+    for kind, action in actions(executor, chain.time() + DELAY + DAY).items():
+        gas.check(name(f"queueTransaction({kind})", executor), executor.queueTransaction(*action, {'from': alice}))
+        gas.check(name(f"cancelTransaction({kind})", executor), executor.cancelTransaction(*action, {'from': alice}))
+
+
+# Tests the gas of `executeTransaction()` by call and delegatecall of both executors at identical inputs
+def test_execute(gas, executor, alice, chain):
+    execution_time = chain.time() + DELAY + DAY
+    queued = actions(executor, execution_time)
+    for action in queued.values():
+        executor.queueTransaction(*action, {'from': alice})
+    chain.mine(timestamp=execution_time)
+
+    for kind, action in queued.items():
+        tx = executor.executeTransaction(*action, {'from': alice})
+        assert tx.status == 1
+        gas.check(name(f"executeTransaction({kind})", executor), tx)
+
+
+# Tests the gas of the governance `execute()` of both proposal payloads
+def test_payloads(gas, migration):
+    state = migration.revert_to("new_executor_live")
+    gas.check("execute(ProposalPayloadAaveEcosystemReserveWithVoting)", state.execute_reserve_tx)
+    gas.check("execute(ProposalPayloadNewLongExecutor)", state.execute_long_tx)
+
+
+# Tests the gas of `createStream()`, `withdrawFromStream()` and `cancelStream()` of the upgraded reserve
+def test_streams(
+    gas, reserve_executed, accounts, chain, bob, AaveEcosystemReserveV2, aave_ecosystem_reserve_proxy, aave_token_proxy
+):
+    reserve = AaveEcosystemReserveV2.at(aave_ecosystem_reserve_proxy.address)
+    admin = reserve.getFundsAdmin()
+    accounts[0].transfer(admin, "1 ether")
+
+    start = chain.time() + DAY
+    duration = 30 * DAY
+    deposit = duration * 10 ** 12
+    txs = [
+        reserve.createStream(bob, deposit, aave_token_proxy, start, start + duration, {'from': admin})
+        for _ in range(2)
+    ]
+    gas.check("createStream", txs[0])
+    gas.check("createStream(second)", txs[1])
+    first, second = (tx.events['CreateStream']['streamId'] for tx in txs)
+
+    chain.mine(timestamp=start + duration // 2)
+    gas.check("withdrawFromStream", reserve.withdrawFromStream(first, deposit // 4, {'from': bob}))
+    gas.check("cancelStream(withdrawn)", reserve.cancelStream(first, {'from': admin}))
+    gas.check("cancelStream", reserve.cancelStream(second, {'from': admin}))
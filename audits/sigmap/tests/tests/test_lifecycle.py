@@ -0,0 +1,49 @@
+import pytest
+
+from helpers.lifecycle import ProposalSpec
+
+
+def noop_spec(short_executor, target, creator):
+    # Calls `target` without data, so any account can be a target
+    return ProposalSpec(short_executor, [target], [0], [''], [b''], [False], b'\x01' * 32, creator)
+
+
+# Tests every step of two proposals is mined in a single block
+def test_lifecycle_batches_blocks(lifecycle, alice, chain, aave_governance_v2, short_executor, top_aave_holders):
+    proposal_count = aave_governance_v2.getProposalsCount()
+    create_txs = lifecycle.create(
+        noop_spec(short_executor, alice, top_aave_holders[0]),
+        noop_spec(short_executor, alice, top_aave_holders[1]),
+    )
+    assert len({tx.block_number for tx in create_txs}) == 1
+    ids = [tx.events['ProposalCreated']['id'] for tx in create_txs]
+    assert ids == [proposal_count, proposal_count + 1]
+
+    for proposal_id in ids:
+        vote_txs = lifecycle.vote(proposal_id, for_=top_aave_holders[:8], against=top_aave_holders[8:])
+        start_block = aave_governance_v2.getProposalById(proposal_id)['startBlock']
+        assert {tx.block_number for tx in vote_txs} == {chain.height}
+        assert chain.height > start_block
+        assert aave_governance_v2.getProposalById(proposal_id)['againstVotes'] > 0
+
+    queue_txs = lifecycle.queue(*ids)
+    end_block = max(aave_governance_v2.getProposalById(i)['endBlock'] for i in ids)
+    assert {tx.block_number for tx in queue_txs} == {end_block + 1}
+    assert [aave_governance_v2.getProposalState(i) for i in ids] == [5, 5] # Queued
+
+    execute_txs = lifecycle.execute(*ids)
+    assert len({tx.block_number for tx in execute_txs}) == 1
+    assert [aave_governance_v2.getProposalState(i) for i in ids] == [7, 7] # Executed
+
+
+# Tests a full lifecycle and that a reverted transaction in a batch is reported
+def test_lifecycle_run(lifecycle, alice, aave_governance_v2, short_executor, top_aave_holders):
+    result = lifecycle.run(noop_spec(short_executor, alice, top_aave_holders[0]), for_=top_aave_holders[:5])
+    assert len(result.vote_txs) == 5
+    assert aave_governance_v2.getProposalState(result.proposal_id) == 7 # Executed
+
+    (create_tx,) = lifecycle.create(noop_spec(short_executor, alice, top_aave_holders[0]))
+    proposal_id = create_tx.events['ProposalCreated']['id']
+    # The second vote of the same voter reverts once the first is mined in the same block
+    with pytest.raises(RuntimeError, match="1 of 2 transactions reverted"):
+        lifecycle.vote(proposal_id, for_=top_aave_holders[:1], against=top_aave_holders[:1])
@@ -0,0 +1,37 @@
+import pytest
+
+from helpers.mainnet import MAINNET, MainnetContracts
+
+
+# Handles independent of the session's, so none is bound by earlier tests
+@pytest.fixture
+def contracts(web3, AaveGovernanceV2, GovernanceStrategy, OldExecutor, InitializableAdminUpgradeabilityProxy):
+    return MainnetContracts(web3, {
+        'AaveGovernanceV2': AaveGovernanceV2,
+        'GovernanceStrategy': GovernanceStrategy,
+        'OldExecutor': OldExecutor,
+        'InitializableAdminUpgradeabilityProxy': InitializableAdminUpgradeabilityProxy,
+    })
+
+
+# Tests a handle is only looked up when one of its contract attributes is used
+def test_lazy_handle(contracts, aave_governance_v2):
+    executor = contracts['long_executor']
+    assert str(executor) == executor.address == MAINNET['long_executor'][1]
+    assert executor == executor.address.lower()
+    assert aave_governance_v2.isExecutorAuthorized(executor)
+    assert not executor.bound
+
+    assert executor.GRACE_PERIOD() == 432000
+    assert executor.bound
+    assert executor.bind() is executor.bind()
+    assert aave_governance_v2.owner() == executor
+
+
+# Tests `preload()` binds every handle named, or all
+def test_preload(contracts):
+    handles = contracts.preload('short_executor', 'long_executor')
+    assert [handle.bound for handle in contracts.handles.values()] == [name in ('short_executor', 'long_executor') for name in MAINNET]
+    assert [handle.GRACE_PERIOD() for handle in handles] == [432000, 432000]
+
+    assert all(handle.bound for handle in contracts.preload())
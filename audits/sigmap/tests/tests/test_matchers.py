@@ -0,0 +1,55 @@
+import pytest
+
+from helpers.matchers import (
+    CancelledAction,
+    ExecutedAction,
+    Proposal,
+    QueuedAction,
+    assert_events,
+    assert_proposals,
+    canonical,
+    decode_logs,
+    fetch_proposals,
+)
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS
+
+
+# Tests events decoded from raw logs against brownie's decoding of the same transactions
+@pytest.mark.no_fork
+def test_decode_logs(alice, bob, chain, Executor):
+    executor = alice.deploy(Executor, alice, *NEW_LONG_EXECUTOR_ARGS.values())
+    action = (bob, 1, 'execute()', b'\x01\x02', chain.time() + 2 * NEW_LONG_EXECUTOR_ARGS['delay'], False)
+
+    for method, name in ((executor.queueTransaction, 'QueuedAction'), (executor.cancelTransaction, 'CancelledAction')):
+        tx = method(*action, {'from': alice})
+        (event,) = decode_logs(tx.logs)
+        assert event.name == name
+        assert event.address == executor.address
+        assert {field: canonical(value) for field, value in event.fields.items()} == {
+            field: canonical(value) for field, value in tx.events[name].items()
+        }
+
+    assert_events(tx, CancelledAction(target=bob, value=1, signature='execute()', data=b'\x01\x02'))
+
+    # Every differing field and missing event is reported at once
+    with pytest.raises(AssertionError, match="3 event fields differ") as e:
+        assert_events(tx, CancelledAction(value=2, data='0x'), ExecutedAction(value=1))
+    assert "CancelledAction[0].value: expected 2, got 1" in str(e.value)
+    assert "ExecutedAction[0]: not emitted" in str(e.value)
+
+    with pytest.raises(TypeError):
+        QueuedAction(delay=1)
+
+
+# Tests batched proposal structs against `getProposalById()`
+def test_fetch_proposals(web3, aave_governance_v2):
+    ids = [1, 50, 91]
+    for proposal, proposal_id in zip(fetch_proposals(web3, aave_governance_v2, ids), ids):
+        fetched = aave_governance_v2.getProposalById(proposal_id)
+        assert {field: canonical(value) for field, value in proposal.items()} == {
+            field: canonical(value) for field, value in fetched.dict().items()
+        }
+
+    assert_proposals(web3, aave_governance_v2, Proposal(id=1, executed=True, canceled=False))
+    with pytest.raises(AssertionError, match="Proposal\\(1\\).executed: expected False, got True"):
+        assert_proposals(web3, aave_governance_v2, Proposal(id=1, executed=False))
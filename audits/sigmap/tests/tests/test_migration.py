@@ -1,8 +1,24 @@
-from eth_abi import encode_abi
+from helpers.actions import action_hash
+from helpers.matchers import (
+    ExecutedAction,
+    Proposal,
+    ProposalCreated,
+    ProposalExecuted,
+    QueuedAction,
+    Satisfies,
+    VoteEmitted,
+    assert_events,
+    assert_proposals,
+)
+from helpers.migration import IPFS_HASH_LONG, IPFS_HASH_RESERVE
+from helpers.multicall import Read
 
 # Helper test to setup contracts
 def test_setup(
+    fork_state,
+    assert_state,
     constants,
+    mainnet,
     aave_governance_v2,
     short_executor,
     long_executor,
@@ -11,433 +27,328 @@ def test_setup(
     stk_aave_proxy,
     stk_abpt_proxy,
 ):
-    assert aave_governance_v2.NAME() == "Aave Governance v2"
-    assert aave_governance_v2.owner() == long_executor
-    assert aave_governance_v2.isExecutorAuthorized(short_executor) == True
-    assert aave_governance_v2.isExecutorAuthorized(long_executor) == True
-    assert aave_governance_v2.getVotingDelay() == 0
-    assert aave_governance_v2.getProposalsCount() == 92
-
-    # Short Executor State
-    assert short_executor.GRACE_PERIOD() == 432000
-    assert short_executor.MINIMUM_DELAY() == 86400
-    assert short_executor.MAXIMUM_DELAY() == 864000
-    assert short_executor.MINIMUM_QUORUM() == 200
-    assert short_executor.ONE_HUNDRED_WITH_PRECISION() == 10000
-    assert short_executor.PROPOSITION_THRESHOLD() == 50
-    assert short_executor.VOTE_DIFFERENTIAL() == 50
-    assert short_executor.VOTING_DURATION() == 19200
-    assert short_executor.getAdmin() == aave_governance_v2
-    assert short_executor.getDelay() == 86400
-    assert short_executor.getMinimumPropositionPowerNeeded(aave_governance_v2, 15265830) == 80000000000000000000000
-    assert short_executor.getMinimumVotingPowerNeeded(0) == 0
-    assert short_executor.getPendingAdmin() == constants.ZERO_ADDRESS
-    assert short_executor.isActionQueued(bytes(32)) == False
-    assert short_executor.isProposalOverGracePeriod(aave_governance_v2, 1) == True
-    assert short_executor.isProposalPassed(aave_governance_v2, 1) == True
-    assert short_executor.isPropositionPowerEnough(aave_governance_v2, constants.ZERO_ADDRESS, 15265830) == False
-    assert short_executor.isQuorumValid(aave_governance_v2, 1) == True
-    assert short_executor.isVoteDifferentialValid(aave_governance_v2, 1) == True
-    assert short_executor.validateCreatorOfProposal(aave_governance_v2, constants.ZERO_ADDRESS, 15265830) == False
-    assert short_executor.validateProposalCancellation(aave_governance_v2, constants.ZERO_ADDRESS, 15265830) == True
-    
-    # Long Executor State
-    assert long_executor.GRACE_PERIOD() == 432000
-    assert long_executor.MINIMUM_DELAY() == 604800
-    assert long_executor.MAXIMUM_DELAY() == 864000
-    assert long_executor.MINIMUM_QUORUM() == 2000
-    assert long_executor.ONE_HUNDRED_WITH_PRECISION() == 10000
-    assert long_executor.PROPOSITION_THRESHOLD() == 200
-    assert long_executor.VOTE_DIFFERENTIAL() == 1500
-    assert long_executor.VOTING_DURATION() == 64000
-    assert long_executor.getAdmin() == aave_governance_v2
-    assert long_executor.getDelay() == 604800
-    assert long_executor.getMinimumPropositionPowerNeeded(aave_governance_v2, 15265830) == 320000000000000000000000
-    assert long_executor.getMinimumVotingPowerNeeded(0) == 0
-    assert long_executor.getPendingAdmin() == constants.ZERO_ADDRESS
-    assert long_executor.isActionQueued(bytes(32)) == False
-    assert long_executor.isProposalOverGracePeriod(aave_governance_v2, 1) == True
-    assert long_executor.isProposalPassed(aave_governance_v2, 1) == False
-    assert long_executor.isPropositionPowerEnough(aave_governance_v2, constants.ZERO_ADDRESS, 15265830) == False
-    assert long_executor.isQuorumValid(aave_governance_v2, 1) == False
-    assert long_executor.isVoteDifferentialValid(aave_governance_v2, 1) == False
-    assert long_executor.validateCreatorOfProposal(aave_governance_v2, constants.ZERO_ADDRESS, 15265830) == False
-    assert long_executor.validateProposalCancellation(aave_governance_v2, constants.ZERO_ADDRESS, 15265830) == True
-    
-    # Proxies
-    assert aave_token_proxy.admin.call({'from': long_executor}) == long_executor
-    assert abpt_proxy.admin.call({'from': long_executor}) == long_executor
-    assert stk_aave_proxy.admin.call({'from': long_executor}) == long_executor
-    assert stk_abpt_proxy.admin.call({'from': long_executor}) == long_executor
-
-
-# Tests full migration process
-# a) Deploy new long `Executor`
-# b) Deploy first proposal contract `ProposalPayloadNewLongExecutor`
-# c) `create()` the `ProposalPayloadNewLongExecutor` on `AaveGovernanceV2`
-# d) Deploy `AaveEcosystemReserveV2` and `ProposalPayloadAaveEcosystemReserveWithVoting`
-# e) `create()` the `ProposalPayloadAaveEcosystemReserveWithVoting` on `AaveGovernanceV2`
+    mainnet.preload('aave_token_proxy', 'abpt_proxy', 'stk_aave_proxy', 'stk_abpt_proxy')
+    # Every getter is read in one aggregated call and all mismatches are reported together
+    assert_state([
+        Read(aave_governance_v2.NAME, (), "Aave Governance v2"),
+        Read(aave_governance_v2.owner, (), long_executor),
+        Read(aave_governance_v2.isExecutorAuthorized, (short_executor,), True),
+        Read(aave_governance_v2.isExecutorAuthorized, (long_executor,), True),
+        Read(aave_governance_v2.getVotingDelay, (), 0),
+        Read(aave_governance_v2.getProposalsCount, (), 92),
+
+        # Short Executor State
+        Read(short_executor.GRACE_PERIOD, (), 432000),
+        Read(short_executor.MINIMUM_DELAY, (), 86400),
+        Read(short_executor.MAXIMUM_DELAY, (), 864000),
+        Read(short_executor.MINIMUM_QUORUM, (), 200),
+        Read(short_executor.ONE_HUNDRED_WITH_PRECISION, (), 10000),
+        Read(short_executor.PROPOSITION_THRESHOLD, (), 50),
+        Read(short_executor.VOTE_DIFFERENTIAL, (), 50),
+        Read(short_executor.VOTING_DURATION, (), 19200),
+        Read(short_executor.getAdmin, (), aave_governance_v2),
+        Read(short_executor.getDelay, (), 86400),
+        Read(short_executor.getMinimumPropositionPowerNeeded, (aave_governance_v2, 15265830), 80000000000000000000000),
+        Read(short_executor.getMinimumVotingPowerNeeded, (0,), 0),
+        Read(short_executor.getPendingAdmin, (), constants.ZERO_ADDRESS),
+        Read(short_executor.isActionQueued, (bytes(32),), False),
+        Read(short_executor.isProposalOverGracePeriod, (aave_governance_v2, 1), True),
+        Read(short_executor.isProposalPassed, (aave_governance_v2, 1), True),
+        Read(short_executor.isPropositionPowerEnough, (aave_governance_v2, constants.ZERO_ADDRESS, 15265830), False),
+        Read(short_executor.isQuorumValid, (aave_governance_v2, 1), True),
+        Read(short_executor.isVoteDifferentialValid, (aave_governance_v2, 1), True),
+        Read(short_executor.validateCreatorOfProposal, (aave_governance_v2, constants.ZERO_ADDRESS, 15265830), False),
+        Read(short_executor.validateProposalCancellation, (aave_governance_v2, constants.ZERO_ADDRESS, 15265830), True),
+
+        # Long Executor State
+        Read(long_executor.GRACE_PERIOD, (), 432000),
+        Read(long_executor.MINIMUM_DELAY, (), 604800),
+        Read(long_executor.MAXIMUM_DELAY, (), 864000),
+        Read(long_executor.MINIMUM_QUORUM, (), 2000),
+        Read(long_executor.ONE_HUNDRED_WITH_PRECISION, (), 10000),
+        Read(long_executor.PROPOSITION_THRESHOLD, (), 200),
+        Read(long_executor.VOTE_DIFFERENTIAL, (), 1500),
+        Read(long_executor.VOTING_DURATION, (), 64000),
+        Read(long_executor.getAdmin, (), aave_governance_v2),
+        Read(long_executor.getDelay, (), 604800),
+        Read(long_executor.getMinimumPropositionPowerNeeded, (aave_governance_v2, 15265830), 320000000000000000000000),
+        Read(long_executor.getMinimumVotingPowerNeeded, (0,), 0),
+        Read(long_executor.getPendingAdmin, (), constants.ZERO_ADDRESS),
+        Read(long_executor.isActionQueued, (bytes(32),), False),
+        Read(long_executor.isProposalOverGracePeriod, (aave_governance_v2, 1), True),
+        Read(long_executor.isProposalPassed, (aave_governance_v2, 1), False),
+        Read(long_executor.isPropositionPowerEnough, (aave_governance_v2, constants.ZERO_ADDRESS, 15265830), False),
+        Read(long_executor.isQuorumValid, (aave_governance_v2, 1), False),
+        Read(long_executor.isVoteDifferentialValid, (aave_governance_v2, 1), False),
+        Read(long_executor.validateCreatorOfProposal, (aave_governance_v2, constants.ZERO_ADDRESS, 15265830), False),
+        Read(long_executor.validateProposalCancellation, (aave_governance_v2, constants.ZERO_ADDRESS, 15265830), True),
+
+        # Proxies
+        Read(aave_token_proxy.admin, ({'from': long_executor},), long_executor),
+        Read(abpt_proxy.admin, ({'from': long_executor},), long_executor),
+        Read(stk_aave_proxy.admin, ({'from': long_executor},), long_executor),
+        Read(stk_abpt_proxy.admin, ({'from': long_executor},), long_executor),
+    ])
+
+
+# Migration process, each test reverts to the stage it needs (see `migration` in `conftest.py`)
+# a) Deploy first proposal contract `ProposalPayloadNewLongExecutor` for the new long `Executor`'s address
+# b) `create()` the `ProposalPayloadNewLongExecutor` on `AaveGovernanceV2`
+# c) Deploy `AaveEcosystemReserveV2` and `ProposalPayloadAaveEcosystemReserveWithVoting`
+# d) `create()` the `ProposalPayloadAaveEcosystemReserveWithVoting` on `AaveGovernanceV2`
+# e) Deploy new long `Executor`
 # f) Vote, queue and execute `ProposalPayloadAaveEcosystemReserveWithVoting`
-# g) Create, vote, queue and execute a new proposal on the new executor to ensure it works
-# Note: this test is very slow as we need to mine 19,200 + 5,600 + 39,000 + 40,000 blocks
-def test_governance_migration(
-    accounts,
-    chain,
-    constants,
+# g) Vote, queue and execute `ProposalPayloadNewLongExecutor`
+# h) Create, vote, queue and execute a new proposal on the new executor to ensure it works
+
+
+# Tests the payloads are deployed for the new long `Executor`, which has no code yet
+def test_payloads_deployed(payloads_deployed, web3, aave_governance_v2, long_executor):
+    state = payloads_deployed
+
+    assert state.proposal_long_executor.NEW_LONG_EXECUTOR() == state.new_long_executor_address
+    assert web3.eth.get_code(state.new_long_executor_address) == b''
+    assert aave_governance_v2.getProposalsCount() == state.proposal_id_long
+    assert aave_governance_v2.owner() == long_executor
+
+
+# Tests `create()` of `ProposalPayloadNewLongExecutor` and `ProposalPayloadAaveEcosystemReserveWithVoting`
+def test_proposals_created(
+    proposals_created,
     web3,
     aave_governance_v2,
     governance_strategy,
     short_executor,
     long_executor,
-    aave_token_proxy,
-    abpt_proxy,
-    stk_aave_proxy,
-    stk_abpt_proxy,
-    aave_ecosystem_reserve_proxy,
     top_aave_holders,
-    AaveEcosystemReserveV2,
-    Executor,
-    ProposalPayloadNewLongExecutor,
-    ProposalPayloadAaveEcosystemReserveWithVoting,
 ):
-    # Deploy `Executor` as the new long executor
-    new_long_executor = accounts[0].deploy(
-        Executor,
-        aave_governance_v2, # admin
-        constants.DAY, # delay
-        5 * constants.DAY, # gracePeriod
-        constants.DAY, # minimumDelay
-        10 * constants.DAY, # maximumDelay
-        125, # propositionThreshold (1.25%)
-        64_000, # voteDuration (64,000 blocks)
-        650, # voteDifferential (6.5%)
-        650, # minimumQuorum
+    state = proposals_created
+
+    # Fields shared by the `ProposalCreated` event and the proposal struct
+    tx = state.create_long_tx
+    long_fields = dict(
+        id=state.proposal_id_long,
+        creator=top_aave_holders[3],
+        executor=long_executor,
+        targets=[state.proposal_long_executor],
+        values=[0],
+        signatures=['execute()'],
+        calldatas=['0x'],
+        withDelegatecalls=[True],
+        startBlock=tx.block_number,
+        endBlock=tx.block_number + 64_000,
+        strategy=governance_strategy,
+        ipfsHash=IPFS_HASH_LONG,
+    )
+    assert_events(tx, ProposalCreated(**long_fields))
+
+    tx = state.create_reserve_tx
+    reserve_fields = dict(
+        id=state.proposal_id_reserve,
+        creator=top_aave_holders[0],
+        executor=short_executor,
+        targets=[state.proposal_reserve_with_voting],
+        values=[0],
+        signatures=['execute()'],
+        calldatas=['0x'],
+        withDelegatecalls=[True],
+        startBlock=tx.block_number,
+        endBlock=tx.block_number + 19_200,
+        strategy=governance_strategy,
+        ipfsHash=IPFS_HASH_RESERVE,
+    )
+    assert_events(tx, ProposalCreated(**reserve_fields))
+
+    not_voted = dict(executionTime=0, forVotes=0, againstVotes=0, executed=False, canceled=False)
+    assert_proposals(
+        web3,
+        aave_governance_v2,
+        Proposal(**long_fields, **not_voted),
+        Proposal(**reserve_fields, **not_voted),
     )
 
-    # Fetch the current proposal count before it's updated
-    proposal_id_long = aave_governance_v2.getProposalsCount()
+    assert aave_governance_v2.getProposalState(state.proposal_id_long) == 2 # Active
+    assert aave_governance_v2.getProposalState(state.proposal_id_reserve) == 2 # Active
 
-    # Deploy the `ProposalPayloadNewLongExecutor`
-    proposal_long_executor = accounts[0].deploy(
-        ProposalPayloadNewLongExecutor,
-        new_long_executor
-    )
 
-    # `create()` for `ProposalPayloadNewLongExecutor`
-    values = [0]
-    targets = [proposal_long_executor]
-    signatures = ['execute()']
-    calldatas = [b'']
-    with_delegate_calls = [True]
-    ipfs_hash_long = b'\x12' * 32
-    creator_long = top_aave_holders[3]
-    tx = aave_governance_v2.create(
-        long_executor,
-        targets,
-        values,
-        signatures,
-        calldatas,
-        with_delegate_calls,
-        ipfs_hash_long,
-        {'from': creator_long}
-    )
+# Tests the new long `Executor` is deployed as configured, at the address the payload was deployed for
+def test_executor_deployed(executor_deployed, constants, aave_governance_v2):
+    state = executor_deployed
 
-    # Validate `ProposalCreated` event
-    start_block_long = tx.block_number
-    end_block_long = start_block_long + 64_000
-    assert tx.events['ProposalCreated']['id'] == proposal_id_long
-    assert tx.events['ProposalCreated']['creator'] == creator_long
-    assert tx.events['ProposalCreated']['executor'] == long_executor
-    assert tx.events['ProposalCreated']['targets'] == targets
-    assert tx.events['ProposalCreated']['values'] == values
-    assert tx.events['ProposalCreated']['signatures'] == signatures
-    assert tx.events['ProposalCreated']['calldatas'] == ['0x']
-    assert tx.events['ProposalCreated']['withDelegatecalls'] == with_delegate_calls
-    assert tx.events['ProposalCreated']['startBlock'] == start_block_long
-    assert tx.events['ProposalCreated']['endBlock'] == end_block_long
-    assert tx.events['ProposalCreated']['strategy'] == governance_strategy
-    assert tx.events['ProposalCreated']['ipfsHash'] == '0x' + ipfs_hash_long.hex()
-
-    fetched_proposal = aave_governance_v2.getProposalById(proposal_id_long)
-    assert fetched_proposal['id'] == proposal_id_long
-    assert fetched_proposal['creator'] == creator_long
-    assert fetched_proposal['executor'] == long_executor
-    assert fetched_proposal['targets'] == targets
-    assert fetched_proposal['values'] == values
-    assert fetched_proposal['signatures'] == signatures
-    assert fetched_proposal['calldatas'] == ['0x']
-    assert fetched_proposal['withDelegatecalls'] == [True]
-    assert fetched_proposal['startBlock'] == start_block_long
-    assert fetched_proposal['endBlock'] == end_block_long
-    assert fetched_proposal['executionTime'] == 0
-    assert fetched_proposal['forVotes'] == 0
-    assert fetched_proposal['againstVotes'] == 0
-    assert fetched_proposal['executed'] == False
-    assert fetched_proposal['canceled'] == False
-    assert fetched_proposal['strategy'] == governance_strategy
-    assert fetched_proposal['ipfsHash'] == '0x' + ipfs_hash_long.hex()
-
-    # Deploy the updated `AaveEcosystemReserveV2`
-    aave_ecosystem_reserve_v2 = accounts[0].deploy(AaveEcosystemReserveV2)
-
-    # Deploy the `ProposalPayloadAaveEcosystemReserveWithVoting`
-    proposal_reserve_with_voting = accounts[0].deploy(
-        ProposalPayloadAaveEcosystemReserveWithVoting,
-        aave_ecosystem_reserve_v2,
-        proposal_id_long,
-    )
+    assert state.new_long_executor == state.new_long_executor_address
+    assert state.new_long_executor.getAdmin() == aave_governance_v2
+    assert state.new_long_executor.getDelay() == constants.DAY
+    assert state.new_long_executor.GRACE_PERIOD() == 5 * constants.DAY
+    assert state.new_long_executor.PROPOSITION_THRESHOLD() == 125
+    assert state.new_long_executor.VOTING_DURATION() == 64_000
+    assert state.new_long_executor.VOTE_DIFFERENTIAL() == 650
+    assert state.new_long_executor.MINIMUM_QUORUM() == 650
 
-    # `create()` for `ProposalPayloadAaveEcosystemReserveWithVoting`
-    values = [0]
-    targets = [proposal_reserve_with_voting]
-    signatures = ['execute()']
-    calldatas = [b'']
-    with_delegate_calls = [True]
-    ipfs_hash_short = b'\xab' * 32
-    creator_short = top_aave_holders[0] # Using aAAVE contract as creator to reach 2% requirement
-    tx = aave_governance_v2.create(
-        short_executor,
-        targets,
-        values,
-        signatures,
-        calldatas,
-        with_delegate_calls,
-        ipfs_hash_short,
-        {'from': creator_short}
-    )
 
-    # Validate creating proposal
-    proposal_id_reserve = proposal_id_long + 1
-    start_block_reserve = tx.block_number
-    end_block_reserve = tx.block_number + 19_200
-
-    assert tx.events['ProposalCreated']['id'] == proposal_id_reserve
-    assert tx.events['ProposalCreated']['creator'] == creator_short
-    assert tx.events['ProposalCreated']['executor'] == short_executor
-    assert tx.events['ProposalCreated']['targets'] == [proposal_reserve_with_voting]
-    assert tx.events['ProposalCreated']['values'] == [0]
-    assert tx.events['ProposalCreated']['signatures'] == ['execute()']
-    assert tx.events['ProposalCreated']['calldatas'] == ['0x']
-    assert tx.events['ProposalCreated']['withDelegatecalls'] == [True]
-    assert tx.events['ProposalCreated']['startBlock'] == start_block_reserve
-    assert tx.events['ProposalCreated']['endBlock'] == end_block_reserve
-    assert tx.events['ProposalCreated']['strategy'] == governance_strategy
-    assert tx.events['ProposalCreated']['ipfsHash'] == '0x' + ipfs_hash_short.hex()
-
-    fetched_proposal = aave_governance_v2.getProposalById(proposal_id_reserve)
-    assert fetched_proposal['id'] == proposal_id_reserve
-    assert fetched_proposal['creator'] == creator_short
-    assert fetched_proposal['executor'] == short_executor
-    assert fetched_proposal['targets'] == [proposal_reserve_with_voting]
-    assert fetched_proposal['values'] == [0]
-    assert fetched_proposal['signatures'] == ['execute()']
-    assert fetched_proposal['calldatas'] == ['0x']
-    assert fetched_proposal['withDelegatecalls'] == [True]
-    assert fetched_proposal['startBlock'] == start_block_reserve
-    assert fetched_proposal['endBlock'] == end_block_reserve
-    assert fetched_proposal['executionTime'] == 0
-    assert fetched_proposal['forVotes'] == 0
-    assert fetched_proposal['againstVotes'] == 0
-    assert fetched_proposal['executed'] == False
-    assert fetched_proposal['canceled'] == False
-    assert fetched_proposal['strategy'] == governance_strategy
-    assert fetched_proposal['ipfsHash'] == '0x' + ipfs_hash_short.hex()
-
-    # Both proposal are now created we may begin voting. Vote on `ProposalPayloadAaveEcosystemReserveWithVoting` first.
-    aave_governance_v2.submitVote(proposal_id_reserve, True, {'from': top_aave_holders[-1]})
-    aave_governance_v2.submitVote(proposal_id_reserve, True, {'from': top_aave_holders[-2]})
-    aave_governance_v2.submitVote(proposal_id_reserve, True, {'from': top_aave_holders[-3]})
-    aave_governance_v2.submitVote(proposal_id_reserve, True, {'from': top_aave_holders[-4]})
-    aave_governance_v2.submitVote(proposal_id_reserve, True, {'from': top_aave_holders[-5]})
-
-    # Pass time and blocks such that reserve proposal is succeeded but long vote is still active
-    print('Mining', 19_201, 'blocks')
-    chain.mine(19_201, timedelta=19_201 * 15)
-
-    assert aave_governance_v2.getProposalState(proposal_id_reserve) == 4 # Succeeded
-    assert aave_governance_v2.getProposalState(proposal_id_long) == 2 # Active
-
-    # Queue `ProposalPayloadAaveEcosystemReserveWithVoting`
-    tx = aave_governance_v2.queue(proposal_id_reserve, {'from': accounts[0]})
+# Tests voting, queuing and executing `ProposalPayloadAaveEcosystemReserveWithVoting`
+def test_reserve_proposal_executed(
+    reserve_executed,
+    web3,
+    accounts,
+    aave_governance_v2,
+    governance_strategy,
+    short_executor,
+    long_executor,
+    aave_ecosystem_reserve_proxy,
+    top_aave_holders,
+):
+    state = reserve_executed
+    start_block_reserve = state.create_reserve_tx.block_number
+    start_block_long = state.create_long_tx.block_number
 
     # Calculate action hash
+    tx = state.queue_reserve_tx
     execution_time = tx.timestamp + 86_400
-    encoded_action = encode_abi(
-        [
-            "address",
-            "uint256",
-            "string",
-            "bytes",
-            "uint256",
-            "bool"
-        ],
-        [
-            proposal_reserve_with_voting.address, # target
-            0, # value
-            'execute()', # signature
-            b'', # data
-            execution_time, # executionTime
-            True # withDelegateCall
-        ]
-    )[:-32] # ignore the last 32 bytes as these are only included in certain solidity versions
-    action_hash = web3.solidityKeccak(
-        ['bytes'],
-        [encoded_action]
+    reserve_action_hash = action_hash(
+        state.proposal_reserve_with_voting.address, 0, 'execute()', b'', execution_time, True
+    )
+    action = dict(
+        actionHash=reserve_action_hash,
+        target=state.proposal_reserve_with_voting,
+        value=0,
+        signature='execute()',
+        data='0x',
+        executionTime=execution_time,
+        withDelegatecall=True,
     )
 
     # Validate queuing
-    assert aave_governance_v2.getProposalState(proposal_id_reserve) == 5 # Queued
-    assert tx.events['QueuedAction']['target'] == proposal_reserve_with_voting
-    assert tx.events['QueuedAction']['value'] == 0
-    assert tx.events['QueuedAction']['signature'] == 'execute()'
-    assert tx.events['QueuedAction']['data'] == '0x'
-    assert tx.events['QueuedAction']['executionTime'] == execution_time
-    assert tx.events['QueuedAction']['withDelegatecall'] == True
-    assert tx.events['QueuedAction']['actionHash'] == action_hash.hex()
-
-    # Pass time and blocks such that reserve proposal is executable but long vote is still active
-    print('Mining', 86_401 // 15, 'blocks')
-    chain.mine(86_401 // 15, timedelta=86_401)
+    assert_events(tx, QueuedAction(**action))
 
     # Fetch `AaveEcosystemReserve` voting power
-    reserve_voting_power = governance_strategy.getVotingPowerAt(aave_ecosystem_reserve_proxy, start_block_reserve)
-    
-    # Execute `ProposalPayloadAaveEcosystemReserveWithVoting`
-    tx = aave_governance_v2.execute(proposal_id_reserve, {'from': accounts[0]})
+    reserve_voting_power = governance_strategy.getVotingPowerAt(aave_ecosystem_reserve_proxy, start_block_long)
 
     # Validate proposal execution was successful
-    assert tx.events['ProposalExecuted']['id'] == proposal_id_reserve
-    assert tx.events['ProposalExecuted']['initiatorExecution'] == accounts[0]
-
-    assert tx.events['ExecutedAction']['target'] == proposal_reserve_with_voting
-    assert tx.events['ExecutedAction']['value'] == 0
-    assert tx.events['ExecutedAction']['signature'] == 'execute()'
-    assert tx.events['ExecutedAction']['executionTime'] == execution_time
-    assert tx.events['ExecutedAction']['withDelegatecall'] == True
-    assert tx.events['ExecutedAction']['resultData'] == '0x'
-    assert tx.events['ExecutedAction']['actionHash'] == action_hash.hex()
-
-    assert tx.events['VoteEmitted']['id'] == proposal_id_long
-    assert tx.events['VoteEmitted']['voter'] == aave_ecosystem_reserve_proxy
-    assert tx.events['VoteEmitted']['support'] == True
-    assert tx.events['VoteEmitted']['votingPower'] == reserve_voting_power
-
-    # Valdiate reserve proposal state
-    fetched_proposal = aave_governance_v2.getProposalById(proposal_id_reserve)
-    assert fetched_proposal['id'] == proposal_id_reserve
-    assert fetched_proposal['creator'] == creator_short
-    assert fetched_proposal['executor'] == short_executor
-    assert fetched_proposal['targets'] == [proposal_reserve_with_voting]
-    assert fetched_proposal['values'] == [0]
-    assert fetched_proposal['signatures'] == ['execute()']
-    assert fetched_proposal['calldatas'] == ['0x']
-    assert fetched_proposal['withDelegatecalls'] == [True]
-    assert fetched_proposal['startBlock'] == start_block_reserve
-    assert fetched_proposal['endBlock'] == end_block_reserve
-    assert fetched_proposal['executionTime'] == execution_time
-    assert fetched_proposal['forVotes'] > 0
-    assert fetched_proposal['againstVotes'] == 0
-    assert fetched_proposal['executed'] == True
-    assert fetched_proposal['canceled'] == False
-    assert fetched_proposal['strategy'] == governance_strategy
-    assert fetched_proposal['ipfsHash'] == '0x' + ipfs_hash_short.hex()
-
-    # Validate long proposal state
-    fetched_proposal = aave_governance_v2.getProposalById(proposal_id_long)
-    assert fetched_proposal['id'] == proposal_id_long
-    assert fetched_proposal['creator'] == creator_long
-    assert fetched_proposal['executor'] == long_executor
-    assert fetched_proposal['targets'] == [proposal_long_executor]
-    assert fetched_proposal['values'] == [0]
-    assert fetched_proposal['signatures'] == ['execute()']
-    assert fetched_proposal['calldatas'] == ['0x']
-    assert fetched_proposal['withDelegatecalls'] == [True]
-    assert fetched_proposal['startBlock'] == start_block_long
-    assert fetched_proposal['endBlock'] == end_block_long
-    assert fetched_proposal['executionTime'] == 0
-    assert fetched_proposal['forVotes'] == reserve_voting_power
-    assert fetched_proposal['againstVotes'] == 0
-    assert fetched_proposal['executed'] == False
-    assert fetched_proposal['canceled'] == False
-    assert fetched_proposal['strategy'] == governance_strategy
-    assert fetched_proposal['ipfsHash'] == '0x' + ipfs_hash_long.hex()
-
-    # Vote on long proposals
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[0]}) # binance
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[1]}) # binance
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[5]}) # EOA
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[6]}) # EOA
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[7]}) # EOA
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[8]}) # EOA
-    aave_governance_v2.submitVote(proposal_id_long, True, {'from': top_aave_holders[9]}) # EOA
+    assert_events(
+        state.execute_reserve_tx,
+        ProposalExecuted(id=state.proposal_id_reserve, initiatorExecution=accounts[0]),
+        ExecutedAction(**action, resultData='0x'),
+        VoteEmitted(
+            id=state.proposal_id_long,
+            voter=aave_ecosystem_reserve_proxy,
+            support=True,
+            votingPower=reserve_voting_power,
+        ),
+    )
 
-    # Pass time such that vote is now closed
-    blocks_to_mine = end_block_long - chain.height + 1
-    print('Mining', blocks_to_mine, 'blocks')
-    chain.mine(blocks_to_mine, timedelta=blocks_to_mine * 15)
+    # Validate reserve and long proposal state
+    assert_proposals(
+        web3,
+        aave_governance_v2,
+        Proposal(
+            id=state.proposal_id_reserve,
+            creator=top_aave_holders[0],
+            executor=short_executor,
+            targets=[state.proposal_reserve_with_voting],
+            values=[0],
+            signatures=['execute()'],
+            calldatas=['0x'],
+            withDelegatecalls=[True],
+            startBlock=start_block_reserve,
+            endBlock=start_block_reserve + 19_200,
+            executionTime=execution_time,
+            forVotes=Satisfies(lambda votes: votes > 0, '> 0'),
+            againstVotes=0,
+            executed=True,
+            canceled=False,
+            strategy=governance_strategy,
+            ipfsHash=IPFS_HASH_RESERVE,
+        ),
+        Proposal(
+            id=state.proposal_id_long,
+            creator=top_aave_holders[3],
+            executor=long_executor,
+            targets=[state.proposal_long_executor],
+            values=[0],
+            signatures=['execute()'],
+            calldatas=['0x'],
+            withDelegatecalls=[True],
+            startBlock=start_block_long,
+            endBlock=start_block_long + 64_000,
+            executionTime=0,
+            forVotes=reserve_voting_power,
+            againstVotes=0,
+            executed=False,
+            canceled=False,
+            strategy=governance_strategy,
+            ipfsHash=IPFS_HASH_LONG,
+        ),
+    )
+
+    assert aave_governance_v2.getProposalState(state.proposal_id_reserve) == 7 # Executed
+    assert aave_governance_v2.getProposalState(state.proposal_id_long) == 2 # Active
 
-    assert aave_governance_v2.getProposalState(proposal_id_long) == 4 # Succeeded
 
-    # Queue `ProposalPayloadAaveEcosystemReserveWithVoting`
-    tx = aave_governance_v2.queue(proposal_id_long, {'from': accounts[0]})
+# Tests voting and queuing `ProposalPayloadNewLongExecutor`
+def test_long_proposal_queued(long_queued, aave_governance_v2, long_executor):
+    state = long_queued
 
     # Calculate action hash
+    tx = state.queue_long_tx
     execution_time = tx.timestamp + 604_800
-    encoded_action = encode_abi(
-        [
-            "address",
-            "uint256",
-            "string",
-            "bytes",
-            "uint256",
-            "bool"
-        ],
-        [
-            proposal_long_executor.address, # target
-            0, # value
-            'execute()', # signature
-            b'', # data
-            execution_time, # executionTime
-            True # withDelegateCall
-        ]
-    )[:-32] # ignore the last 32 bytes as these are only included in certain solidity versions
-    action_hash = web3.solidityKeccak(
-        ['bytes'],
-        [encoded_action]
+    long_action_hash = action_hash(
+        state.proposal_long_executor.address, 0, 'execute()', b'', execution_time, True
     )
 
     # Validate queuing
-    assert aave_governance_v2.getProposalState(proposal_id_long) == 5 # Queued
-    assert tx.events['QueuedAction']['target'] == proposal_long_executor
-    assert tx.events['QueuedAction']['value'] == 0
-    assert tx.events['QueuedAction']['signature'] == 'execute()'
-    assert tx.events['QueuedAction']['data'] == '0x'
-    assert tx.events['QueuedAction']['executionTime'] == execution_time
-    assert tx.events['QueuedAction']['withDelegatecall'] == True
-    assert tx.events['QueuedAction']['actionHash'] == action_hash.hex()
-
-    # Pass time and blocks such that long proposal is executable
-    print('Mining', 604_800 // 15, 'blocks')
-    chain.mine(604_800 // 15, timedelta=604_800)
-
-    # Execute `ProposalPayloadAaveEcosystemReserveWithVoting`
-    tx = aave_governance_v2.execute(proposal_id_long, {'from': accounts[0]})
+    assert aave_governance_v2.getProposalState(state.proposal_id_long) == 5 # Queued
+    assert_events(tx, QueuedAction(
+        actionHash=long_action_hash,
+        target=state.proposal_long_executor,
+        value=0,
+        signature='execute()',
+        data='0x',
+        executionTime=execution_time,
+        withDelegatecall=True,
+    ))
+
+    assert long_executor.isActionQueued(long_action_hash) == True
+
+
+# Tests executing `ProposalPayloadNewLongExecutor`
+def test_new_executor_live(
+    new_executor_live,
+    accounts,
+    aave_governance_v2,
+    short_executor,
+    long_executor,
+    aave_token_proxy,
+    abpt_proxy,
+    stk_aave_proxy,
+    stk_abpt_proxy,
+):
+    state = new_executor_live
+    new_long_executor = state.new_long_executor
 
-    # Validate proposal execution was successful
-    assert tx.events['ProposalExecuted']['id'] == proposal_id_long
-    assert tx.events['ProposalExecuted']['initiatorExecution'] == accounts[0]
+    execution_time = state.queue_long_tx.timestamp + 604_800
+    long_action_hash = action_hash(
+        state.proposal_long_executor.address, 0, 'execute()', b'', execution_time, True
+    )
 
-    assert tx.events['ExecutedAction']['target'] == proposal_long_executor
-    assert tx.events['ExecutedAction']['value'] == 0
-    assert tx.events['ExecutedAction']['signature'] == 'execute()'
-    assert tx.events['ExecutedAction']['executionTime'] == execution_time
-    assert tx.events['ExecutedAction']['withDelegatecall'] == True
-    assert tx.events['ExecutedAction']['resultData'] == '0x'
-    assert tx.events['ExecutedAction']['actionHash'] == action_hash.hex()
+    # Validate proposal execution was successful
+    tx = state.execute_long_tx
+    assert_events(
+        tx,
+        ProposalExecuted(id=state.proposal_id_long, initiatorExecution=accounts[0]),
+        ExecutedAction(
+            actionHash=long_action_hash,
+            target=state.proposal_long_executor,
+            value=0,
+            signature='execute()',
+            executionTime=execution_time,
+            withDelegatecall=True,
+            resultData='0x',
+        ),
+    )
 
     # Validate proposal functionality
     assert aave_governance_v2.getVotingDelay() == 7_200
-    
+
     assert aave_governance_v2.isExecutorAuthorized(short_executor) == True
     assert aave_governance_v2.isExecutorAuthorized(long_executor) == True
     assert aave_governance_v2.isExecutorAuthorized(new_long_executor) == True
@@ -466,13 +377,28 @@ def test_governance_migration(
     assert tx.events['AdminChanged'][3]['previousAdmin'] == long_executor
     assert tx.events['AdminChanged'][3]['newAdmin'] == short_executor
 
+
+# Tests create, vote, queue and execute a new proposal (`setVotingDelay()`) on the new `Executor`
+def test_new_executor_proposal(
+    new_executor_live,
+    accounts,
+    constants,
+    warp,
+    lifecycle,
+    aave_governance_v2,
+    governance_strategy,
+    top_aave_holders,
+):
+    state = new_executor_live
+    new_long_executor = state.new_long_executor
+
     # `create()` for the new `Executor` (`setVotingDelay()`)
     new_voting_delay = 10_000
 
     values = [0]
     targets = [aave_governance_v2]
     signatures = [b'']
-    calldatas = [aave_governance_v2.setVotingDelay.encode_input(10_000)]
+    calldatas = [aave_governance_v2.setVotingDelay.encode_input(new_voting_delay)]
     with_delegate_calls = [False]
     ipfs_hash_new = b'\xdd' * 32
     creator_long = top_aave_holders[3]
@@ -488,38 +414,31 @@ def test_governance_migration(
     )
 
     # Validate new proposal
-    proposal_id_new = proposal_id_reserve + 1
+    proposal_id_new = state.proposal_id_reserve + 1
     start_block_new = tx.block_number + 7_200
     end_block_new = start_block_new + 64_000
 
-    assert tx.events['ProposalCreated']['id'] == proposal_id_new
-    assert tx.events['ProposalCreated']['creator'] == creator_long
-    assert tx.events['ProposalCreated']['executor'] == new_long_executor
-    assert tx.events['ProposalCreated']['targets'] == [aave_governance_v2]
-    assert tx.events['ProposalCreated']['values'] == [0]
-    assert tx.events['ProposalCreated']['signatures'] == ['']
-    assert tx.events['ProposalCreated']['calldatas'] == [calldatas[0]]
-    assert tx.events['ProposalCreated']['withDelegatecalls'] == [False]
-    assert tx.events['ProposalCreated']['startBlock'] == start_block_new
-    assert tx.events['ProposalCreated']['endBlock'] == end_block_new
-    assert tx.events['ProposalCreated']['strategy'] == governance_strategy
-    assert tx.events['ProposalCreated']['ipfsHash'] == '0x' + ipfs_hash_new.hex()
-
-    # Pass global creation delay (set in long executor proposal)
-    chain.mine(7_200, timedelta=7_200*15)
-    print('Mining', 7_200, 'blocks')
-
-    # Begin voting on new proposal
-    aave_governance_v2.submitVote(proposal_id_new, True, {'from': top_aave_holders[0]})
-    aave_governance_v2.submitVote(proposal_id_new, True, {'from': top_aave_holders[1]})
-    aave_governance_v2.submitVote(proposal_id_new, True, {'from': top_aave_holders[2]})
-    aave_governance_v2.submitVote(proposal_id_new, True, {'from': top_aave_holders[3]})
-    aave_governance_v2.submitVote(proposal_id_new, True, {'from': top_aave_holders[4]})
+    assert_events(tx, ProposalCreated(
+        id=proposal_id_new,
+        creator=creator_long,
+        executor=new_long_executor,
+        targets=[aave_governance_v2],
+        values=[0],
+        signatures=[''],
+        calldatas=[calldatas[0]],
+        withDelegatecalls=[False],
+        startBlock=start_block_new,
+        endBlock=end_block_new,
+        strategy=governance_strategy,
+        ipfsHash=ipfs_hash_new,
+    ))
+
+    # Pass global creation delay (set in long executor proposal) and vote in the first block after it
+    vote_txs = lifecycle.vote(proposal_id_new, for_=top_aave_holders[:5])
+    assert {vote_tx.block_number for vote_tx in vote_txs} == {start_block_new + 1}
 
     # Pass time such that vote is now closed
-    blocks_to_mine = end_block_new - chain.height + 1
-    print('Mining', blocks_to_mine, 'blocks')
-    chain.mine(blocks_to_mine, timedelta=blocks_to_mine * 15)
+    warp.to(height=end_block_new + 1)
 
     assert aave_governance_v2.getProposalState(proposal_id_new) == 4 # Succeeded
 
@@ -528,30 +447,28 @@ def test_governance_migration(
 
     # Validate queuing
     execution_time = tx.timestamp + constants.DAY
+    action = dict(
+        target=aave_governance_v2,
+        value=0,
+        signature='',
+        data=calldatas[0],
+        executionTime=execution_time,
+        withDelegatecall=False,
+    )
     assert aave_governance_v2.getProposalState(proposal_id_new) == 5 # Queued
-    assert tx.events['QueuedAction']['target'] == aave_governance_v2
-    assert tx.events['QueuedAction']['value'] == 0
-    assert tx.events['QueuedAction']['signature'] == ''
-    assert tx.events['QueuedAction']['data'] == calldatas[0]
-    assert tx.events['QueuedAction']['executionTime'] == execution_time
-    assert tx.events['QueuedAction']['withDelegatecall'] == False
+    assert_events(tx, QueuedAction(**action))
 
-    # Pass execution time shortcut by only mining 1 block
-    chain.mine(1, timedelta=constants.DAY)
+    # Pass time and blocks such that new proposal is executable
+    warp.to(timestamp=execution_time)
 
     # Execute new proposal
     tx = aave_governance_v2.execute(proposal_id_new, {'from': accounts[0]})
 
     # Validate proposal execution was successful
-    assert tx.events['ProposalExecuted']['id'] == proposal_id_new
-    assert tx.events['ProposalExecuted']['initiatorExecution'] == accounts[0]
-
-    assert tx.events['ExecutedAction']['target'] == aave_governance_v2
-    assert tx.events['ExecutedAction']['value'] == 0
-    assert tx.events['ExecutedAction']['signature'] == ''
-    assert tx.events['ExecutedAction']['data'] == calldatas[0]
-    assert tx.events['ExecutedAction']['executionTime'] == execution_time
-    assert tx.events['ExecutedAction']['withDelegatecall'] == False
-    assert tx.events['ExecutedAction']['resultData'] == '0x'
-
-    assert aave_governance_v2.getVotingDelay() == new_voting_delay
\ No newline at end of file
+    assert_events(
+        tx,
+        ProposalExecuted(id=proposal_id_new, initiatorExecution=accounts[0]),
+        ExecutedAction(**action, resultData='0x'),
+    )
+
+    assert aave_governance_v2.getVotingDelay() == new_voting_delay
@@ -0,0 +1,142 @@
+import time
+
+import brownie
+import pytest
+
+from helpers.lifecycle import ProposalSpec
+from helpers.migration import DAY, NEW_LONG_EXECUTOR_ARGS, VARIANT_PROPERTY
+
+# The migration and a follow-up proposal on the new long `Executor` for every configuration and set
+# of voters. All variants branch from one "proposals_created" snapshot per module and worker, the
+# `variant_` ids make each a separate unit of work under xdist (see `helpers/node_pool.py`). Outcomes
+# and timings are printed as the "migration variants" section of the terminal summary.
+pytestmark = pytest.mark.slow
+
+# Constructor arguments of the new long `Executor`
+CONFIGURATIONS = {
+    "deployed": NEW_LONG_EXECUTOR_ARGS,
+    "two_day_delay": {**NEW_LONG_EXECUTOR_ARGS, "delay": 2 * DAY},
+    "short_voting": {**NEW_LONG_EXECUTOR_ARGS, "vote_duration": 19_200},
+    "low_thresholds": {
+        **NEW_LONG_EXECUTOR_ARGS,
+        "proposition_threshold": 100,
+        "vote_differential": 500,
+        "minimum_quorum": 500,
+    },
+    "high_thresholds": {
+        **NEW_LONG_EXECUTOR_ARGS,
+        "proposition_threshold": 300,
+        "vote_differential": 1500,
+        "minimum_quorum": 1500,
+    },
+}
+
+# Indexes in `top_aave_holders` voting for the long proposal and the follow-up proposal
+VOTER_SETS = {
+    "deployed": (0, 1, 5, 6, 7, 8, 9),
+    "exchanges": (0, 1, 2, 3, 4),
+    "eoas": (5, 6, 7, 8, 9),
+}
+
+VARIANTS = {
+    f"variant_{configuration}__{voters}": (CONFIGURATIONS[configuration], VOTER_SETS[voters])
+    for configuration in CONFIGURATIONS
+    for voters in VOTER_SETS
+}
+
+# `AaveGovernanceV2.ProposalState`
+STATES = ["Pending", "Canceled", "Active", "Failed", "Succeeded", "Queued", "Expired", "Executed"]
+
+
+# The migration of the variant, its stages after "proposals_created" replace those of `migration`
+@pytest.fixture(scope="module", params=list(VARIANTS.values()), ids=list(VARIANTS))
+def variant(request, migration, migration_plan, top_aave_holders):
+    executor_args, voters = request.param
+    plan = migration_plan.variant(executor_args, [top_aave_holders[i] for i in voters])
+    migration.branch("proposals_created", plan.stages())
+    return plan
+
+
+# Tests the full migration and a `setVotingDelay()` proposal on the new `Executor`, recording their outcomes
+def test_variant_migration(
+    request,
+    record_property,
+    variant,
+    migration,
+    chain,
+    warp,
+    lifecycle,
+    aave_governance_v2,
+    top_aave_holders,
+):
+    # Recorded first and filled in as the test goes, so a failing variant still has its row
+    row = {"variant": request.node.callspec.id, "migration": "-", "proposal": "-"}
+    record_property(VARIANT_PROPERTY, row)
+
+    # Built by the first variant on each worker, the following ones revert to it
+    start = time.perf_counter()
+    migration.revert_to("proposals_created")
+    row["shared_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    state = migration.revert_to("long_voted")
+    long_state = STATES[aave_governance_v2.getProposalState(state.proposal_id_long)]
+    if long_state == "Succeeded":
+        state = migration.revert_to("new_executor_live")
+    row["migration_s"] = time.perf_counter() - start
+    row["migration"] = "ok" if long_state == "Succeeded" else f"long proposal {long_state}"
+    if long_state != "Succeeded":
+        assert long_state == "Failed"
+        return
+
+    new_long_executor = state.new_long_executor
+    assert aave_governance_v2.owner() == new_long_executor
+    assert aave_governance_v2.isExecutorAuthorized(new_long_executor) == True
+    assert new_long_executor.getDelay() == variant.executor_args['delay']
+    assert new_long_executor.VOTING_DURATION() == variant.executor_args['vote_duration']
+    assert new_long_executor.PROPOSITION_THRESHOLD() == variant.executor_args['proposition_threshold']
+    assert new_long_executor.VOTE_DIFFERENTIAL() == variant.executor_args['vote_differential']
+    assert new_long_executor.MINIMUM_QUORUM() == variant.executor_args['minimum_quorum']
+
+    start = time.perf_counter()
+    try:
+        row["proposal"] = follow_up_proposal(
+            variant, new_long_executor, chain, warp, lifecycle, aave_governance_v2, top_aave_holders
+        )
+    finally:
+        row["proposal_s"] = time.perf_counter() - start
+
+
+# Creates, votes, queues and executes `setVotingDelay(10_000)` on the new `Executor` as far as it gets
+def follow_up_proposal(variant, new_long_executor, chain, warp, lifecycle, governance, top_aave_holders):
+    creator = top_aave_holders[3]
+    calldata = governance.setVotingDelay.encode_input(10_000)
+    spec = ProposalSpec(new_long_executor, [governance], [0], [''], [calldata], [False], b'\xdd' * 32, creator)
+
+    # Checked against the block before the one `create()` is mined in, as the governance does
+    if not new_long_executor.validateCreatorOfProposal(governance, creator, chain.height):
+        # A gas limit skips the estimation, which would fail before the transaction is sent
+        with brownie.reverts('PROPOSITION_CREATION_INVALID'):
+            governance.create(*spec[:-1], {'from': creator, 'gas_limit': 1_000_000})
+        return "below proposition threshold"
+
+    (tx,) = lifecycle.create(spec)
+    proposal_id = tx.events['ProposalCreated']['id']
+    assert tx.events['ProposalCreated']['endBlock'] - tx.events['ProposalCreated']['startBlock'] == (
+        variant.executor_args['vote_duration']
+    )
+
+    lifecycle.vote(proposal_id, for_=variant.voters_long)
+    warp.past_voting(governance, proposal_id)
+    proposal_state = STATES[governance.getProposalState(proposal_id)]
+    if proposal_state != "Succeeded":
+        assert proposal_state == "Failed"
+        assert not new_long_executor.isProposalPassed(governance, proposal_id)
+        return proposal_state
+
+    (tx,) = lifecycle.queue(proposal_id)
+    assert tx.events['QueuedAction']['executionTime'] == tx.timestamp + variant.executor_args['delay']
+    lifecycle.execute(proposal_id)
+    assert STATES[governance.getProposalState(proposal_id)] == "Executed"
+    assert governance.getVotingDelay() == 10_000
+    return "executed"
@@ -0,0 +1,37 @@
+import pytest
+
+from helpers.multicall import Read, StateReads, assert_state_per_call
+
+
+# Tests batched reads against per-call reads, including reverts and sender dependent calls
+def test_state_reads(aave_governance_v2, short_executor, long_executor, aave_token_proxy):
+    rows = [
+        Read(aave_governance_v2.getProposalsCount, (), 92),
+        Read(aave_governance_v2.getVotingDelay, (), 0),
+        Read(short_executor.getDelay, (), 86400),
+        Read(long_executor.isActionQueued, (bytes(32),), False),
+        Read(aave_token_proxy.admin, ({'from': long_executor},), long_executor),
+    ]
+    reads = StateReads()
+    assert reads.read(rows) == [
+        aave_governance_v2.getProposalsCount(),
+        aave_governance_v2.getVotingDelay(),
+        short_executor.getDelay(),
+        long_executor.isActionQueued(bytes(32)),
+        aave_token_proxy.admin.call({'from': long_executor}),
+    ]
+    assert reads.round_trips == 2
+
+    reads.assert_state(rows)
+    assert_state_per_call(rows)
+
+    # Every mismatch is reported, reverts included (no proposal 1000)
+    wrong = rows + [
+        Read(short_executor.getDelay, (), 1),
+        Read(aave_governance_v2.getProposalState, (1_000,), 0),
+    ]
+    for assert_state in (reads.assert_state, assert_state_per_call):
+        with pytest.raises(AssertionError, match="2 of 7 reads differ") as e:
+            assert_state(wrong)
+        assert "getDelay()" in str(e.value)
+        assert "getProposalState(1000)" in str(e.value)
@@ -0,0 +1,21 @@
+import pytest
+
+from helpers.node_pool import scope_of
+
+
+# Tests this process talks to its own fork node, forked at the configured block
+def test_fork_node(fork_node, chain, web3):
+    assert web3.provider.endpoint_uri.endswith(f":{fork_node.port}")
+    assert chain.height >= fork_node.fork_block
+    assert web3.eth.get_block(fork_node.fork_block).number == fork_node.fork_block
+
+
+# Tests xdist scheduling units, modules as with brownie plus one unit per `variant_*` parameter
+@pytest.mark.no_fork
+def test_scope_of():
+    assert scope_of("tests/test_migration.py::test_setup") == "tests/test_migration.py"
+    assert scope_of("tests/test_executor_model.py::test_model_action_hash") == "tests/test_executor_model.py"
+    assert scope_of("tests/test_migration_variants.py::test_variant_new_executor_live[variant_short_voting]") == (
+        "tests/test_migration_variants.py::variant_short_voting"
+    )
+    assert scope_of("tests/test_x.py::test_y[1-variant_a-True]") == "tests/test_x.py::variant_a"
@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pytest
+
+from helpers.lifecycle import ProposalSpec
+from helpers.pipeline import DAY, EXECUTED, EXPIRED, FAILED, Arrivals, Lane, poisson_arrivals, simulate
+
+LANE = Lane('test', 10, 100, DAY, 5 * DAY, 12)
+
+
+# Tests the backlog of a single slot and the timings and outcome of each proposal
+@pytest.mark.no_fork
+def test_simulate_single_slot():
+    window = LANE.voting_window
+    assert window == 111 * 12
+    arrivals = Arrivals(
+        np.array([0.0, 10.0, 20.0, 2.0 * window + 30]),
+        np.array([True, True, False, True]),
+        np.array([5.0, 0.0, 0.0, 0.0]),
+        np.array([60.0, 5 * DAY, 0.0, 5 * DAY + 1]),
+    )
+    run = simulate(LANE, arrivals, slots=1)
+
+    assert run.created.tolist() == [0.0, window, 2.0 * window, 3.0 * window]
+    assert run.waits((0, 100)) == {0: 0.0, 100: 2.0 * window - 20}
+    assert run.outcome.tolist() == [EXECUTED, EXECUTED, FAILED, EXPIRED]
+    assert run.execution_time[0] == window + 5 + DAY
+    assert run.finished.tolist() == [
+        window + 5 + DAY + 60,
+        2 * window + 6 * DAY,
+        3 * window,
+        4 * window + 6 * DAY,
+    ]
+    # The slot is busy from 0 until the last arrival
+    assert run.utilization() == 1.0
+    assert run.latencies((0,)) == {0: window + 5 + DAY + 60}
+
+    # A slot freed when a proposal arrives goes to the backlog first
+    same_time = Arrivals(np.array([0.0, 1.0, window]), np.ones(3, bool), np.zeros(3), np.zeros(3))
+    assert simulate(LANE, same_time, slots=1).created.tolist() == [0.0, window, 2.0 * window]
+
+
+# Tests synthetic streams against the closed forms of their lags and of the capacity of the slots
+@pytest.mark.no_fork
+def test_simulate_poisson():
+    rng = np.random.default_rng(0)
+    slots = 3
+    capacity = LANE.capacity(slots)
+
+    arrivals = poisson_arrivals(50_000, capacity / 2, rng, pass_rate=0.8, execute_lag=2 * DAY)
+    run = simulate(LANE, arrivals, slots)
+    assert run.utilization() == pytest.approx(0.5, rel=0.02)
+    assert run.share(FAILED) == pytest.approx(0.2, abs=0.01)
+    # Exponential lags beyond the grace period
+    assert run.share(EXPIRED) == pytest.approx(0.8 * math.exp(-5 / 2), rel=0.05)
+    assert run.per_month() == pytest.approx(capacity / 2 * run.share(EXECUTED), rel=0.02)
+
+    # Overloaded, the slots are always busy and the backlog grows
+    overloaded = simulate(LANE, poisson_arrivals(50_000, 2 * capacity, rng), slots)
+    assert overloaded.utilization() == pytest.approx(1.0, abs=0.001)
+    assert overloaded.per_month(EXECUTED) + overloaded.per_month(FAILED) < capacity
+    assert overloaded.waits()[50] > run.waits()[99]
+
+
+# Tests the timings and outcomes of proposals on the short executor against the simulation: one
+# failing, one executed and one expiring after the grace period
+def test_simulate_matches_fork(
+    lifecycle, warp, alice, chain, aave_governance_v2, short_executor, top_aave_holders
+):
+    lane = Lane.read('short', aave_governance_v2, short_executor)
+    specs = [
+        ProposalSpec(short_executor, [alice], [0], [''], [b''], [False], bytes([i]) * 32, top_aave_holders[i])
+        for i in range(3)
+    ]
+    ids = [tx.events['ProposalCreated']['id'] for tx in lifecycle.create(*specs)]
+    created = chain.height
+    for proposal_id in ids[:2]:
+        lifecycle.vote(proposal_id, for_=top_aave_holders[:8])
+    # Queued in the first block allowed, executed at `executionTime`, never executed
+    queue_txs = lifecycle.queue(*ids[:2])
+    lifecycle.execute(ids[0])
+    expiry = aave_governance_v2.getProposalById(ids[1])['executionTime'] + lane.grace_period
+    warp.to(timestamp=expiry + 1)
+
+    run = simulate(
+        lane,
+        Arrivals(np.zeros(3), np.array([True, True, False]), np.zeros(3), np.array([0, lane.grace_period + 1, 0])),
+        slots=3,
+    )
+    states = {FAILED: 3, EXECUTED: 7, EXPIRED: 6}
+    assert [aave_governance_v2.getProposalState(i) for i in ids] == [states[o] for o in run.outcome.tolist()]
+    assert short_executor.isProposalOverGracePeriod(aave_governance_v2, ids[1]) == True
+    for tx in queue_txs:
+        assert tx.block_number - created == run.voting_ended[0] / lane.block_time
+        assert tx.events['QueuedAction']['executionTime'] - tx.timestamp == run.execution_time[0] - run.queued[0]
+    assert run.finished[1] - run.execution_time[1] == lane.grace_period
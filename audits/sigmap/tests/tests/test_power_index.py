@@ -0,0 +1,90 @@
+import pytest
+from brownie import Contract
+
+from helpers.power_index import PROPOSITION_POWER, TOKENS, VOTING_POWER, PowerIndex
+
+# Blocks before the fork block indexed by `window_index`
+WINDOW = 2_000
+
+# Holders sampled per token and power type
+SAMPLES = 5
+
+GET_POWER_AT_BLOCK_ABI = [{
+    'name': 'getPowerAtBlock',
+    'type': 'function',
+    'stateMutability': 'view',
+    'inputs': [
+        {'name': 'user', 'type': 'address'},
+        {'name': 'blockNumber', 'type': 'uint256'},
+        {'name': 'delegationType', 'type': 'uint8'},
+    ],
+    'outputs': [{'name': '', 'type': 'uint256'}],
+}]
+
+
+# Index of the last `WINDOW` blocks before the fork, exact for holders with a snapshot in them
+@pytest.fixture(scope="module")
+def window_index(tmp_path_factory, web3, fork_node):
+    index = PowerIndex(tmp_path_factory.mktemp("power-index") / "window.sqlite")
+    index.update(web3.provider.endpoint_uri, fork_node.fork_block, start_block=fork_node.fork_block - WINDOW)
+    yield index
+    index.close()
+
+
+@pytest.fixture(scope="module")
+def tokens():
+    return {
+        token: Contract.from_abi(token, address, GET_POWER_AT_BLOCK_ABI) for token, (address, _) in TOKENS.items()
+    }
+
+
+def snapshots(index, token, power_type):
+    return index.db.execute(
+        'SELECT holder, block FROM power WHERE token = ? AND power_type = ? ORDER BY block, holder',
+        (token, power_type),
+    ).fetchall()
+
+
+# Tests the cursor is stored per token and a second update with no new blocks changes nothing
+def test_update_resumes(window_index, fork_node):
+    for token in TOKENS:
+        assert window_index.cursor(token) == fork_node.fork_block + 1
+    rows = window_index.db.execute('SELECT COUNT(*) FROM power').fetchone()
+
+    calls = []
+    window_index.update('http://unused', fork_node.fork_block, progress=lambda *args: calls.append(args))
+    assert calls == []
+    assert window_index.db.execute('SELECT COUNT(*) FROM power').fetchone() == rows
+
+
+# Tests indexed powers against `getPowerAtBlock()` at sampled snapshots in the window and at the fork
+@pytest.mark.parametrize("power_type", [VOTING_POWER, PROPOSITION_POWER])
+def test_token_power_matches_tokens(window_index, tokens, fork_node, power_type):
+    for token, contract in tokens.items():
+        rows = snapshots(window_index, token, power_type)
+        # From a holder's first snapshot in the window on, the window holds its complete history
+        for holder, block in rows[:: max(len(rows) // SAMPLES, 1)][:SAMPLES]:
+            holder = '0x' + holder.hex()
+            for at in (block, fork_node.fork_block):
+                expected = contract.getPowerAtBlock(holder, at, power_type)
+                assert window_index.token_power(token, holder, at, power_type) == expected, f"{token} {holder} at {at}"
+
+
+# Tests the full index against `GovernanceStrategy.getVotingPowerAt()` for the top holders
+@pytest.mark.slow
+def test_voting_power_matches_strategy(power_index, governance_strategy, fork_node):
+    block = fork_node.fork_block
+    for holder, power in power_index.top_holders(block, 20):
+        assert power == governance_strategy.getVotingPowerAt(holder, block), holder
+        assert power_index.voting_power(holder, block) == power
+
+
+# Tests quorum voters selected from the index reach the quorum of the long executor
+@pytest.mark.slow
+def test_holders_reaching_quorum(power_index, governance_strategy, long_executor, fork_node):
+    block = fork_node.fork_block
+    quorum = long_executor.getMinimumVotingPowerNeeded(governance_strategy.getTotalVotingSupplyAt(block))
+    voters = power_index.holders_reaching(block, quorum)
+
+    assert sum(governance_strategy.getVotingPowerAt(voter, block) for voter in voters) >= quorum
+    assert sum(power_index.voting_power(voter, block) for voter in voters[:-1]) < quorum
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from helpers.matchers import canonical, fetch_proposals
+from helpers.proposal_export import ProposalRecord, ProposalTable, export_proposals
+from helpers.rpc import BATCH_OBSERVERS
+
+
+# Proposals with random fields, every field as `ProposalTable` decodes it
+def synthetic_proposals(ids, seed=0):
+    rng = random.Random(seed)
+    executors = [canonical(f"0x{rng.getrandbits(160):040x}") for _ in range(2)]
+    proposals = []
+    for i in ids:
+        actions = rng.randrange(4)
+        start = rng.randrange(10 ** 7)
+        proposals.append(dict(
+            id=i,
+            creator=canonical(f"0x{rng.getrandbits(160):040x}"),
+            executor=rng.choice(executors),
+            targets=[canonical(f"0x{rng.getrandbits(160):040x}") for _ in range(actions)],
+            values=[rng.choice([0, rng.getrandbits(256)]) for _ in range(actions)],
+            signatures=[rng.choice(['', 'execute()', 'setVotingDelay(uint256)']) for _ in range(actions)],
+            calldatas=[rng.randbytes(rng.randrange(100)) for _ in range(actions)],
+            withDelegatecalls=[rng.random() < 0.5 for _ in range(actions)],
+            startBlock=start,
+            endBlock=start + 19_200,
+            executionTime=rng.choice([0, 1_660_000_000]),
+            forVotes=rng.getrandbits(90),
+            againstVotes=rng.choice([0, rng.getrandbits(80)]),
+            executed=rng.random() < 0.5,
+            canceled=rng.random() < 0.1,
+            strategy=executors[0],
+            ipfsHash=rng.randbytes(32),
+            state=rng.randrange(8),
+        ))
+    return proposals
+
+
+# Tests saved tables load as the same records and merge newer reads by id
+@pytest.mark.no_fork
+def test_table_round_trip(tmp_path):
+    proposals = synthetic_proposals(range(50))
+    table = ProposalTable.from_proposals(reversed(proposals), 100)
+    table.save(tmp_path / "proposals.npz")
+    loaded = ProposalTable.load(tmp_path / "proposals.npz")
+
+    assert (loaded.block, len(loaded)) == (100, 50)
+    assert list(loaded) == [ProposalRecord(**proposal) for proposal in proposals]
+    assert loaded[7] == ProposalRecord(**proposals[7])
+    assert loaded.open_ids() == [p['id'] for p in proposals if p['state'] not in (1, 3, 6, 7)]
+    with pytest.raises(KeyError):
+        loaded[50]
+
+    # A later read of two open proposals and of new ones
+    newer = synthetic_proposals([3, 10, 50, 51], seed=1)
+    merged = loaded.merge(ProposalTable.from_proposals(newer, 200))
+    assert merged.block == 200
+    assert merged.ids.tolist() == list(range(52))
+    assert [merged[i] for i in (3, 10, 50, 51)] == [ProposalRecord(**proposal) for proposal in newer]
+    assert merged[4] == loaded[4]
+    with pytest.raises(ValueError):
+        merged.merge(table)
+
+
+# Tests the export at the fork block against the governance, struct by struct
+def test_export_matches_governance(proposal_table, web3, fork_node, aave_governance_v2):
+    assert proposal_table.block == fork_node.fork_block
+    assert len(proposal_table) == aave_governance_v2.getProposalsCount()
+
+    proposals = fetch_proposals(web3, aave_governance_v2, proposal_table.ids.tolist(), hex(fork_node.fork_block))
+    for record, proposal in zip(proposal_table, proposals):
+        assert {name: canonical(record[name]) for name in proposal} == {
+            name: canonical(value) for name, value in proposal.items()
+        }
+    for proposal_id in proposal_table.ids[::10].tolist():
+        assert proposal_table[proposal_id].state == aave_governance_v2.getProposalState(proposal_id)
+
+
+# Tests an update reads only the proposals created since the export and those still open
+def test_export_appends(proposals_created, proposal_table, web3, chain, aave_governance_v2):
+    state = proposals_created
+    batches = []
+    BATCH_OBSERVERS.append(lambda *request: batches.append(request))
+    try:
+        # One proposal per batch request, so the requests count the proposals read
+        updated = export_proposals(web3, aave_governance_v2, proposal_table, batch_size=1)
+    finally:
+        BATCH_OBSERVERS.pop()
+
+    assert len(batches) == 2 * (len(proposal_table.open_ids()) + 2)
+    assert updated.block == chain.height
+    assert updated.ids.tolist() == list(range(len(proposal_table) + 2))
+    assert updated[state.proposal_id_long].creator == state.create_long_tx.sender
+    assert updated[state.proposal_id_reserve].executor == state.create_reserve_tx.events['ProposalCreated']['executor']
+    for proposal_id in set(proposal_table.ids.tolist()) - set(proposal_table.open_ids()):
+        assert updated[proposal_id] == proposal_table[proposal_id]
@@ -0,0 +1,107 @@
+import pytest
+
+from helpers.matchers import canonical
+from helpers.migration import NEW_LONG_EXECUTOR_ARGS
+from helpers.queue_index import CANCELLED, EXECUTED, QUEUED, QueueIndex
+
+DELAY = NEW_LONG_EXECUTOR_ARGS['delay']
+GRACE_PERIOD = NEW_LONG_EXECUTOR_ARGS['grace_period']
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = QueueIndex(tmp_path / "queue.sqlite")
+    yield index
+    index.close()
+
+
+# A new `Executor` administered by alice with three actions queued, one a day after the other two
+@pytest.fixture
+def executor(alice, bob, chain, Executor):
+    executor = alice.deploy(Executor, alice, *NEW_LONG_EXECUTOR_ARGS.values())
+    execution_time = chain.time() + DELAY + 60
+    actions = [
+        (bob, 0, '', b'', execution_time, False),
+        (bob, 0, 'execute()', b'', execution_time, False),
+        (bob, 0, '', b'\x01', execution_time + DELAY, False),
+    ]
+    txs = [executor.queueTransaction(*action, {'from': alice}) for action in actions]
+    return executor, actions, [canonical(tx.events['QueuedAction']['actionHash']) for tx in txs]
+
+
+# Tests the indexed states and expiry times of queued, executed and cancelled actions
+@pytest.mark.no_fork
+def test_index_follows_actions(index, executor, web3, chain, alice):
+    executor, actions, hashes = executor
+    index.add_executor(executor, GRACE_PERIOD, start_block=executor.tx.block_number)
+    index.update(web3.provider.endpoint_uri, chain.height)
+    assert [action.action_hash for action in index.queued()] == hashes
+    assert [action.expires_at for action in index.queued()] == [action[4] + GRACE_PERIOD for action in actions]
+
+    chain.mine(timestamp=actions[0][4])
+    executor.executeTransaction(*actions[0], {'from': alice})
+    executor.cancelTransaction(*actions[1], {'from': alice})
+    index.update(web3.provider.endpoint_uri, chain.height)
+
+    states = [index.get(action_hash, executor)[0].state for action_hash in hashes]
+    assert states == [EXECUTED, CANCELLED, QUEUED]
+    for action, action_hash in zip(actions, hashes):
+        assert (index.get(action_hash)[0].state == QUEUED) == executor.isActionQueued(action_hash)
+
+    (indexed,) = index.get(hashes[2])
+    assert (indexed.target, indexed.signature, indexed.data, indexed.execution_time) == (
+        actions[2][0],
+        '',
+        b'\x01',
+        actions[2][4],
+    )
+
+
+# Tests the expiry queries at timestamps around the grace periods
+@pytest.mark.no_fork
+def test_expiry_queries(index, executor, web3, chain):
+    executor, actions, hashes = executor
+    index.add_executor(executor, GRACE_PERIOD, start_block=executor.tx.block_number)
+    index.update(web3.provider.endpoint_uri, chain.height)
+    first, last = actions[0][4], actions[2][4]
+
+    assert index.executable(first - 1) == []
+    assert [action.action_hash for action in index.executable(first)] == hashes[:2]
+    assert [action.action_hash for action in index.executable(last)] == hashes
+    assert index.expiring(first, GRACE_PERIOD - 1) == []
+    assert [action.action_hash for action in index.expiring(first, GRACE_PERIOD)] == hashes[:2]
+    assert [action.action_hash for action in index.expired(first + GRACE_PERIOD + 1)] == hashes[:2]
+    assert [action.action_hash for action in index.executable(first + GRACE_PERIOD + 1)] == hashes[2:]
+
+
+# Tests an update resumes from the stored cursor and a cancelled action queued again is queued
+@pytest.mark.no_fork
+def test_cursor_and_requeue(index, executor, web3, chain, alice):
+    executor, actions, hashes = executor
+    index.add_executor(executor, GRACE_PERIOD, start_block=executor.tx.block_number)
+    index.update(web3.provider.endpoint_uri, chain.height)
+    # Registering again keeps the cursor
+    index.add_executor(executor, GRACE_PERIOD)
+    assert index.executors()[executor.address] == (GRACE_PERIOD, chain.height + 1)
+
+    executor.cancelTransaction(*actions[2], {'from': alice})
+    executor.queueTransaction(*actions[2], {'from': alice})
+    calls = []
+    index.update(web3.provider.endpoint_uri, chain.height, progress=lambda *args: calls.append(args))
+
+    assert calls == [(executor.address, chain.height - 1, chain.height, 2)]
+    (indexed,) = index.get(hashes[2])
+    assert (indexed.state, indexed.queued_block) == (QUEUED, chain.height)
+
+
+# Tests every action the index holds as queued on the old executors is queued on chain
+@pytest.mark.slow
+def test_mainnet_executors(index, web3, fork_node, short_executor, long_executor):
+    for executor in (short_executor, long_executor):
+        index.add_executor(executor, executor.GRACE_PERIOD())
+    index.update(web3.provider.endpoint_uri, fork_node.fork_block)
+
+    for executor in (short_executor, long_executor):
+        queued = [action for action in index.queued() if action.executor == executor.address]
+        assert all(executor.isActionQueued(action.action_hash) for action in queued)
+    assert len(index.db.execute('SELECT * FROM action').fetchall()) > 0
@@ -0,0 +1,69 @@
+import pytest
+
+from helpers.read_cache import ReadCache
+
+pytestmark = pytest.mark.no_fork
+
+DAY = 60 * 60 * 24
+
+
+# Tests repeated reads are served once per block and never survive a transaction, a mined block or a revert
+def test_read_cache_invalidation(alice, chain, GovernanceMock):
+    cache = ReadCache()
+    governance = cache.wrap(alice.deploy(GovernanceMock))
+
+    assert governance.executionTime() == 0
+    assert governance.executionTime() == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Transactions pass through the wrapper
+    governance.setExecutionTime(5, {'from': alice})
+    set_block = chain.height
+    assert governance.executionTime() == 5
+    chain.mine()
+    assert governance.executionTime() == 5
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # Past blocks are kept across mined blocks
+    assert governance.executionTime(block_identifier=set_block - 1) == 0
+    chain.mine()
+    assert governance.executionTime(block_identifier=set_block - 1) == 0
+    assert cache.hits == 2
+
+    # The block of an undone transaction is mined again with other state
+    governance.setExecutionTime(7, {'from': alice})
+    height = chain.height
+    assert governance.executionTime() == 7
+    assert governance.executionTime(block_identifier=height) == 7
+    chain.undo()
+    assert governance.executionTime() == 5
+    governance.setExecutionTime(9, {'from': alice})
+    assert chain.height == height
+    assert governance.executionTime(block_identifier=height) == 9
+    assert governance.executionTime() == 9
+    # Kept across the revert
+    assert governance.executionTime(block_identifier=set_block - 1) == 0
+    assert cache.invalidations > 0
+
+
+# Tests time dependent reads follow blocks mined later, least recently used results are evicted first
+def test_read_cache_time_and_lru(alice, chain, Executor, GovernanceMock):
+    cache = ReadCache(maxsize=2)
+    mock = alice.deploy(GovernanceMock)
+    executor = cache.wrap(alice.deploy(Executor, alice, DAY, DAY, DAY, 10 * DAY, 100, 100, 500, 500))
+    governance = cache.wrap(mock)
+
+    mock.setExecutionTime(chain.time(), {'from': alice})
+    assert executor.isProposalOverGracePeriod(mock, 0) == False
+    chain.mine(timedelta=DAY + 60)
+    assert executor.isProposalOverGracePeriod(mock, 0) == True
+
+    assert executor.getDelay() == DAY
+    assert governance.executionTime() > 0
+    assert executor.getDelay() == DAY
+    assert (cache.hits, cache.evictions, len(cache)) == (1, 1, 2)
+    # `isProposalOverGracePeriod()` was evicted, reading it again evicts `executionTime()`
+    assert executor.isProposalOverGracePeriod(mock, 0) == True
+    assert executor.getDelay() == DAY
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 5, 2)
+    assert cache.hit_rate() == 2 / 7
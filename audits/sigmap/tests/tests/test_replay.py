@@ -0,0 +1,50 @@
+import pytest
+
+from helpers.replay import ProposalReplay, can_replace_code, historical_proposals
+
+# Replays run every action twice, only the latest proposals of each executor run without --runslow
+LATEST = 3
+
+
+@pytest.fixture(scope="module")
+def replay(accounts, warp, aave_governance_v2, short_executor, long_executor, SrcExecutor, web3):
+    if not can_replace_code():
+        pytest.skip(f"'{web3.clientVersion}' cannot replace contract code, use ganache v7, hardhat or anvil")
+    return ProposalReplay(aave_governance_v2, [short_executor, long_executor], SrcExecutor, accounts[0], warp)
+
+
+@pytest.fixture(scope="module")
+def executed_proposals(aave_governance_v2, short_executor, long_executor):
+    return historical_proposals(aave_governance_v2, [short_executor, long_executor])
+
+
+# Tests the latest executed proposals of both old executors behave the same through the new `Executor`
+def test_replay_latest_proposals(replay, executed_proposals, short_executor, long_executor):
+    for executor in (short_executor, long_executor):
+        proposals = [proposal for proposal in executed_proposals if proposal.executor == executor.address]
+        assert len(proposals) > 0
+        for proposal in proposals[-LATEST:]:
+            result = replay.replay(proposal)
+            assert result.differences == [], f"proposal {proposal.id}"
+
+
+# Tests every executed proposal behaves the same through the new `Executor`
+@pytest.mark.slow
+def test_replay_all_proposals(replay, executed_proposals):
+    differing = {}
+    for proposal in executed_proposals:
+        result = replay.replay(proposal)
+        if result.differences:
+            differing[proposal.id] = result.differences
+    assert differing == {}
+
+
+# Tests the old executor code is restored after running the new `Executor` at its address
+def test_replay_restores_old_code(replay, executed_proposals, web3, long_executor):
+    old_code = web3.eth.get_code(long_executor.address)
+    proposal = next(p for p in reversed(executed_proposals) if p.executor == long_executor.address)
+
+    outcomes = replay.run(proposal, new_executor=True)
+    assert len(outcomes) == len(proposal.actions)
+    assert web3.eth.get_code(long_executor.address) == old_code
+    assert long_executor.MINIMUM_QUORUM() == 2000
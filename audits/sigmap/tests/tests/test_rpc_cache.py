@@ -0,0 +1,47 @@
+import json
+import urllib.request
+
+import pytest
+
+from helpers.rpc_cache import RpcArchive, RpcCacheServer
+
+pytestmark = pytest.mark.no_fork
+
+
+def post(url, method, params):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+# Tests `null` results are recorded and replayed offline like any other, errors are not recorded
+def test_rpc_cache_record_replay(tmp_path):
+    upstream = RpcCacheServer(RpcArchive())
+    upstream.archive.put("eth_getCode", ["0x01", "0xe95f66"], "0x6080")
+    upstream.archive.put("eth_getTransactionReceipt", ["0x02"], None)
+    recorder = RpcCacheServer(RpcArchive(tmp_path / "archive.json.gz"), upstream=upstream.start())
+    try:
+        url = recorder.start()
+        assert post(url, "eth_getCode", ["0x01", "0xe95f66"])["result"] == "0x6080"
+        assert post(url, "eth_getTransactionReceipt", ["0x02"]) == {"jsonrpc": "2.0", "id": 1, "result": None}
+        assert "error" in post(url, "eth_getBalance", ["0x03", "0xe95f66"])
+        assert post(url, "eth_getTransactionReceipt", ["0x02"])["result"] is None
+        assert (recorder.hits, recorder.misses, upstream.hits) == (1, 3, 2)
+        recorder.archive.save()
+    finally:
+        recorder.stop()
+        upstream.stop()
+
+    replay = RpcCacheServer(RpcArchive(tmp_path / "archive.json.gz"))
+    try:
+        url = replay.start()
+        assert post(url, "eth_getTransactionReceipt", ["0x02"]) == {"jsonrpc": "2.0", "id": 1, "result": None}
+        assert post(url, "eth_getCode", ["0x01", "0xe95f66"])["result"] == "0x6080"
+        assert "error" in post(url, "eth_getBalance", ["0x03", "0xe95f66"])
+        assert (replay.hits, replay.misses) == (2, 1)
+    finally:
+        replay.stop()
@@ -0,0 +1,47 @@
+import json
+
+from helpers import rpc
+from helpers.multicall import Read, StateReads
+from helpers.rpc_profile import RpcProfiler
+
+
+# Tests requests through web3 and batch requests are recorded in the active scope
+def test_records_requests(web3, chain, tmp_path, aave_governance_v2):
+    profiler = RpcProfiler()
+    profiler.install()
+    profiler.scopes.append("test")
+    try:
+        web3.eth.block_number
+        chain.mine(2)
+        StateReads().read([Read(aave_governance_v2.getProposalsCount, (), None)])
+        with_sender = Read(aave_governance_v2.getGuardian, ({'from': aave_governance_v2.address},), None)
+        StateReads().read([with_sender, with_sender])
+    finally:
+        profiler.uninstall()
+        profiler.scopes.pop()
+
+    methods = profiler.profile()["test"]["methods"]
+    assert methods["eth_blockNumber"]["calls"] >= 1
+    assert methods["evm_mine"]["calls"] >= 1
+    assert methods["eth_call"]["calls"] >= 1
+    assert methods["batch(eth_call)"]["calls"] == 1
+    assert all(stats["sent"] > 0 and stats["received"] > 0 for stats in methods.values())
+
+    profiler.save(tmp_path / "profile.json")
+    assert json.loads((tmp_path / "profile.json").read_text())["test"]["methods"] == methods
+    assert any(line.startswith("test") for line in profiler.report())
+
+
+# Tests installing twice adds the middleware and the batch observer once, uninstalling removes them
+def test_install_once(web3):
+    middlewares = len(list(web3.middleware_onion))
+    profiler = RpcProfiler()
+    profiler.install()
+    profiler.install()
+    try:
+        assert len(list(web3.middleware_onion)) == middlewares + 1
+        assert rpc.BATCH_OBSERVERS.count(profiler.record) == 1
+    finally:
+        profiler.uninstall()
+    assert profiler.name not in web3.middleware_onion
+    assert profiler.record not in rpc.BATCH_OBSERVERS
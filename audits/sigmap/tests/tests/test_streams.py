@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pytest
+
+from helpers.multicall import Read, StateReads
+from helpers.streams import StreamBook
+
+STREAMS = 20
+DAY = 60 * 60 * 24
+
+
+# Streams of random rates and durations created by the funds admin of the upgraded reserve, some
+# partially withdrawn, returns the reserve and the ids of the streams
+@pytest.fixture
+def streams(reserve_executed, accounts, chain, AaveEcosystemReserveV2, aave_ecosystem_reserve_proxy, aave_token_proxy):
+    rng = random.Random(0)
+    reserve = AaveEcosystemReserveV2.at(aave_ecosystem_reserve_proxy.address)
+    admin = reserve.getFundsAdmin()
+    accounts[0].transfer(admin, "1 ether")
+
+    first_id = reserve.getNextStreamId()
+    start = chain.time() + DAY
+    for i in range(STREAMS):
+        duration = rng.randrange(1, 10 * DAY)
+        rate = rng.choice([1, rng.randrange(1, 10 ** 6), rng.randrange(1, 10 ** 16)])
+        recipient = accounts[2 + i % 5] if i % 2 else f"0x{rng.getrandbits(160):040x}"
+        stream_start = start + rng.randrange(0, 2 * DAY)
+        reserve.createStream(
+            recipient, rate * duration, aave_token_proxy, stream_start, stream_start + duration, {'from': admin}
+        )
+
+    chain.mine(timestamp=start + 3 * DAY)
+    for stream_id in range(first_id, first_id + STREAMS, 3):
+        balance = reserve.balanceOf(stream_id, reserve.getStream(stream_id)['recipient'])
+        if balance > 1:
+            reserve.withdrawFromStream(stream_id, rng.randrange(1, balance), {'from': admin})
+    return reserve, range(first_id, reserve.getNextStreamId())
+
+
+def balance_of(stream, now, who):
+    """`balanceOf()` of a `(sender, recipient, deposit, rate, remaining, start, stop)` stream, `None` if it reverts."""
+    sender, recipient, deposit, rate, remaining, start, stop = stream
+    delta = 0 if now <= start else min(now, stop) - start
+    recipient_balance = delta * rate - (deposit - remaining)
+    if recipient_balance < 0:
+        return None
+    if who.lower() == recipient.lower():
+        return recipient_balance
+    return remaining - recipient_balance if who.lower() == sender.lower() else 0
+
+
+# Tests the limb arithmetic against Python integers on synthetic streams, including amounts above
+# 2**128 and times before withdrawals where the contract underflows
+@pytest.mark.no_fork
+def test_book_matches_python_integers():
+    rng = random.Random(0)
+    sender = "0x25F2226B597E8F9514B3F68F00f494cF4f286491"
+    streams = []
+    for i in range(200):
+        start = rng.randrange(1_600_000_000, 1_700_000_000)
+        duration = rng.randrange(1, 10 ** 8)
+        rate = rng.choice([1, rng.randrange(1, 10 ** 6), rng.getrandbits(rng.choice([64, 100, 140])) + 1])
+        deposit = rate * duration
+        remaining = deposit - rng.choice([0, rng.randrange(deposit)])
+        streams.append((sender, f"0x{i + 1:040x}", deposit, rate, remaining, start, start + duration))
+    book = StreamBook(range(len(streams)), *zip(*streams))
+    times = sorted(rng.randrange(1_590_000_000, 1_820_000_000) for _ in range(40))
+
+    recipients = book.recipient_balances(times).to_ints()
+    senders = book.balance_of(times, sender).to_ints()
+    for t, now in enumerate(times):
+        for s, stream in enumerate(streams):
+            assert recipients[t, s] == balance_of(stream, now, book.recipients[s])
+            assert senders[t, s] == balance_of(stream, now, sender)
+    outflows = book.outflows(times).to_ints()
+    assert outflows.tolist() == [sum(filter(None, row)) for row in recipients.tolist()]
+
+
+# Tests `deltaOf()` and `balanceOf()` of the recipient, sender and others over a time grid against the contract
+def test_balances_match_contract(streams, web3, chain, alice):
+    reserve, ids = streams
+    book = StreamBook.load(web3, reserve, ids)
+    assert len(book) == len(ids)
+
+    times = np.linspace(chain.time() + 60, book.stop_times.max() + DAY, 12).astype(np.int64)
+    deltas = book.deltas(times)
+    recipients = book.recipient_balances(times).to_ints()
+    senders = book.sender_balances(times).to_ints()
+    others = book.balance_of(times, alice).to_ints()
+    reads = StateReads()
+    for t, time in enumerate(times.tolist()):
+        chain.mine(timestamp=time)
+        rows = []
+        for s, stream_id in enumerate(book.ids.tolist()):
+            rows += [
+                Read(reserve.deltaOf, (stream_id,), deltas[t, s]),
+                Read(reserve.balanceOf, (stream_id, book.recipients[s]), recipients[t, s]),
+                Read(reserve.balanceOf, (stream_id, book.senders[s]), senders[t, s]),
+            ]
+            if alice not in (book.recipients[s], book.senders[s]):
+                rows.append(Read(reserve.balanceOf, (stream_id, alice), others[t, s]))
+        reads.assert_state(rows)
+
+
+# Tests the total outflow once every stream stopped is every deposit minus the amounts withdrawn
+def test_outflows(streams, web3):
+    reserve, ids = streams
+    book = StreamBook.load(web3, reserve, ids)
+    (total,) = book.outflows([book.stop_times.max()]).to_ints()
+
+    streams = [reserve.getStream(stream_id) for stream_id in ids]
+    assert total == sum(stream['remainingBalance'] for stream in streams)
+    assert book.outflows([book.start_times.min()]).to_ints()[0] == 0
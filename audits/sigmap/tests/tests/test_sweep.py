@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+import pytest
+
+from helpers.executor_model import ExecutorModel
+from helpers.sweep import ProposalVotes, Sweep
+
+# Grid of 0%..100% in steps of 1%, plus the parameters of both old executors
+GRID = sorted(set(range(0, 10_001, 100)) | {50, 200, 1500, 2000})
+
+
+@pytest.fixture(scope="module")
+def historical_votes(proposal_table, aave_governance_v2, GovernanceStrategy, OldExecutor):
+    return ProposalVotes.load(
+        aave_governance_v2, GovernanceStrategy.at, OldExecutor.at, with_creators=True, proposals=proposal_table
+    )
+
+
+# Tests the grid against `ExecutorModel` on synthetic votes, including both sides of each boundary
+@pytest.mark.no_fork
+def test_sweep_matches_model():
+    rng = random.Random(0)
+    supplies = [rng.getrandbits(rng.choice([64, 90, 100])) + 1 for _ in range(200)]
+    for_votes = [rng.randrange(supply) for supply in supplies]
+    against_votes = [rng.randrange(supply) // rng.choice([1, 10, 100]) for supply in supplies]
+    powers = [rng.randrange(supply) // 50 for supply in supplies]
+    params = [(50, 50, 200)] * len(supplies)
+    votes = ProposalVotes(range(len(supplies)), for_votes, against_votes, supplies, params, powers, supplies)
+
+    # The per-proposal bounds and their neighbours are where integer rounding matters
+    boundaries = np.concatenate([votes.max_quorum, votes.margin, votes.max_threshold])
+    # Zero thresholds are rejected by `Executor`, the model is checked from 1
+    axis = np.unique(np.clip(np.concatenate([boundaries - 1, boundaries, boundaries + 1]), 1, 10_000))
+    axis = rng.sample(sorted(axis.tolist()), min(40, len(axis)))
+    sweep = Sweep(votes, axis, axis, axis)
+
+    for _ in range(20_000):
+        index = tuple(rng.randrange(len(a)) for a in sweep.axes) + (rng.randrange(len(votes)),)
+        threshold, differential, quorum = (int(a[i]) for a, i in zip(sweep.axes, index))
+        p = index[3]
+        model = ExecutorModel(0, 1, 0, 0, threshold, 1, differential, quorum)
+        expected = model.is_proposition_power_enough(powers[p], supplies[p]) and model.is_proposal_passed(
+            for_votes[p], against_votes[p], supplies[p]
+        )
+        assert sweep.outcome[index] == expected
+
+
+# Tests the sweep at the old executors' parameters against `isProposalPassed()` of all historical proposals
+def test_sweep_historical_proposals(historical_votes, aave_governance_v2, short_executor, long_executor):
+    sweep = Sweep(historical_votes, GRID, GRID, GRID)
+    assert len(historical_votes) > 0
+
+    for executor in (short_executor, long_executor):
+        params = (executor.PROPOSITION_THRESHOLD(), executor.VOTE_DIFFERENTIAL(), executor.MINIMUM_QUORUM())
+        index = sweep.index(*params)
+        vote_passed = historical_votes.passed([params[1]], [params[2]])[0, 0]
+        for p, proposal_id in enumerate(historical_votes.ids.tolist()):
+            passed = executor.isProposalPassed(aave_governance_v2, proposal_id)
+            assert vote_passed[p] == passed
+            assert sweep.outcome[index][p] == (passed and historical_votes.max_threshold[p] >= params[0])
+
+    # No proposal flips under the parameters it was created with
+    for (threshold, differential, quorum), proposal_id in zip(historical_votes.params.tolist(), historical_votes.ids):
+        now_succeeding, now_failing = sweep.flips(threshold, differential, quorum)
+        assert proposal_id not in now_succeeding + now_failing